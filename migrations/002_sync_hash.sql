@@ -0,0 +1,8 @@
+-- NovaPorra schema upgrade: payload hashes for no-op sync detection
+-- Apply once to databases created before this column existed (init.sql already has it)
+
+ALTER TABLE circuits ADD COLUMN sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload' AFTER external_id;
+ALTER TABLE events ADD COLUMN sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload' AFTER is_current;
+ALTER TABLE riders ADD COLUMN sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload' AFTER external_id;
+ALTER TABLE rider_seasons ADD COLUMN sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload' AFTER is_active;
+ALTER TABLE sessions ADD COLUMN sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload' AFTER status;
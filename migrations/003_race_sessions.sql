@@ -0,0 +1,7 @@
+-- NovaPorra schema upgrade: race/session sync from the API schedule
+-- Apply once to databases created before these changes (init.sql already has them)
+
+INSERT INTO session_types (name, code) VALUES ('Practice', 'PR')
+ON DUPLICATE KEY UPDATE name=name;
+
+ALTER TABLE sessions ADD UNIQUE KEY unique_race_session (race_id, session_type_id);
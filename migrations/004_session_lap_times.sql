@@ -0,0 +1,7 @@
+-- NovaPorra schema upgrade: sortable session lap times
+-- Apply once to databases created before these columns existed (init.sql already has them)
+
+ALTER TABLE session_results
+    ADD COLUMN best_lap_ms INT COMMENT 'Sortable copy of best_lap_time' AFTER best_lap_time,
+    ADD COLUMN gap_ms INT AFTER gap_to_first,
+    ADD INDEX idx_session_lap (session_id, best_lap_ms);
@@ -0,0 +1,15 @@
+-- NovaPorra schema upgrade: backfill checkpoints
+-- Apply once to databases created before this table existed (init.sql already has it)
+
+-- Backfill checkpoints (one row per season and synced entity)
+CREATE TABLE IF NOT EXISTS sync_state (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    season INT NOT NULL,
+    entity VARCHAR(20) NOT NULL,
+    status ENUM('running', 'done', 'failed') NOT NULL,
+    row_count INT DEFAULT 0,
+    message VARCHAR(255),
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+    UNIQUE KEY unique_season_entity (season, entity)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
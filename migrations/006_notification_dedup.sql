@@ -0,0 +1,12 @@
+-- NovaPorra schema upgrade: one notification per type and race
+-- Apply once to databases created before this key existed (init.sql already has it)
+
+-- Drop duplicate notifications, keeping the first one sent
+DELETE newer FROM notifications newer
+JOIN notifications older
+    ON older.notification_type = newer.notification_type
+    AND older.race_id = newer.race_id
+    AND older.id < newer.id;
+
+-- Closing warnings rely on this key to skip races already notified (INSERT IGNORE)
+ALTER TABLE notifications ADD UNIQUE KEY unique_notification_race (notification_type, race_id);
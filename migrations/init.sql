@@ -37,6 +37,7 @@ CREATE TABLE IF NOT EXISTS circuits (
     country VARCHAR(100) NOT NULL,
     location VARCHAR(200),
     external_id VARCHAR(100) UNIQUE,
+    sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_external_id (external_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -51,6 +52,7 @@ CREATE TABLE IF NOT EXISTS events (
     event_date DATE NOT NULL,
     external_id VARCHAR(100) UNIQUE,
     is_current BOOLEAN DEFAULT FALSE,
+    sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (circuit_id) REFERENCES circuits(id) ON DELETE CASCADE,
@@ -105,6 +107,7 @@ CREATE TABLE IF NOT EXISTS riders (
     number INT,
     country VARCHAR(100),
     external_id VARCHAR(100) UNIQUE,
+    sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_external_id (external_id),
@@ -120,6 +123,7 @@ CREATE TABLE IF NOT EXISTS rider_seasons (
     team_name VARCHAR(200),
     bike VARCHAR(100),
     is_active BOOLEAN DEFAULT TRUE,
+    sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload',
     FOREIGN KEY (rider_id) REFERENCES riders(id) ON DELETE CASCADE,
     FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE,
     UNIQUE KEY unique_rider_season (rider_id, category_id, season),
@@ -199,6 +203,7 @@ INSERT INTO session_types (name, code) VALUES
     ('Free Practice 1', 'FP1'),
     ('Free Practice 2', 'FP2'),
     ('Free Practice 3', 'FP3'),
+    ('Practice', 'PR'),
     ('Qualifying 1', 'Q1'),
     ('Qualifying 2', 'Q2'),
     ('Warm Up', 'WUP')
@@ -211,10 +216,12 @@ CREATE TABLE IF NOT EXISTS sessions (
     session_type_id INT NOT NULL,
     session_datetime DATETIME NOT NULL,
     status ENUM('scheduled', 'in_progress', 'finished', 'cancelled') DEFAULT 'scheduled',
+    sync_hash CHAR(40) COMMENT 'Hash of the last synced API payload',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (race_id) REFERENCES races(id) ON DELETE CASCADE,
     FOREIGN KEY (session_type_id) REFERENCES session_types(id) ON DELETE CASCADE,
+    UNIQUE KEY unique_race_session (race_id, session_type_id),
     INDEX idx_race_id (race_id),
     INDEX idx_session_datetime (session_datetime)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -226,14 +233,17 @@ CREATE TABLE IF NOT EXISTS session_results (
     rider_id INT NOT NULL,
     position INT,
     best_lap_time VARCHAR(20),
+    best_lap_ms INT COMMENT 'Sortable copy of best_lap_time',
     best_lap_number INT,
     total_laps INT,
     gap_to_first VARCHAR(50),
+    gap_ms INT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE,
     FOREIGN KEY (rider_id) REFERENCES riders(id) ON DELETE CASCADE,
     UNIQUE KEY unique_session_rider (session_id, rider_id),
     INDEX idx_session_id (session_id),
+    INDEX idx_session_lap (session_id, best_lap_ms),
     INDEX idx_position (position)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -278,6 +288,28 @@ CREATE TABLE IF NOT EXISTS notifications (
     message TEXT,
     sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (race_id) REFERENCES races(id) ON DELETE SET NULL,
+    UNIQUE KEY unique_notification_race (notification_type, race_id),
     INDEX idx_notification_type (notification_type),
     INDEX idx_sent_at (sent_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Backfill checkpoints (one row per season and synced entity)
+CREATE TABLE IF NOT EXISTS sync_state (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    season INT NOT NULL,
+    entity VARCHAR(20) NOT NULL,
+    status ENUM('running', 'done', 'failed') NOT NULL,
+    row_count INT DEFAULT 0,
+    message VARCHAR(255),
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+    UNIQUE KEY unique_season_entity (season, entity)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Persistent scheduler jobs (per-race warning, close and result jobs)
+CREATE TABLE IF NOT EXISTS apscheduler_jobs (
+    id VARCHAR(191) PRIMARY KEY,
+    next_run_time DOUBLE,
+    job_state BLOB NOT NULL,
+    INDEX ix_apscheduler_jobs_next_run_time (next_run_time)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
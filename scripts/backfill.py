@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Backfill a range of MotoGP seasons (resumable)
+Usage: python backfill.py 2015 2024 [--parallel 3] [--only races results] [--force]
+
+Completed steps are checkpointed in the sync_state table; running the same
+command again after an interruption only runs what is missing.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api import open_http_session, close_http_session
+from src.services.backfill_service import BackfillProgress, BackfillService, SYNC_STEPS
+from src.utils.metrics import metrics
+
+
+STATUS_ICONS = {"done": "✅", "skipped": "⏭️ ", "failed": "❌"}
+
+
+def print_step(season: int, entity: str, status: str, message: str, seconds: float, progress: BackfillProgress):
+    """Print one finished step with overall progress and throughput"""
+    requests = metrics.counters.get("api_requests_total", 0)
+    eta = progress.eta()
+    print(
+        f"{STATUS_ICONS[status]} [{progress.finished}/{progress.total}] {season} {entity:<9}"
+        f" {message or 'already done':<45} {seconds:5.1f}s"
+        f" | {requests / max(progress.elapsed, 0.001):5.1f} req/s"
+        f"{f' | ETA {eta:.0f}s' if eta is not None else ''}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill MotoGP seasons")
+    parser.add_argument("first", type=int, help="First season")
+    parser.add_argument("last", type=int, nargs="?", help="Last season (default: first)")
+    parser.add_argument("--parallel", type=int, default=2, help="Seasons synced at the same time")
+    parser.add_argument("--only", nargs="+", choices=list(SYNC_STEPS), help="Steps to run")
+    parser.add_argument("--force", action="store_true", help="Ignore checkpoints")
+    args = parser.parse_args()
+    
+    seasons = list(range(args.first, (args.last or args.first) + 1))
+    print(f"\n🏍️  Backfilling seasons {seasons[0]}-{seasons[-1]} ({args.parallel} at a time)...\n")
+    
+    await open_http_session()
+    try:
+        progress = await BackfillService.backfill(
+            seasons,
+            entities=args.only,
+            parallel=args.parallel,
+            force=args.force,
+            on_step=print_step
+        )
+    finally:
+        await close_http_session()
+    
+    requests = metrics.counters.get("api_requests_total", 0)
+    print(f"\n📊 {progress.done} steps done, {progress.skipped} skipped, "
+          f"{progress.failed} failed, {progress.blocked} blocked")
+    print(f"   {progress.rows} rows, {requests} API requests in {progress.elapsed:.0f}s")
+    if progress.interrupted:
+        steps = ", ".join(f"{season} {entity}" for season, entity in progress.interrupted)
+        print(f"⚠️  Re-ran steps interrupted by a previous run: {steps}")
+    
+    if progress.failed or progress.blocked:
+        print("\n❌ Backfill incomplete: run the same command again to resume")
+        return 1
+    print("\n✅ Backfill completed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming scraper parser against BeautifulSoup
+Usage: python benchmark_scraper.py [saved_calendar.html ...] [--synthetic N] [--repeat R]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+
+from src.api.html_extract import extract_records
+from src.api.motogp_client import CALENDAR_FIELDS, CALENDAR_RECORD_CLASS
+
+
+def synthetic_calendar(events: int) -> bytes:
+    """Calendar-like page with lots of unrelated markup around the cards"""
+    filler = "<div class='nav'>" + "<a href='/x'>menu</a>" * 200 + "</div>"
+    icon = "<svg>" + "<path d='M0 0'/>" * 20 + "</svg>"
+    cards = "".join(
+        f"<a class='calendar-listing__event' href='/en/calendar/2024/event/gp{i}/{i}'>"
+        f"<div class='calendar-listing__title'>Grand Prix {i}</div>"
+        f"<div class='calendar-listing__location-track-name'>Circuit {i}</div>"
+        f"<div class='calendar-listing__location-country'>Country {i}</div>"
+        f"<span class='calendar-listing__date-start-day'>{i % 28 + 1:02d}</span>"
+        f"<span class='calendar-listing__date-start-month'>Mar</span>"
+        f"{icon}</a>"
+        for i in range(events)
+    )
+    return f"<html><head>{'<script>var x=1;</script>' * 50}</head><body>{filler}{cards}{filler}</body></html>".encode()
+
+
+def parse_with_bs4(html: bytes):
+    soup = BeautifulSoup(html, "lxml")
+    records = []
+    for card in soup.select(f".{CALENDAR_RECORD_CLASS}"):
+        record = {"url": card.get("href")}
+        for field, css_class in CALENDAR_FIELDS.items():
+            node = card.select_one(f".{css_class}")
+            if node:
+                record[field] = node.get_text(" ", strip=True)
+        records.append(record)
+    return records
+
+
+def parse_streaming(html: bytes):
+    return extract_records(html, CALENDAR_RECORD_CLASS, CALENDAR_FIELDS, link_field="url")
+
+
+def bench(name: str, func, html: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        records = func(html)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"   {name:<14} {elapsed * 1000:8.2f} ms  ({len(records)} records)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper HTML parsing")
+    parser.add_argument("pages", nargs="*", help="Saved motogp.com calendar pages")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also bench a generated page with N events")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    pages = [(path, Path(path).read_bytes()) for path in args.pages]
+    if args.synthetic or not pages:
+        pages.append((f"synthetic ({args.synthetic or 500} events)", synthetic_calendar(args.synthetic or 500)))
+    
+    for name, html in pages:
+        print(f"\n📄 {name} ({len(html) / 1024:.0f} KiB)")
+        bs4_time = bench("BeautifulSoup", parse_with_bs4, html, args.repeat)
+        stream_time = bench("streaming", parse_streaming, html, args.repeat)
+        print(f"   speedup        {bs4_time / stream_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
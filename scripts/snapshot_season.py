@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Crawl a whole MotoGP season into an offline snapshot archive
+Usage: python snapshot_season.py [season] [--out data/snapshots/<season>.zip]
+
+Re-ingest without network:
+    API_SNAPSHOT_FILE=data/snapshots/2024.zip python scripts/sync_data.py 2024
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api import open_http_session, close_http_session
+from src.api.snapshot import crawl_season
+from src.config import settings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Snapshot a MotoGP season")
+    parser.add_argument("season", type=int, nargs="?", default=settings.current_season)
+    parser.add_argument("--out", help="Archive path (default data/snapshots/<season>.zip)")
+    args = parser.parse_args()
+    
+    out = args.out or f"data/snapshots/{args.season}.zip"
+    print(f"\n📦 Crawling season {args.season} into {out}...\n")
+    
+    await open_http_session()
+    try:
+        stats = await crawl_season(args.season, out)
+    finally:
+        await close_http_session()
+    
+    print(f"   Events: {stats['events']}  Sessions: {stats['sessions']}")
+    print(f"   Requests: {stats['requests']}  Objects: {stats['objects']}  Failed: {stats['failed']}")
+    print(f"   {stats['bytes'] / 1024:.0f} KiB of payloads in {stats['seconds']}s")
+    return 0 if not stats["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
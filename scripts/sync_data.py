@@ -2,8 +2,11 @@
 """
 Script to manually sync MotoGP data from API
 Usage: python sync_data.py [season]
+       python sync_data.py [season] --dry-run [--only calendar riders] [--plan plan.json]
+       python sync_data.py --apply plan.json
 """
 
+import argparse
 import sys
 import asyncio
 from pathlib import Path
@@ -11,33 +14,89 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.api import open_http_session, close_http_session
 from src.database import get_db
 from src.services.data_sync_service import sync_all_data
+from src.services.sync_plan_service import PLAN_ENTITIES, SyncPlan, SyncPlanService
 from src.config import settings
 from src.utils.logger import logger
 
 
+async def dry_run(season: int, entities, plan_path: str):
+    """Compute the sync plan without writing anything"""
+    print(f"\n🔍 Planning sync of season {season} (dry run)...\n")
+    
+    await open_http_session()
+    try:
+        with get_db() as db:
+            plan = await SyncPlanService.build_plan(db, season, entities)
+    finally:
+        await close_http_session()
+    
+    if plan_path:
+        Path(plan_path).write_text(plan.to_json(indent=2), encoding="utf-8")
+        print("📋 Plan (+insert ~update -delete =unchanged):")
+        for name, changes in plan.tables.items():
+            print(f"   {name}: {changes}")
+        print(f"\n💾 {plan.change_count} changes written to {plan_path}")
+        print(f"   Apply with: python scripts/sync_data.py --apply {plan_path}")
+    else:
+        print(plan.to_json(indent=2))
+
+
+def apply(plan_path: str):
+    """Apply a saved plan"""
+    plan = SyncPlan.from_json(Path(plan_path).read_text(encoding="utf-8"))
+    print(f"\n⚙️  Applying plan of season {plan.season} ({plan.created_at})...\n")
+    
+    with get_db() as db:
+        written = SyncPlanService.apply_plan(db, plan)
+    
+    for name, count in written.items():
+        print(f"   {name}: {count} rows")
+    print("\n✅ Plan applied!")
+
+
 async def main():
     """Main sync function"""
-    # Get season from command line or use current
-    season = int(sys.argv[1]) if len(sys.argv) > 1 else settings.current_season
+    parser = argparse.ArgumentParser(description="Sync MotoGP data from API")
+    parser.add_argument("season", type=int, nargs="?", default=settings.current_season)
+    parser.add_argument("--dry-run", action="store_true", help="Only compute the plan of changes")
+    parser.add_argument("--only", nargs="+", choices=list(PLAN_ENTITIES), help="Entities to plan")
+    parser.add_argument("--plan", help="Write the dry-run plan to this JSON file")
+    parser.add_argument("--apply", metavar="PLAN", help="Apply a plan written by --dry-run")
+    args = parser.parse_args()
+    season = args.season
+    
+    if args.apply:
+        apply(args.apply)
+        return
+    if args.dry_run:
+        await dry_run(season, args.only, args.plan)
+        return
     
     logger.info(f"🔄 Starting data sync for season {season}")
     print(f"\n🏍️  Syncing MotoGP data for season {season}...\n")
     
-    with get_db() as db:
-        results = await sync_all_data(db, season)
-        
-        print("\n📊 Sync Results:")
-        print(f"   Calendar: {results['calendar']['count']} events - {results['calendar']['message']}")
-        print(f"   Riders: {results['riders']['count']} riders - {results['riders']['message']}")
-        
-        if results["success"]:
-            print("\n✅ Sync completed successfully!")
-        else:
-            print("\n❌ Sync completed with errors")
-            if "message" in results:
-                print(f"   Error: {results['message']}")
+    await open_http_session()
+    try:
+        with get_db() as db:
+            results = await sync_all_data(db, season)
+    finally:
+        await close_http_session()
+    
+    print("\n📊 Sync Results:")
+    print(f"   Calendar: {results['calendar']['count']} events - {results['calendar']['message']}")
+    print(f"   Riders: {results['riders']['count']} riders - {results['riders']['message']}")
+    print(f"   Races: {results['races']['count']} races - {results['races']['message']}")
+    print(f"   Sessions: {results['sessions']['count']} sessions - {results['sessions']['message']}")
+    
+    if results["success"]:
+        print("\n✅ Sync completed successfully!")
+    else:
+        print("\n❌ Sync completed with errors")
+        if "message" in results:
+            print(f"   Error: {results['message']}")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,15 @@
 """API package"""
 
-from src.api.motogp_public_api import MotoGPPublicAPIClient, get_motogp_client
+from src.api.motogp_public_api import (
+    MotoGPPublicAPIClient,
+    get_motogp_client,
+    open_http_session,
+    close_http_session
+)
 
-__all__ = ["MotoGPPublicAPIClient", "get_motogp_client"]
+__all__ = [
+    "MotoGPPublicAPIClient",
+    "get_motogp_client",
+    "open_http_session",
+    "close_http_session",
+]
@@ -0,0 +1,122 @@
+"""
+Local stand-in for the MotoGP pulselive API
+Replays recorded fixtures so the sync pipeline can be tested and load-tested
+without network access. Supports latency and failure injection and answers
+conditional requests with 304.
+
+Usage:
+    python -m src.api.fake_server --fixtures tests/fixtures/pulselive --port 8081
+    MOTOGP_API_BASE_URL=http://localhost:8081/motogp/v1 python scripts/sync_data.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from typing import Optional
+
+from aiohttp import web
+
+from src.api.fixtures import FixtureStore
+from src.utils.logger import logger
+
+
+API_PREFIX = "/motogp/v1/"
+
+
+class FakePulseliveServer:
+    """aiohttp server replaying a FixtureStore"""
+    
+    def __init__(
+        self,
+        fixtures: FixtureStore,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{API_PREFIX.rstrip('/')}"
+    
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        
+        if self._random.random() < self.failure_rate:
+            self.failures += 1
+            return web.Response(status=503, text="injected failure")
+        
+        endpoint = request.match_info["endpoint"]
+        data = self.fixtures.load(endpoint, dict(request.query))
+        if data is None:
+            logger.warning(f"No fixture for {endpoint} {dict(request.query)}")
+            return web.json_response({"error": "not recorded"}, status=404)
+        
+        body = json.dumps(data, ensure_ascii=False)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start listening (port 0 picks a free port)"""
+        app = web.Application()
+        app.router.add_get(API_PREFIX + "{endpoint:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Fake pulselive API listening on {self.base_url}")
+    
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args) -> None:
+    server = FakePulseliveServer(
+        FixtureStore(args.fixtures),
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate
+    )
+    await server.start(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded MotoGP API fixtures")
+    parser.add_argument("--fixtures", required=True, help="Fixture directory (API_RECORD_DIR)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency (seconds)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered 503")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Recorded API fixtures
+Real responses captured in record mode (settings.api_record_dir), one JSON
+file per endpoint + params, replayed by the fake pulselive server.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.utils.logger import logger
+
+
+def request_key(endpoint: str, params: Optional[Dict] = None) -> str:
+    """Canonical identity of a recorded request"""
+    return json.dumps([endpoint.strip("/"), sorted((params or {}).items())], default=str)
+
+
+class FixtureStore:
+    """Directory of recorded responses"""
+    
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+    
+    def path_for(self, endpoint: str, params: Optional[Dict] = None) -> Path:
+        """<dir>/<endpoint>/<params hash>.json"""
+        canonical = json.dumps(sorted((params or {}).items()), default=str)
+        digest = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+        return self.directory / endpoint.strip("/") / f"{digest}.json"
+    
+    def save(self, endpoint: str, params: Optional[Dict], data: Any) -> None:
+        """Record a response"""
+        path = self.path_for(endpoint, params)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"endpoint": endpoint, "params": params or {}, "data": data},
+                          f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not record fixture {path}: {e}")
+    
+    def load(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Recorded response, or None if not recorded"""
+        path = self.path_for(endpoint, params)
+        if not path.exists():
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["data"]
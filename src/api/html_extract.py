@@ -0,0 +1,106 @@
+"""
+Streaming HTML record extraction
+Feeds page chunks to lxml's pull parser as they arrive and keeps only the
+record nodes we care about (calendar cards, classification rows); every
+other element is discarded as soon as it is closed, so no full tree is built.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _classes(element) -> List[str]:
+    return (element.get("class") or "").split()
+
+
+def _text(element) -> str:
+    return _WHITESPACE.sub(" ", "".join(element.itertext())).strip()
+
+
+class RecordExtractor:
+    """
+    Extracts repeated records from a streamed HTML page
+    
+    Args:
+        record_class: CSS class of the element wrapping one record
+        fields: record field -> CSS class of the descendant holding its text
+        link_field: record field receiving the first href found in the record
+    """
+    
+    def __init__(self, record_class: str, fields: Dict[str, str], link_field: Optional[str] = None):
+        self.record_class = record_class
+        self.field_by_class = {css_class: field for field, css_class in fields.items()}
+        self.link_field = link_field
+        self._parser = etree.HTMLPullParser(events=("start", "end"))
+        self._record_element = None
+        self._record: Dict[str, str] = {}
+    
+    def feed(self, chunk: bytes) -> List[Dict[str, str]]:
+        """Parse a chunk and return the records completed by it"""
+        self._parser.feed(chunk)
+        return self._drain()
+    
+    def close(self) -> List[Dict[str, str]]:
+        """Finish the document and return the remaining records"""
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        return self._drain()
+    
+    def _drain(self) -> List[Dict[str, str]]:
+        records = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._on_start(element)
+                continue
+            
+            if element is self._record_element:
+                records.append(self._record)
+                self._record_element = None
+                self._record = {}
+            elif self._record_element is not None:
+                for css_class in _classes(element):
+                    field = self.field_by_class.get(css_class)
+                    if field and field not in self._record:
+                        self._record[field] = _text(element)
+                # Children of a record are needed until the record closes
+                continue
+            
+            # Outside records: free the element and its already-seen siblings
+            element.clear()
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+        return records
+    
+    def _on_start(self, element) -> None:
+        if self._record_element is None:
+            if self.record_class in _classes(element):
+                self._record_element = element
+                self._record = {}
+                if self.link_field and element.get("href"):
+                    self._record[self.link_field] = element.get("href")
+        elif self.link_field and self.link_field not in self._record and element.get("href"):
+            self._record[self.link_field] = element.get("href")
+
+
+def extract_records(
+    html: bytes,
+    record_class: str,
+    fields: Dict[str, str],
+    link_field: Optional[str] = None,
+    chunk_size: int = 64 * 1024
+) -> List[Dict[str, str]]:
+    """Extract records from an in-memory page (saved pages, benchmarks)"""
+    extractor = RecordExtractor(record_class, fields, link_field)
+    records = []
+    for start in range(0, len(html), chunk_size):
+        records.extend(extractor.feed(html[start:start + chunk_size]))
+    records.extend(extractor.close())
+    return records
@@ -4,11 +4,13 @@ Handles communication with MotoGP.com API or alternative data sources
 """
 
 import asyncio
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 from typing import List, Dict, Optional, Any
 import aiohttp
-from bs4 import BeautifulSoup
 
+from src.api.html_extract import RecordExtractor
+from src.api.payloads import ClassificationEntry, EventInfo
 from src.config import settings
 from src.utils.logger import logger
 
@@ -229,15 +231,121 @@ class MotoGPAPIClient:
 
 
 # Alternative: Web scraping fallback
+# motogp.com markup the scraper relies on (CSS classes)
+CALENDAR_RECORD_CLASS = "calendar-listing__event"
+CALENDAR_FIELDS = {
+    "name": "calendar-listing__title",
+    "circuit": "calendar-listing__location-track-name",
+    "country": "calendar-listing__location-country",
+    "day_start": "calendar-listing__date-start-day",
+    "month_start": "calendar-listing__date-start-month",
+    "day_end": "calendar-listing__date-end-day",
+    "month_end": "calendar-listing__date-end-month",
+    "status": "calendar-listing__status-type"
+}
+RESULTS_RECORD_CLASS = "results-table__body-row"
+RESULTS_FIELDS = {
+    "position": "results-table__body-cell--pos",
+    "number": "results-table__body-cell--number",
+    "rider": "results-table__body-cell--full-name",
+    "team": "results-table__body-cell--team",
+    "time": "results-table__body-cell--time",
+    "gap": "results-table__body-cell--gap",
+    "points": "results-table__body-cell--points"
+}
+SCRAPE_CHUNK_SIZE = 64 * 1024
+
+
+def _slug(value: Optional[str]) -> Optional[str]:
+    """Last path segment of a URL, or a lowercase slug of a name"""
+    if not value:
+        return None
+    if "/" in value:
+        return value.rstrip("/").rsplit("/", 1)[-1] or None
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or None
+
+
+def _scraped_date(day: Optional[str], month: Optional[str], season: int) -> Optional[datetime]:
+    if not day or not month:
+        return None
+    try:
+        return datetime.strptime(f"{day} {month[:3]} {season}", "%d %b %Y").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _scraped_int(value: Optional[str]) -> Optional[int]:
+    digits = (value or "").strip().lstrip("#")
+    return int(digits) if digits.isdigit() else None
+
+
+def calendar_from_records(records: List[Dict[str, str]], season: int) -> List[EventInfo]:
+    """Convert scraped calendar cards to EventInfo (same model as the public API)"""
+    events = []
+    for record in records:
+        event_id = _slug(record.get("url"))
+        name = record.get("name")
+        if not event_id or not name:
+            continue
+        status = (record.get("status") or "").upper()
+        events.append(EventInfo(
+            event_id=event_id,
+            name=name,
+            short_name=None,
+            country=record.get("country"),
+            circuit=record.get("circuit"),
+            circuit_id=_slug(record.get("circuit")),
+            location=None,
+            date_start=_scraped_date(record.get("day_start"), record.get("month_start"), season),
+            date_end=_scraped_date(
+                record.get("day_end") or record.get("day_start"),
+                record.get("month_end") or record.get("month_start"),
+                season
+            ),
+            test="TEST" in status or "test" in name.lower(),
+            sponsored_name=None
+        ))
+    return events
+
+
+def classification_from_records(records: List[Dict[str, str]]) -> List[ClassificationEntry]:
+    """Convert scraped result rows to ClassificationEntry (same model as the public API)"""
+    entries = []
+    for record in records:
+        rider_id = _slug(record.get("url")) or _slug(record.get("rider"))
+        if not rider_id:
+            continue
+        position = _scraped_int(record.get("position"))
+        entries.append(ClassificationEntry(
+            position=position,
+            rider_id=rider_id,
+            rider_name=record.get("rider"),
+            rider_number=_scraped_int(record.get("number")),
+            team=record.get("team"),
+            constructor=None,
+            best_lap_time=record.get("time"),
+            best_lap_number=None,
+            gap=record.get("gap"),
+            total_laps=None,
+            top_speed=None,
+            status="INSTND" if position else (record.get("position") or None)
+        ))
+    return entries
+
+
 class MotoGPScraperClient:
     """
     Fallback client using web scraping
     Use only if official API is not available
+    
+    Pages are parsed while they download with a streaming lxml extractor
+    that keeps only calendar cards / result rows (see html_extract).
     """
     
     def __init__(self):
         self.base_url = "https://www.motogp.com"
         self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(settings.api_max_concurrency)
     
     async def __aenter__(self):
         self.session = aiohttp.ClientSession()
@@ -247,31 +355,56 @@ class MotoGPScraperClient:
         if self.session:
             await self.session.close()
     
-    async def _fetch_page(self, url: str) -> str:
-        """Fetch HTML page"""
+    async def _stream_records(
+        self,
+        url: str,
+        record_class: str,
+        fields: Dict[str, str],
+        link_field: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Fetch a page and extract records chunk by chunk"""
         if not self.session:
             raise RuntimeError("Client session not initialized")
         
+        extractor = RecordExtractor(record_class, fields, link_field)
+        records = []
         try:
-            async with self.session.get(url) as response:
-                response.raise_for_status()
-                return await response.text()
+            async with self._semaphore:
+                async with self.session.get(url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(SCRAPE_CHUNK_SIZE):
+                        records.extend(extractor.feed(chunk))
+            records.extend(extractor.close())
+            return records
         except aiohttp.ClientError as e:
             logger.error(f"Scraping error: {e}")
             raise
     
-    async def get_calendar_scrape(self, season: int) -> List[Dict[str, Any]]:
+    async def get_calendar_scrape(self, season: int) -> List[EventInfo]:
         """Scrape race calendar"""
         url = f"{self.base_url}/en/calendar"
-        html = await self._fetch_page(url)
-        
-        # TODO: Implement actual scraping logic
-        soup = BeautifulSoup(html, 'lxml')
-        
-        # Parse calendar data
-        events = []
-        
+        records = await self._stream_records(url, CALENDAR_RECORD_CLASS, CALENDAR_FIELDS, link_field="url")
+        events = calendar_from_records(records, season)
+        logger.info(f"Scraped {len(events)} events for season {season}")
         return events
+    
+    async def get_classifications_scrape(self, urls: List[str]) -> Dict[str, List[ClassificationEntry]]:
+        """Scrape several classification pages concurrently"""
+        pages = await asyncio.gather(
+            *(
+                self._stream_records(url, RESULTS_RECORD_CLASS, RESULTS_FIELDS, link_field="url")
+                for url in urls
+            ),
+            return_exceptions=True
+        )
+        
+        classifications = {}
+        for url, records in zip(urls, pages):
+            if isinstance(records, Exception):
+                logger.warning(f"Error scraping {url}: {records}")
+                continue
+            classifications[url] = classification_from_records(records)
+        return classifications
 
 
 # Factory function to get appropriate client
@@ -4,13 +4,75 @@ Based on the public API used by motogp.com website
 """
 
 import asyncio
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Any, Set, Tuple
 import aiohttp
 from bs4 import BeautifulSoup
 
+from src.api.fixtures import FixtureStore
+from src.api.payloads import (
+    ClassificationEntry, EventInfo, RiderInfo, SessionInfo, StandingEntry, decode_list
+)
+from src.api.reference_cache import reference_cache
+from src.api.resilience import (
+    RETRYABLE_STATUSES, CircuitOpenError, circuit_breaker, rate_limiter, retry_policy, timeout_for
+)
+from src.api.response_cache import CachedResponse, response_cache
+from src.api.single_flight import single_flight
 from src.config import settings
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+
+# Reference data TTLs (seconds)
+SEASONS_TTL = 24 * 3600
+CATEGORIES_TTL = 24 * 3600
+EVENTS_TTL = 3600
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+    "Accept": "application/json",
+    "Origin": "https://www.motogp.com"
+}
+
+# Payloads under these IDs can no longer change (their responses are pinned)
+_past_season_uuids: Set[str] = set()
+_past_event_ids: Set[str] = set()
+_settled_session_ids: Set[str] = set()
+
+# Application-wide HTTP session (keep-alive, DNS cache, TLS session reuse)
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create a ClientSession with a tuned connection pool"""
+    connector = aiohttp.TCPConnector(
+        limit=settings.http_pool_limit,
+        limit_per_host=settings.http_pool_limit_per_host,
+        keepalive_timeout=settings.http_keepalive_seconds,
+        ttl_dns_cache=settings.http_dns_ttl_seconds,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector)
+
+
+async def open_http_session() -> aiohttp.ClientSession:
+    """Create the shared HTTP session (call once at startup)"""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = _create_session()
+        logger.info("Shared HTTP session opened")
+    return _shared_session
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session (call once at shutdown)"""
+    global _shared_session
+    if _shared_session is not None:
+        await _shared_session.close()
+        _shared_session = None
+        logger.info("Shared HTTP session closed")
 
 
 class MotoGPPublicAPIClient:
@@ -18,15 +80,17 @@ class MotoGPPublicAPIClient:
     Client for MotoGP public API
     
     The MotoGP website uses a public API that can be accessed without authentication.
-    Base URLs:
+    Base URLs (settings.motogp_api_base_url / motogp_resources_url):
     - https://api.motogp.pulselive.com/motogp/v1/
     - https://resources.motogp.pulselive.com/
     """
     
     def __init__(self):
-        self.base_url = "https://api.motogp.pulselive.com/motogp/v1"
-        self.resources_url = "https://resources.motogp.pulselive.com"
+        self.base_url = settings.motogp_api_base_url.rstrip("/")
+        self.resources_url = settings.motogp_resources_url.rstrip("/")
+        self.recorder = FixtureStore(settings.api_record_dir) if settings.api_record_dir else None
         self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
         
         # Category mappings (API uses trademark symbols)
         self.category_map = {
@@ -43,41 +107,196 @@ class MotoGPPublicAPIClient:
         }
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
-            "Accept": "application/json",
-            "Origin": "https://www.motogp.com"
-        }
-        self.session = aiohttp.ClientSession(headers=headers)
+        """Async context manager entry (borrows the shared session if open)"""
+        if _shared_session is not None and not _shared_session.closed:
+            self.session = _shared_session
+            self._owns_session = False
+        else:
+            self.session = _create_session()
+            self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
+        self.session = None
     
-    async def _make_request(
+    @staticmethod
+    def _is_immutable(endpoint: str, params: Optional[Dict]) -> bool:
+        """Whether a response belongs to a past season or a settled session"""
+        params = params or {}
+        if params.get("seasonUuid") in _past_season_uuids:
+            return True
+        if params.get("eventUuid") in _past_event_ids:
+            return True
+        if endpoint.startswith("results/session/"):
+            return endpoint.split("/")[2] in _settled_session_ids
+        return False
+    
+    async def _send(
         self,
         endpoint: str,
-        params: Optional[Dict] = None
-    ) -> Dict[str, Any]:
-        """Make HTTP request to API"""
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> Tuple[int, Optional[Any], Dict[str, str]]:
+        """
+        Send a GET request, joining an identical request already in flight
+        
+        Only requests on the shared session are coalesced: a private session
+        is closed when its client exits, while other callers may still be
+        waiting on the request.
+        
+        Returns:
+            (status, data, response headers) - data is None for 304
+        """
         if not self.session:
             raise RuntimeError("Client session not initialized. Use async context manager.")
         
+        if self._owns_session:
+            metrics.increment("api_requests_total")
+            return await self._send_with_retries(endpoint, params, headers)
+        
+        key = single_flight.key(f"{self.base_url}/{endpoint}", params, headers)
+        return await single_flight.do(key, lambda: self._send_with_retries(endpoint, params, headers))
+    
+    async def _send_with_retries(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> Tuple[int, Optional[Any], Dict[str, str]]:
+        """Send a GET request with retries, rate limiting and circuit breaker"""
+        url = f"{self.base_url}/{endpoint}"
+        timeout = aiohttp.ClientTimeout(total=timeout_for(endpoint))
+        
+        for attempt in range(1, retry_policy.max_attempts + 1):
+            trial = circuit_breaker.check()
+            try:
+                await rate_limiter.acquire()
+                async with self.session.get(
+                    url, params=params, headers=headers, timeout=timeout
+                ) as response:
+                    if response.status in RETRYABLE_STATUSES:
+                        response.raise_for_status()
+                    
+                    # Upstream answered: 4xx are our problem, not an outage
+                    circuit_breaker.record_success()
+                    
+                    if response.status == 304:
+                        return 304, None, dict(response.headers)
+                    response.raise_for_status()
+                    data = await response.json()
+                    if self.recorder:
+                        self.recorder.save(endpoint, params, data)
+                    return response.status, data, dict(response.headers)
+            
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRYABLE_STATUSES:
+                    logger.error(f"API request error for {url}: {e}")
+                    raise
+                circuit_breaker.record_failure()
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                circuit_breaker.record_failure()
+                error = e
+            finally:
+                # Cancellation or an unexpected error must not hold the half-open trial forever
+                if trial:
+                    circuit_breaker.release_trial()
+            
+            if attempt == retry_policy.max_attempts:
+                logger.error(f"API request error for {url} after {attempt} attempts: {error}")
+                raise error
+            
+            delay = retry_policy.delay(attempt)
+            logger.warning(f"API request to {url} failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    async def _make_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Make HTTP request to API (through the on-disk response cache)"""
         url = f"{self.base_url}/{endpoint}"
+        key = response_cache.key(url, params)
+        # Record mode always hits the network so every response is captured
+        cached = response_cache.get(key) if self.recorder is None else None
+        
+        if cached and cached.immutable:
+            return cached.data
+        
+        headers = cached.validators() if cached else None
         
         try:
-            async with self.session.get(url, params=params) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as e:
-            logger.error(f"API request error for {url}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            status, data, response_headers = await self._send(endpoint, params, headers)
+        except CircuitOpenError:
+            # Serve stale data while the upstream is down
+            if cached:
+                logger.warning(f"Serving cached {endpoint} (circuit open)")
+                return cached.data
             raise
+        
+        if status == 304 and cached:
+            if self._is_immutable(endpoint, params):
+                cached.immutable = True
+                response_cache.put(key, cached)
+            return cached.data
+        
+        response_cache.put(key, CachedResponse(
+            data,
+            etag=response_headers.get("ETag"),
+            last_modified=response_headers.get("Last-Modified"),
+            immutable=self._is_immutable(endpoint, params)
+        ))
+        return data
+    
+    async def _make_conditional_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        etag: Optional[str] = None
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Make HTTP request with If-None-Match
+        
+        Returns:
+            (data, etag) - data is None when the resource is unchanged (304)
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        status, data, response_headers = await self._send(endpoint, params, headers)
+        
+        if status == 304:
+            return None, etag
+        return data, response_headers.get("ETag")
+    
+    async def _get_reference(
+        self,
+        key: str,
+        endpoint: str,
+        ttl_seconds: int,
+        params: Optional[Dict] = None
+    ) -> Any:
+        """Make HTTP request through the shared reference cache"""
+        data = reference_cache.get(key) if self.recorder is None else None
+        if data is None:
+            data = await self._make_request(endpoint, params=params)
+            if data:
+                reference_cache.set(key, data, ttl_seconds)
+        return data
+    
+    async def get_seasons(self) -> List[Dict[str, Any]]:
+        """Get all seasons (cached)"""
+        data = await self._get_reference("seasons", "results/seasons", SEASONS_TTL)
+        if not isinstance(data, list):
+            return []
+        
+        this_year = datetime.utcnow().year
+        for season in data:
+            if season.get("id") and not season.get("current") and season.get("year", this_year) < this_year:
+                _past_season_uuids.add(season["id"])
+        return data
     
     async def get_season_uuid(self, year: int) -> Optional[str]:
         """
@@ -90,8 +309,8 @@ class MotoGPPublicAPIClient:
             Season UUID or None
         """
         try:
-            data = await self._make_request("results/seasons")
-            if data and isinstance(data, list):
+            data = await self.get_seasons()
+            if data:
                 for season in data:
                     if season.get("year") == year:
                         return season.get("id")
@@ -104,8 +323,8 @@ class MotoGPPublicAPIClient:
     async def get_current_season(self) -> int:
         """Get current season year"""
         try:
-            data = await self._make_request("results/seasons")
-            if data and isinstance(data, list) and len(data) > 0:
+            data = await self.get_seasons()
+            if data:
                 # Find current season
                 for season in data:
                     if season.get("current", False):
@@ -117,7 +336,7 @@ class MotoGPPublicAPIClient:
             logger.error(f"Error getting current season: {e}")
             return settings.current_season
     
-    async def get_calendar(self, season: int) -> List[Dict[str, Any]]:
+    async def get_calendar(self, season: int) -> List[EventInfo]:
         """
         Get race calendar for a season
         
@@ -135,28 +354,20 @@ class MotoGPPublicAPIClient:
                 logger.error(f"Could not find UUID for season {season}")
                 return []
             
-            data = await self._make_request(f"results/events", params={"seasonUuid": season_uuid})
+            data = await self._get_reference(
+                f"events:{season_uuid}",
+                "results/events",
+                EVENTS_TTL,
+                params={"seasonUuid": season_uuid}
+            )
+            events = decode_list(EventInfo, data, "event")
             
-            events = []
-            for event in data:
-                event_info = {
-                    "event_id": event.get("id"),
-                    "name": event.get("name"),
-                    "short_name": event.get("short_name"),
-                    "country": event.get("country", {}).get("name"),
-                    "circuit": event.get("circuit", {}).get("name"),
-                    "circuit_id": event.get("circuit", {}).get("id"),
-                    "location": event.get("circuit", {}).get("place"),
-                    "date_start": event.get("date_start"),
-                    "date_end": event.get("date_end"),
-                    "test": event.get("test", False),
-                    "sponsored_name": event.get("sponsored_name")
-                }
-                events.append(event_info)
+            if season_uuid in _past_season_uuids:
+                _past_event_ids.update(event.event_id for event in events)
             
             logger.info(f"Found {len(events)} events for season {season}")
             return events
-            
+        
         except Exception as e:
             logger.error(f"Error fetching calendar: {e}")
             return []
@@ -199,16 +410,26 @@ class MotoGPPublicAPIClient:
                 logger.error(f"Could not find UUID for season {season}")
                 return []
             
-            data = await self._make_request(f"results/categories", params={"seasonUuid": season_uuid})
+            data = await self._get_reference(
+                f"categories:{season_uuid}",
+                "results/categories",
+                CATEGORIES_TTL,
+                params={"seasonUuid": season_uuid}
+            )
             return data if data else []
         except Exception as e:
             logger.error(f"Error fetching categories: {e}")
             return []
     
-    async def get_riders(self, season: int, category: str) -> List[Dict[str, Any]]:
+    async def get_riders(self, season: int, category: str) -> List[RiderInfo]:
         """
         Get riders for a specific category and season
         
+        Every race and sprint classification of the season is fetched
+        concurrently (bounded by settings.api_max_concurrency) and merged,
+        so substitutes and wildcards are included. Later events override
+        team/bike info of earlier ones.
+        
         Args:
             season: Year
             category: Category UUID
@@ -219,105 +440,146 @@ class MotoGPPublicAPIClient:
         try:
             logger.info(f"Fetching riders for category {category} season {season}")
             
-            # Get season UUID first
-            season_uuid = await self.get_season_uuid(season)
-            if not season_uuid:
-                logger.error(f"Could not find UUID for season {season}")
-                return []
-            
             # Get calendar events
             events = await self.get_calendar(season)
             if not events:
                 logger.warning(f"No events found for season {season}")
                 return []
             
+            event_ids = [event.event_id for event in events if not event.test]
+            semaphore = asyncio.Semaphore(settings.api_max_concurrency)
+            
+            async def bounded(coro):
+                async with semaphore:
+                    return await coro
+            
+            # Sessions of every event
+            sessions_per_event = await asyncio.gather(
+                *(bounded(self.get_sessions(event_id, category)) for event_id in event_ids)
+            )
+            
+            race_session_ids = [
+                session.session_id
+                for sessions in sessions_per_event
+                for session in sessions
+                if session.type in ("RAC", "SPR")
+            ]
+            
+            # Classifications of every race/sprint session, in calendar order
+            classifications = await asyncio.gather(
+                *(
+                    bounded(self._make_request(f"results/session/{session_id}/classification"))
+                    for session_id in race_session_ids
+                ),
+                return_exceptions=True
+            )
+            
             # Dictionary to store unique riders (by rider_id)
-            riders_dict = {}
+            riders_dict: Dict[str, RiderInfo] = {}
             
-            # Iterate through events to find race sessions
-            for event in events:
-                event_id = event.get("event_id")
-                if not event_id or event.get("test", False):
+            for session_id, classification_data in zip(race_session_ids, classifications):
+                if isinstance(classification_data, Exception):
+                    logger.warning(f"Error fetching classification {session_id}: {classification_data}")
                     continue
                 
-                try:
-                    # Get sessions for this event and category
-                    sessions_data = await self._make_request(
-                        "results/sessions",
-                        params={"eventUuid": event_id, "categoryUuid": category}
-                    )
-                    
-                    if not sessions_data:
-                        continue
-                    
-                    # Look for race session (RAC) or sprint (SPR)
-                    for session in sessions_data:
-                        session_type = session.get("type")
-                        if session_type not in ["RAC", "SPR"]:
-                            continue
-                        
-                        session_id = session.get("id")
-                        if not session_id:
-                            continue
-                        
-                        # Get classification for this session
-                        classification_data = await self._make_request(
-                            f"results/session/{session_id}/classification"
-                        )
-                        
-                        if not classification_data or "classification" not in classification_data:
-                            continue
-                        
-                        # Extract riders from classification
-                        for entry in classification_data["classification"]:
-                            rider = entry.get("rider", {})
-                            rider_id = rider.get("id")
-                            
-                            if not rider_id or rider_id in riders_dict:
-                                continue
-                            
-                            team = entry.get("team", {})
-                            constructor = entry.get("constructor", {})
-                            
-                            rider_info = {
-                                "rider_id": rider_id,
-                                "number": rider.get("number"),
-                                "full_name": rider.get("full_name"),
-                                "country": rider.get("country", {}).get("name"),
-                                "country_iso": rider.get("country", {}).get("iso"),
-                                "team": team.get("name"),
-                                "bike": constructor.get("name"),
-                                "legacy_id": rider.get("legacy_id")
-                            }
-                            
-                            riders_dict[rider_id] = rider_info
-                        
-                        # Break after finding first race/sprint session
-                        break
-                    
-                    # If we found riders in this event, we can stop (for performance)
-                    if len(riders_dict) >= 20:  # Approximate number of riders per category
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"Error processing event {event_id}: {e}")
+                if not classification_data or "classification" not in classification_data:
                     continue
+                
+                for rider in decode_list(RiderInfo, classification_data["classification"], "classification"):
+                    riders_dict[rider.rider_id] = rider
             
             riders = list(riders_dict.values())
             logger.info(f"Found {len(riders)} unique riders for category {category}")
             return riders
-            
+        
         except Exception as e:
             logger.error(f"Error fetching riders: {e}")
             return []
     
+    async def get_sessions(self, event_id: str, category: str) -> List[SessionInfo]:
+        """
+        Get sessions of an event for a category
+        
+        Args:
+            event_id: Event UUID
+            category: Category UUID
+        
+        Returns:
+            List of sessions (type, id, date, status...)
+        """
+        try:
+            data = await self._make_request(
+                "results/sessions",
+                params={"eventUuid": event_id, "categoryUuid": category}
+            )
+            sessions = decode_list(SessionInfo, data, "session")
+            
+            # Sessions past the protest window have final classifications
+            settled_before = datetime.now(timezone.utc) - timedelta(days=settings.api_cache_settle_days)
+            for session in sessions:
+                if session.date and session.date.tzinfo and session.date < settled_before:
+                    _settled_session_ids.add(session.session_id)
+            
+            return sessions
+        except Exception as e:
+            logger.error(f"Error fetching sessions for event {event_id}: {e}")
+            return []
+    
+    async def get_race_session_id(
+        self,
+        event_id: str,
+        category: str,
+        session_type: str
+    ) -> Optional[str]:
+        """
+        Get the session UUID of a race (RAC) or sprint (SPR)
+        
+        Args:
+            event_id: Event UUID
+            category: Category UUID
+            session_type: RAC or SPR
+        
+        Returns:
+            Session UUID or None
+        """
+        for session in await self.get_sessions(event_id, category):
+            if session.type == session_type:
+                return session.session_id
+        return None
+    
+    @staticmethod
+    def parse_classification(data: Optional[Dict[str, Any]]) -> List[ClassificationEntry]:
+        """Decode a classification payload"""
+        if not data:
+            return []
+        return decode_list(ClassificationEntry, data.get("classification"), "classification")
+    
+    async def get_classification_if_changed(
+        self,
+        session_id: str,
+        etag: Optional[str] = None
+    ) -> Tuple[Optional[List[ClassificationEntry]], Optional[str]]:
+        """
+        Get a session classification using a conditional request
+        
+        Returns:
+            (results, etag) - results is None when unchanged since etag
+        """
+        data, etag = await self._make_conditional_request(
+            f"results/session/{session_id}/classification",
+            etag=etag
+        )
+        if data is None:
+            return None, etag
+        return self.parse_classification(data), etag
+    
     async def get_session_results(
         self,
         event_id: str,
         session_id: str,
         category: str,
         season: int
-    ) -> List[Dict[str, Any]]:
+    ) -> List[ClassificationEntry]:
         """
         Get results for a practice/qualifying session
         
@@ -340,25 +602,8 @@ class MotoGPPublicAPIClient:
                 }
             )
             
-            results = []
-            if data and "classification" in data:
-                for entry in data["classification"]:
-                    result = {
-                        "position": entry.get("position"),
-                        "rider_id": entry.get("rider", {}).get("id"),
-                        "rider_name": entry.get("rider", {}).get("full_name"),
-                        "rider_number": entry.get("rider", {}).get("number"),
-                        "team": entry.get("team", {}).get("name"),
-                        "constructor": entry.get("constructor", {}).get("name"),
-                        "best_lap_time": entry.get("time"),
-                        "gap": entry.get("gap", {}).get("first"),
-                        "total_laps": entry.get("total_laps"),
-                        "top_speed": entry.get("top_speed")
-                    }
-                    results.append(result)
-            
-            return results
-            
+            return self.parse_classification(data)
+        
         except Exception as e:
             logger.error(f"Error fetching session results: {e}")
             return []
@@ -369,7 +614,7 @@ class MotoGPPublicAPIClient:
         session_id: str,
         category: str,
         season: int
-    ) -> List[Dict[str, Any]]:
+    ) -> List[ClassificationEntry]:
         """
         Get race results (same endpoint as session results)
         
@@ -389,7 +634,7 @@ class MotoGPPublicAPIClient:
         self,
         season: int,
         category: str
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StandingEntry]:
         """
         Get championship standings
         
@@ -416,22 +661,10 @@ class MotoGPPublicAPIClient:
                 }
             )
             
-            standings = []
-            if data and "standings" in data:
-                for entry in data["standings"]:
-                    standing = {
-                        "position": entry.get("position"),
-                        "rider_id": entry.get("rider", {}).get("id"),
-                        "rider_name": entry.get("rider", {}).get("full_name"),
-                        "rider_number": entry.get("rider", {}).get("number"),
-                        "points": entry.get("points"),
-                        "team": entry.get("team", {}).get("name"),
-                        "constructor": entry.get("constructor", {}).get("name")
-                    }
-                    standings.append(standing)
+            standings = decode_list(StandingEntry, (data or {}).get("standings"), "standings")
             
             return standings
-            
+        
         except Exception as e:
             logger.error(f"Error fetching standings: {e}")
             return []
@@ -463,7 +696,7 @@ class MotoGPPublicAPIClient:
             
             logger.warning(f"Category {category_code} not found")
             return None
-            
+        
         except Exception as e:
             logger.error(f"Error getting category ID: {e}")
             return None
@@ -471,6 +704,10 @@ class MotoGPPublicAPIClient:
 
 # Factory function
 def get_motogp_client() -> MotoGPPublicAPIClient:
-    """Get MotoGP Public API client instance"""
+    """Get MotoGP Public API client instance (offline if a snapshot is configured)"""
+    if settings.api_snapshot_file:
+        from src.api.snapshot import SnapshotClient
+        logger.info(f"Using MotoGP snapshot {settings.api_snapshot_file}")
+        return SnapshotClient(settings.api_snapshot_file)
     logger.info("Using MotoGP Public API client")
     return MotoGPPublicAPIClient()
@@ -0,0 +1,272 @@
+"""
+Typed models for MotoGP public API payloads
+Responses are decoded once into slotted, immutable dataclasses so callers
+use attributes instead of nested .get() chains and string keys.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from src.utils.logger import logger
+
+
+T = TypeVar("T")
+
+# "1:39.123", "1'39.123", "39.123", "+0.456", "1:02:03.456"
+_LAP_TIME = re.compile(r"^\+?(?:(?:(\d+):)?(\d+)[:'])?(\d+(?:\.\d+)?)$")
+
+
+class PayloadError(ValueError):
+    """Raised when an API payload does not have the expected shape"""
+
+
+def _section(payload: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """Nested object, {} when missing or null"""
+    value = payload.get(key)
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise PayloadError(f"'{key}' must be an object, got {type(value).__name__}")
+    return value
+
+
+def _required_str(payload: Dict[str, Any], key: str) -> str:
+    value = payload.get(key)
+    if not isinstance(value, str) or not value:
+        raise PayloadError(f"Missing required field '{key}'")
+    return value
+
+
+def _str(payload: Dict[str, Any], key: str) -> Optional[str]:
+    value = payload.get(key)
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    raise PayloadError(f"'{key}' must be a string, got {type(value).__name__}")
+
+
+def _int(payload: Dict[str, Any], key: str) -> Optional[int]:
+    value = payload.get(key)
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise PayloadError(f"'{key}' must be an integer, got bool")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    raise PayloadError(f"'{key}' must be an integer, got {value!r}")
+
+
+def _float(payload: Dict[str, Any], key: str) -> Optional[float]:
+    value = payload.get(key)
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise PayloadError(f"'{key}' must be a number, got bool")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise PayloadError(f"'{key}' must be a number, got {value!r}")
+
+
+def _datetime(payload: Dict[str, Any], key: str) -> Optional[datetime]:
+    value = payload.get(key)
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise PayloadError(f"'{key}' must be an ISO date, got {type(value).__name__}")
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise PayloadError(f"'{key}' is not an ISO date: {value!r}")
+
+
+def parse_lap_time(value: Optional[str]) -> Optional[int]:
+    """Lap time or gap as integer milliseconds, None for "+1 Lap" and the like"""
+    match = _LAP_TIME.match((value or "").strip())
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return (
+        int(hours or 0) * 3_600_000
+        + int(minutes or 0) * 60_000
+        + round(float(seconds) * 1000)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class EventInfo:
+    """Calendar event"""
+    
+    event_id: str
+    name: str
+    short_name: Optional[str]
+    country: Optional[str]
+    circuit: Optional[str]
+    circuit_id: Optional[str]
+    location: Optional[str]
+    date_start: Optional[datetime]
+    date_end: Optional[datetime]
+    test: bool
+    sponsored_name: Optional[str]
+    
+    @classmethod
+    def from_api(cls, payload: Dict[str, Any]) -> "EventInfo":
+        circuit = _section(payload, "circuit")
+        return cls(
+            event_id=_required_str(payload, "id"),
+            name=_required_str(payload, "name"),
+            short_name=_str(payload, "short_name"),
+            country=_str(_section(payload, "country"), "name"),
+            circuit=_str(circuit, "name"),
+            circuit_id=_str(circuit, "id"),
+            location=_str(circuit, "place"),
+            date_start=_datetime(payload, "date_start"),
+            date_end=_datetime(payload, "date_end"),
+            test=bool(payload.get("test", False)),
+            sponsored_name=_str(payload, "sponsored_name")
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SessionInfo:
+    """Session of an event (FP, Q, SPR, RAC...)"""
+    
+    session_id: str
+    type: str
+    number: Optional[int]
+    date: Optional[datetime]
+    status: Optional[str]
+    category_id: Optional[str]
+    
+    @classmethod
+    def from_api(cls, payload: Dict[str, Any]) -> "SessionInfo":
+        return cls(
+            session_id=_required_str(payload, "id"),
+            type=_required_str(payload, "type"),
+            number=_int(payload, "number"),
+            date=_datetime(payload, "date"),
+            status=_str(payload, "status"),
+            category_id=_str(_section(payload, "category"), "id")
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClassificationEntry:
+    """One row of a session classification"""
+    
+    position: Optional[int]
+    rider_id: str
+    rider_name: Optional[str]
+    rider_number: Optional[int]
+    team: Optional[str]
+    constructor: Optional[str]
+    best_lap_time: Optional[str]
+    best_lap_number: Optional[int]
+    gap: Optional[str]
+    total_laps: Optional[int]
+    top_speed: Optional[float]
+    status: Optional[str]
+    
+    @classmethod
+    def from_api(cls, payload: Dict[str, Any]) -> "ClassificationEntry":
+        rider = _section(payload, "rider")
+        # Practice/qualifying rows carry the best lap; race rows only "time"
+        best_lap = _section(payload, "best_lap")
+        return cls(
+            position=_int(payload, "position"),
+            rider_id=_required_str(rider, "id"),
+            rider_name=_str(rider, "full_name"),
+            rider_number=_int(rider, "number"),
+            team=_str(_section(payload, "team"), "name"),
+            constructor=_str(_section(payload, "constructor"), "name"),
+            best_lap_time=_str(best_lap, "time") or _str(payload, "time"),
+            best_lap_number=_int(best_lap, "number"),
+            gap=_str(_section(payload, "gap"), "first"),
+            total_laps=_int(payload, "total_laps"),
+            top_speed=_float(payload, "top_speed"),
+            status=_str(payload, "status")
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RiderInfo:
+    """Rider as seen in a classification (with team and bike)"""
+    
+    rider_id: str
+    number: Optional[int]
+    full_name: Optional[str]
+    country: Optional[str]
+    country_iso: Optional[str]
+    team: Optional[str]
+    bike: Optional[str]
+    legacy_id: Optional[int]
+    
+    @classmethod
+    def from_api(cls, payload: Dict[str, Any]) -> "RiderInfo":
+        rider = _section(payload, "rider")
+        country = _section(rider, "country")
+        return cls(
+            rider_id=_required_str(rider, "id"),
+            number=_int(rider, "number"),
+            full_name=_str(rider, "full_name"),
+            country=_str(country, "name"),
+            country_iso=_str(country, "iso"),
+            team=_str(_section(payload, "team"), "name"),
+            bike=_str(_section(payload, "constructor"), "name"),
+            legacy_id=_int(rider, "legacy_id")
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class StandingEntry:
+    """One row of the championship standings"""
+    
+    position: Optional[int]
+    rider_id: str
+    rider_name: Optional[str]
+    rider_number: Optional[int]
+    points: Optional[float]
+    team: Optional[str]
+    constructor: Optional[str]
+    
+    @classmethod
+    def from_api(cls, payload: Dict[str, Any]) -> "StandingEntry":
+        rider = _section(payload, "rider")
+        return cls(
+            position=_int(payload, "position"),
+            rider_id=_required_str(rider, "id"),
+            rider_name=_str(rider, "full_name"),
+            rider_number=_int(rider, "number"),
+            points=_float(payload, "points"),
+            team=_str(_section(payload, "team"), "name"),
+            constructor=_str(_section(payload, "constructor"), "name")
+        )
+
+
+def decode_list(model: Type[T], items: Any, what: str) -> List[T]:
+    """
+    Decode a list payload into models
+    
+    The list itself must be well-formed; invalid entries are logged and
+    dropped so one bad row does not discard a whole classification.
+    """
+    if items is None:
+        return []
+    if not isinstance(items, list):
+        raise PayloadError(f"{what} must be a list, got {type(items).__name__}")
+    
+    decoded = []
+    for item in items:
+        if not isinstance(item, dict):
+            logger.warning(f"Skipping {what} entry: expected object, got {type(item).__name__}")
+            continue
+        try:
+            decoded.append(model.from_api(item))
+        except PayloadError as e:
+            logger.warning(f"Skipping invalid {what} entry: {e}")
+    return decoded
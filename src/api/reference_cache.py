@@ -0,0 +1,72 @@
+"""
+Reference data cache for the MotoGP public API
+Season UUIDs, category lists and event lists change rarely, so they are kept
+in a process-wide TTL cache persisted to a small JSON file.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.config import settings
+from src.utils.logger import logger
+
+
+class ReferenceCache:
+    """TTL cache shared by every API client instance"""
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.api_reference_cache_file)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+    
+    def _load(self) -> None:
+        """Load persisted entries once"""
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable reference cache {self.path}: {e}")
+            self._entries = {}
+    
+    def _save(self) -> None:
+        """Persist entries atomically"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist reference cache: {e}")
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired"""
+        if not self._loaded:
+            self._load()
+        entry = self._entries.get(key)
+        if entry is None or entry["expires_at"] < time.time():
+            return None
+        return entry["value"]
+    
+    def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        """Store a value for ttl_seconds"""
+        if not self._loaded:
+            self._load()
+        self._entries[key] = {"value": value, "expires_at": time.time() + ttl_seconds}
+        self._save()
+    
+    def clear(self) -> None:
+        """Drop every entry (in memory and on disk)"""
+        self._entries = {}
+        self._loaded = True
+        self._save()
+
+
+# Global reference cache instance
+reference_cache = ReferenceCache()
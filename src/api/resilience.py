@@ -0,0 +1,150 @@
+"""
+Resilience primitives for the MotoGP API client
+- Bounded retries with jittered exponential backoff
+- Client-side request rate limiting (token bucket)
+- Circuit breaker that fails fast while the upstream is down
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+from src.config import settings
+from src.utils.logger import logger
+
+
+# HTTP statuses worth retrying
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream that is known to be down"""
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+    
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None
+    ):
+        self.max_attempts = max_attempts or settings.api_max_attempts
+        self.base_delay = base_delay if base_delay is not None else settings.api_backoff_base_seconds
+        self.max_delay = max_delay if max_delay is not None else settings.api_backoff_max_seconds
+    
+    def delay(self, attempt: int) -> float:
+        """Sleep before retry number `attempt` (1-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class RateLimiter:
+    """Token bucket limiting requests per second"""
+    
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        self.rate = rate or settings.api_rate_limit_per_second
+        self.capacity = burst or max(1, int(self.rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """Lock bound to the running event loop (created on first use)"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent"""
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures.
+    Open -> half-open after `reset_seconds`: one trial request is let through;
+    success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        reset_seconds: Optional[float] = None
+    ):
+        self.failure_threshold = failure_threshold or settings.api_circuit_failure_threshold
+        self.reset_seconds = reset_seconds if reset_seconds is not None else settings.api_circuit_reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+    
+    def check(self) -> bool:
+        """
+        Raise CircuitOpenError if requests must not be sent
+        
+        Returns:
+            True if this request is the half-open trial (see release_trial)
+        """
+        state = self.state
+        if state == "open":
+            raise CircuitOpenError("MotoGP API circuit is open")
+        if state == "half_open":
+            if self._trial_in_flight:
+                raise CircuitOpenError("MotoGP API circuit is half-open")
+            self._trial_in_flight = True
+            return True
+        return False
+    
+    def release_trial(self) -> None:
+        """Let another trial through (the trial ended without an outcome, e.g. cancelled)"""
+        self._trial_in_flight = False
+    
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("MotoGP API circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"MotoGP API circuit opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+def timeout_for(endpoint: str) -> float:
+    """Per-endpoint request timeout in seconds"""
+    if endpoint.startswith("results/session/"):
+        # Classification polling must not block on a slow response
+        return settings.api_poll_timeout_seconds
+    return settings.api_timeout_seconds
+
+
+# Shared by every client instance (single upstream host)
+retry_policy = RetryPolicy()
+rate_limiter = RateLimiter()
+circuit_breaker = CircuitBreaker()
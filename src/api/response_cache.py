@@ -0,0 +1,104 @@
+"""
+On-disk HTTP response cache for the MotoGP public API
+- One gzip-compressed JSON file per URL + params
+- Mutable entries are revalidated with ETag / If-Modified-Since
+- Immutable entries (past seasons, settled sessions) are served without a request
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.config import settings
+from src.utils.logger import logger
+
+
+class CachedResponse:
+    """Cached payload with its validators"""
+    
+    __slots__ = ("data", "etag", "last_modified", "immutable", "fetched_at")
+    
+    def __init__(
+        self,
+        data: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        immutable: bool = False,
+        fetched_at: Optional[float] = None
+    ):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.immutable = immutable
+        self.fetched_at = fetched_at or time.time()
+    
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Persistent response cache keyed by URL and params"""
+    
+    def __init__(self, directory: Optional[str] = None):
+        directory = settings.api_response_cache_dir if directory is None else directory
+        self.directory = Path(directory) if directory else None
+    
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+    
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        """Stable cache key for a request"""
+        canonical = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+            return CachedResponse(**entry)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            return None
+    
+    def put(self, key: str, response: CachedResponse) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump({
+                    "data": response.data,
+                    "etag": response.etag,
+                    "last_modified": response.last_modified,
+                    "immutable": response.immutable,
+                    "fetched_at": response.fetched_at
+                }, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -0,0 +1,53 @@
+"""
+Single-flight request coalescing
+Concurrent identical requests share one in-flight task instead of each
+hitting the upstream, e.g. the result poller and an admin sync asking for
+the same classification at the same time.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.utils.metrics import metrics
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; late callers join it"""
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+    
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> str:
+        """Key identifying an HTTP request (conditional headers included)"""
+        return json.dumps(
+            [url, sorted((params or {}).items()), sorted((headers or {}).items())],
+            default=str
+        )
+    
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func(), or wait for the identical call already in flight
+        
+        The result object is shared between callers and must be treated
+        as read-only.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            metrics.increment("api_requests_total")
+        else:
+            metrics.increment("api_requests_coalesced_total")
+        
+        # A cancelled caller must not cancel the request other callers wait on
+        return await asyncio.shield(task)
+    
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+# Shared by every client instance
+single_flight = SingleFlight()
@@ -0,0 +1,205 @@
+"""
+Season snapshots
+- crawl_season(): fetches every payload of a season concurrently (seasons,
+  events, categories, sessions, classifications, standings)
+- One zip archive per season: content-addressed objects plus an index
+  mapping each request to its object
+- SnapshotClient: API client answering from an archive, so DataSyncService
+  can rebuild the database without network (settings.api_snapshot_file)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.api.fixtures import request_key
+from src.api.motogp_public_api import MotoGPPublicAPIClient
+from src.config import settings
+from src.utils.logger import logger
+
+
+INDEX_NAME = "index.json"
+SNAPSHOT_FORMAT = 1
+
+
+class SnapshotMissError(LookupError):
+    """Raised when a request is not recorded in the snapshot"""
+
+
+class SnapshotWriter:
+    """Writes payloads into a snapshot archive (recorder interface of the API client)"""
+    
+    def __init__(self, path: str, season: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.season = season
+        self.index: Dict[str, str] = {}
+        self.bytes_written = 0
+        self._tmp_path = self.path.with_suffix(".tmp")
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._objects = set()
+    
+    def save(self, endpoint: str, params: Optional[Dict], data: Any) -> None:
+        """Store a payload once per content hash and index the request"""
+        body = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        if digest not in self._objects:
+            self._objects.add(digest)
+            self._zip.writestr(f"objects/{digest[:2]}/{digest}.json", body)
+            self.bytes_written += len(body)
+        self.index[request_key(endpoint, params)] = digest
+    
+    @property
+    def objects(self) -> int:
+        return len(self._objects)
+    
+    def close(self) -> None:
+        """Write the index and atomically publish the archive"""
+        self._zip.writestr(INDEX_NAME, json.dumps({
+            "format": SNAPSHOT_FORMAT,
+            "season": self.season,
+            "created_at": time.time(),
+            "requests": self.index
+        }))
+        self._zip.close()
+        self._tmp_path.replace(self.path)
+    
+    def abort(self) -> None:
+        self._zip.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class SnapshotReader:
+    """Random access to the payloads of a snapshot archive"""
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        meta = json.loads(self._zip.read(INDEX_NAME))
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format in {path}: {meta.get('format')}")
+        self.season = meta["season"]
+        self.created_at = meta["created_at"]
+        self.index: Dict[str, str] = meta["requests"]
+    
+    def load(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Recorded payload, or None if the request is not in the snapshot"""
+        digest = self.index.get(request_key(endpoint, params))
+        if digest is None:
+            return None
+        return json.loads(self._zip.read(f"objects/{digest[:2]}/{digest}.json"))
+    
+    def close(self) -> None:
+        self._zip.close()
+
+
+class SnapshotClient(MotoGPPublicAPIClient):
+    """Public API client served entirely from a snapshot archive"""
+    
+    def __init__(self, path: str):
+        super().__init__()
+        self.reader = SnapshotReader(path)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+    
+    def _load(self, endpoint: str, params: Optional[Dict]) -> Any:
+        data = self.reader.load(endpoint, params)
+        if data is None:
+            raise SnapshotMissError(f"{endpoint} {params or ''} not in snapshot {self.reader.path}")
+        return data
+    
+    async def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        return self._load(endpoint, params)
+    
+    async def _make_conditional_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        etag: Optional[str] = None
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        return self._load(endpoint, params), etag
+    
+    async def _get_reference(
+        self,
+        key: str,
+        endpoint: str,
+        ttl_seconds: int,
+        params: Optional[Dict] = None
+    ) -> Any:
+        return self._load(endpoint, params)
+
+
+async def crawl_season(season: int, path: str) -> Dict[str, Any]:
+    """
+    Crawl a whole season into a snapshot archive
+    
+    Returns:
+        Crawl statistics
+    """
+    started = time.perf_counter()
+    writer = SnapshotWriter(path, season)
+    semaphore = asyncio.Semaphore(settings.api_max_concurrency)
+    
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+    
+    try:
+        async with MotoGPPublicAPIClient() as api:
+            api.recorder = writer
+            
+            season_uuid = await api.get_season_uuid(season)
+            if not season_uuid:
+                raise ValueError(f"Season {season} not found in API")
+            
+            events = await api.get_calendar(season)
+            categories = [cat["id"] for cat in await api.get_categories(season) if cat.get("id")]
+            
+            await asyncio.gather(
+                *(bounded(api.get_event_details(event.event_id, season)) for event in events),
+                *(bounded(api.get_championship_standings(season, cat)) for cat in categories)
+            )
+            
+            pairs = [(event.event_id, cat) for event in events for cat in categories]
+            sessions_per_pair = await asyncio.gather(
+                *(bounded(api.get_sessions(event_id, cat)) for event_id, cat in pairs)
+            )
+            
+            # Classifications are requested with and without event/category
+            # params by different callers; both variants share one object
+            fetches = []
+            for (event_id, cat), sessions in zip(pairs, sessions_per_pair):
+                for session in sessions:
+                    fetches.append(bounded(api.get_session_results(event_id, session.session_id, cat, season)))
+                    fetches.append(bounded(api._make_request(
+                        f"results/session/{session.session_id}/classification"
+                    )))
+            results = await asyncio.gather(*fetches, return_exceptions=True)
+        
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    
+    failed = sum(1 for result in results if isinstance(result, Exception))
+    stats = {
+        "season": season,
+        "events": len(events),
+        "categories": len(categories),
+        "sessions": sum(len(sessions) for sessions in sessions_per_pair),
+        "requests": len(writer.index),
+        "objects": writer.objects,
+        "failed": failed,
+        "bytes": writer.bytes_written,
+        "seconds": round(time.perf_counter() - started, 1)
+    }
+    logger.info(f"Snapshot of season {season} written to {path}: {stats}")
+    return stats
@@ -6,6 +6,7 @@ Main bot implementation with command handlers
 import asyncio
 from datetime import datetime
 from typing import Optional
+from sqlalchemy.orm import joinedload
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application,
@@ -19,9 +20,13 @@ from telegram.ext import (
 
 from src.config import settings
 from src.database import get_db
-from src.database.models import User, Race, Category, Rider
-from src.services import BettingService, ScoringService
+from src.database.models import User, Race, Category, Rider, Event
+from src.services import BettingService, ScoringService, TimingService
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.render_cache import render_cache, RACES, STANDINGS, TIMES
+from src.utils.leader import LeaderElector
+from src.utils.scheduler import TaskScheduler
 
 # Conversation states
 (
@@ -30,8 +35,30 @@ from src.utils.logger import logger
     SELECT_FIRST,
     SELECT_SECOND,
     SELECT_THIRD,
-    CONFIRM_BET
-) = range(6)
+    CONFIRM_BET,
+    WEEKEND_PICK,
+    WEEKEND_CONFIRM
+) = range(8)
+
+PODIUM_LABELS = ["🥇 Primera", "🥈 Segunda", "🥉 Tercera"]
+
+HELP_TEXT = (
+    "📋 *Comandos Disponibles*\n\n"
+    "*Apuestas:*\n"
+    "/apostar - Realizar una nueva apuesta\n"
+    "/finde - Apostar a todas las carreras del fin de semana\n"
+    "/editar - Modificar apuesta existente\n"
+    "/misapuestas - Ver tus apuestas actuales\n\n"
+    "*Información:*\n"
+    "/proximas - Ver próximas carreras\n"
+    "/clasificacion - Ver clasificación del campeonato\n"
+    "/resultados - Ver resultados de última carrera\n"
+    "/tiempos - Consultar tiempos de entrenamientos\n\n"
+    "*Ayuda:*\n"
+    "/ayuda - Mostrar esta ayuda\n"
+    "/cancelar - Cancelar operación actual\n\n"
+    "🏍️ ¡Buena suerte con tus apuestas!"
+)
 
 
 class NovaPorraBot:
@@ -39,37 +66,54 @@ class NovaPorraBot:
     
     def __init__(self):
         self.app = Application.builder().token(settings.telegram_bot_token).build()
+        self.scheduler: Optional[TaskScheduler] = None
+        self.elector: Optional[LeaderElector] = None
         self._setup_handlers()
     
     def _setup_handlers(self):
         """Setup command and callback handlers"""
         
         # Basic commands
-        self.app.add_handler(CommandHandler("start", self.cmd_start))
-        self.app.add_handler(CommandHandler("ayuda", self.cmd_help))
+        self.app.add_handler(CommandHandler("start", self._tracked(self.cmd_start)))
+        self.app.add_handler(CommandHandler("ayuda", self._tracked(self.cmd_help)))
         
         # Betting commands
         bet_conv = ConversationHandler(
-            entry_points=[CommandHandler("apostar", self.cmd_bet_start)],
+            entry_points=[CommandHandler("apostar", self._tracked(self.cmd_bet_start))],
             states={
-                SELECT_CATEGORY: [CallbackQueryHandler(self.bet_select_category)],
-                SELECT_RACE_TYPE: [CallbackQueryHandler(self.bet_select_race_type)],
-                SELECT_FIRST: [CallbackQueryHandler(self.bet_select_first)],
-                SELECT_SECOND: [CallbackQueryHandler(self.bet_select_second)],
-                SELECT_THIRD: [CallbackQueryHandler(self.bet_select_third)],
-                CONFIRM_BET: [CallbackQueryHandler(self.bet_confirm)],
+                SELECT_CATEGORY: [CallbackQueryHandler(self._tracked(self.bet_select_category))],
+                SELECT_RACE_TYPE: [CallbackQueryHandler(self._tracked(self.bet_select_race_type))],
+                SELECT_FIRST: [CallbackQueryHandler(self._tracked(self.bet_select_first))],
+                SELECT_SECOND: [CallbackQueryHandler(self._tracked(self.bet_select_second))],
+                SELECT_THIRD: [CallbackQueryHandler(self._tracked(self.bet_select_third))],
+                CONFIRM_BET: [CallbackQueryHandler(self._tracked(self.bet_confirm))],
             },
-            fallbacks=[CommandHandler("cancelar", self.cmd_cancel)],
+            fallbacks=[CommandHandler("cancelar", self._tracked(self.cmd_cancel))],
         )
         self.app.add_handler(bet_conv)
         
+        weekend_conv = ConversationHandler(
+            entry_points=[CommandHandler("finde", self._tracked(self.cmd_weekend_start))],
+            states={
+                WEEKEND_PICK: [CallbackQueryHandler(self._tracked(self.weekend_pick))],
+                WEEKEND_CONFIRM: [CallbackQueryHandler(self._tracked(self.weekend_confirm))],
+            },
+            fallbacks=[CommandHandler("cancelar", self._tracked(self.cmd_cancel))],
+        )
+        self.app.add_handler(weekend_conv)
+        
         # Other commands
-        self.app.add_handler(CommandHandler("misapuestas", self.cmd_my_bets))
-        self.app.add_handler(CommandHandler("clasificacion", self.cmd_standings))
-        self.app.add_handler(CommandHandler("proximas", self.cmd_upcoming_races))
+        self.app.add_handler(CommandHandler("misapuestas", self._tracked(self.cmd_my_bets)))
+        self.app.add_handler(CommandHandler("clasificacion", self._tracked(self.cmd_standings)))
+        self.app.add_handler(CommandHandler("proximas", self._tracked(self.cmd_upcoming_races)))
+        self.app.add_handler(CommandHandler("tiempos", self._tracked(self.cmd_practice_times)))
         
         logger.info("Bot handlers configured")
     
+    def _tracked(self, callback):
+        """Wrap a handler so its latency and DB usage are recorded"""
+        return metrics.track(callback.__name__)(callback)
+    
     async def cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         user = update.effective_user
@@ -103,24 +147,7 @@ class NovaPorraBot:
     
     async def cmd_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /ayuda command"""
-        help_text = (
-            "📋 *Comandos Disponibles*\n\n"
-            "*Apuestas:*\n"
-            "/apostar - Realizar una nueva apuesta\n"
-            "/editar - Modificar apuesta existente\n"
-            "/misapuestas - Ver tus apuestas actuales\n\n"
-            "*Información:*\n"
-            "/proximas - Ver próximas carreras\n"
-            "/clasificacion - Ver clasificación del campeonato\n"
-            "/resultados - Ver resultados de última carrera\n"
-            "/tiempos - Consultar tiempos de entrenamientos\n\n"
-            "*Ayuda:*\n"
-            "/ayuda - Mostrar esta ayuda\n"
-            "/cancelar - Cancelar operación actual\n\n"
-            "🏍️ ¡Buena suerte con tus apuestas!"
-        )
-        
-        await update.message.reply_text(help_text, parse_mode="Markdown")
+        await update.message.reply_text(HELP_TEXT, parse_mode="Markdown")
     
     async def cmd_bet_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start betting conversation"""
@@ -398,6 +425,174 @@ class NovaPorraBot:
         
         return ConversationHandler.END
     
+    async def cmd_weekend_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Start weekend bet slip conversation (all open races of the current event)"""
+        with get_db() as db:
+            races = BettingService.get_weekend_races(db)
+            
+            if not races:
+                await update.message.reply_text(
+                    "No hay carreras abiertas este fin de semana."
+                )
+                return ConversationHandler.END
+            
+            season = races[0].event.season
+            category_ids = list({race.category_id for race in races})
+            rosters = BettingService.get_rosters(db, season, category_ids)
+            
+            # Cache everything the slip needs so the picks need no DB access
+            slip_races = []
+            slip_rosters = {}
+            for race in races:
+                riders = rosters.get(race.category_id, [])
+                if not riders:
+                    continue
+                slip_races.append((race.id, f"{race.category.name} - {race.race_type.name}"))
+                slip_rosters[race.id] = [
+                    (rider.id, f"#{rider.number} {rider.first_name} {rider.last_name}")
+                    for rider in riders
+                ]
+            
+            event_name = races[0].event.name
+        
+        if not slip_races:
+            await update.message.reply_text("No hay pilotos disponibles")
+            return ConversationHandler.END
+        
+        context.user_data["weekend"] = {
+            "event": event_name,
+            "races": slip_races,
+            "rosters": slip_rosters,
+            "index": 0,
+            "current": [],
+            "picks": {}
+        }
+        
+        text, reply_markup = self._weekend_pick_prompt(context.user_data["weekend"])
+        await update.message.reply_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+        
+        return WEEKEND_PICK
+    
+    def _weekend_pick_prompt(self, slip: dict):
+        """Build message and keyboard for the next pick of the weekend slip"""
+        race_id, race_label = slip["races"][slip["index"]]
+        current = slip["current"]
+        
+        keyboard = []
+        for rider_id, label in slip["rosters"][race_id]:
+            if rider_id in current:
+                continue
+            keyboard.append([InlineKeyboardButton(label, callback_data=f"wk_{rider_id}")])
+        
+        keyboard.append([InlineKeyboardButton("⏭️ Saltar carrera", callback_data="skip")])
+        keyboard.append([InlineKeyboardButton("❌ Cancelar", callback_data="cancel")])
+        
+        text = (
+            f"🏍️ *Apuesta del fin de semana*\n"
+            f"📅 {slip['event']}\n\n"
+            f"Carrera {slip['index'] + 1}/{len(slip['races'])}: *{race_label}*\n"
+            f"{PODIUM_LABELS[len(current)]} posición - Selecciona el piloto:"
+        )
+        
+        return text, InlineKeyboardMarkup(keyboard)
+    
+    async def weekend_pick(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle a rider pick (or skip) in the weekend slip"""
+        query = update.callback_query
+        await query.answer()
+        
+        if query.data == "cancel":
+            context.user_data.pop("weekend", None)
+            await query.edit_message_text("❌ Apuesta cancelada")
+            return ConversationHandler.END
+        
+        slip = context.user_data["weekend"]
+        race_id, _ = slip["races"][slip["index"]]
+        
+        if query.data == "skip":
+            slip["current"] = []
+            slip["index"] += 1
+        else:
+            slip["current"].append(int(query.data.split("_")[1]))
+            if len(slip["current"]) == 3:
+                slip["picks"][race_id] = tuple(slip["current"])
+                slip["current"] = []
+                slip["index"] += 1
+        
+        if slip["index"] < len(slip["races"]):
+            text, reply_markup = self._weekend_pick_prompt(slip)
+            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+            return WEEKEND_PICK
+        
+        if not slip["picks"]:
+            context.user_data.pop("weekend", None)
+            await query.edit_message_text("❌ No has seleccionado ninguna carrera")
+            return ConversationHandler.END
+        
+        labels = {
+            race_id: dict(riders) for race_id, riders in slip["rosters"].items()
+        }
+        summary = f"🏍️ *Confirma tus apuestas*\n📅 {slip['event']}\n\n"
+        for race_id, race_label in slip["races"]:
+            podium = slip["picks"].get(race_id)
+            if not podium:
+                continue
+            summary += (
+                f"🏁 {race_label}\n"
+                f"🥇 {labels[race_id][podium[0]]}\n"
+                f"🥈 {labels[race_id][podium[1]]}\n"
+                f"🥉 {labels[race_id][podium[2]]}\n\n"
+            )
+        
+        keyboard = [
+            [InlineKeyboardButton("✅ Confirmar", callback_data="confirm")],
+            [InlineKeyboardButton("❌ Cancelar", callback_data="cancel")]
+        ]
+        await query.edit_message_text(
+            summary,
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode="Markdown"
+        )
+        
+        return WEEKEND_CONFIRM
+    
+    async def weekend_confirm(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Confirm and save all weekend bets in one transaction"""
+        query = update.callback_query
+        await query.answer()
+        
+        slip = context.user_data.pop("weekend", None)
+        
+        if query.data == "cancel" or not slip:
+            await query.edit_message_text("❌ Apuesta cancelada")
+            return ConversationHandler.END
+        
+        user = update.effective_user
+        rosters = {
+            race_id: {rider_id for rider_id, _ in riders}
+            for race_id, riders in slip["rosters"].items()
+        }
+        
+        with get_db() as db:
+            db_user = db.query(User).filter(User.telegram_id == user.id).first()
+            if not db_user:
+                await query.edit_message_text("No estás registrado. Usa /start")
+                return ConversationHandler.END
+            
+            saved, message = BettingService.place_weekend_bets(
+                db,
+                db_user.id,
+                slip["picks"],
+                rosters
+            )
+        
+        if saved:
+            await query.edit_message_text(f"✅ {message}")
+        else:
+            await query.edit_message_text(f"❌ Error: {message}")
+        
+        return ConversationHandler.END
+    
     async def cmd_my_bets(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show user's active bets"""
         user = update.effective_user
@@ -431,55 +626,111 @@ class NovaPorraBot:
     
     async def cmd_standings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show championship standings"""
-        with get_db() as db:
-            season = settings.current_season
-            
-            # Get global standings
-            standings = ScoringService.get_global_standings(db, season, limit=10)
-            
-            if not standings:
-                await update.message.reply_text("Todavía no hay clasificación")
-                return
-            
-            message = f"🏆 *Clasificación Global {season}*\n\n"
-            
-            for i, standing in enumerate(standings, 1):
-                user = standing.user
-                name = user.first_name
-                if user.username:
-                    name = f"@{user.username}"
+        season = settings.current_season
+        key = ("clasificacion", season)
+        
+        cached = render_cache.get(key)
+        if cached is None:
+            with get_db() as db:
+                standings = ScoringService.get_global_standings(db, season, limit=10)
                 
-                message += (
-                    f"{i}. {name} - *{standing.total_points} pts*\n"
-                    f"   MotoGP: {standing.motogp_points} | "
-                    f"Moto2: {standing.moto2_points} | "
-                    f"Moto3: {standing.moto3_points}\n\n"
-                )
-            
-            await update.message.reply_text(message, parse_mode="Markdown")
+                if not standings:
+                    message = "Todavía no hay clasificación"
+                else:
+                    message = f"🏆 *Clasificación Global {season}*\n\n"
+                    
+                    for i, standing in enumerate(standings, 1):
+                        user = standing.user
+                        name = user.first_name
+                        if user.username:
+                            name = f"@{user.username}"
+                        
+                        message += (
+                            f"{i}. {name} - *{standing.total_points} pts*\n"
+                            f"   MotoGP: {standing.motogp_points} | "
+                            f"Moto2: {standing.moto2_points} | "
+                            f"Moto3: {standing.moto3_points}\n\n"
+                        )
+            
+            cached = render_cache.set(key, message, tags=(STANDINGS,))
+        
+        await update.message.reply_text(cached.text, parse_mode="Markdown")
     
     async def cmd_upcoming_races(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show upcoming races"""
-        with get_db() as db:
-            races = db.query(Race).filter(
-                Race.status.in_(["upcoming", "betting_open"])
-            ).order_by(Race.race_datetime).limit(10).all()
-            
-            if not races:
-                await update.message.reply_text("No hay carreras próximas")
+        key = ("proximas",)
+        
+        cached = render_cache.get(key)
+        if cached is None:
+            with get_db() as db:
+                races = db.query(Race).options(
+                    joinedload(Race.event).joinedload(Event.circuit),
+                    joinedload(Race.category),
+                    joinedload(Race.race_type)
+                ).filter(
+                    Race.status.in_(["upcoming", "betting_open"])
+                ).order_by(Race.race_datetime).limit(10).all()
+                
+                deadlines = {}
+                if not races:
+                    message = "No hay carreras próximas"
+                else:
+                    message = "📅 *Próximas Carreras:*\n\n"
+                    
+                    for i, race in enumerate(races):
+                        # Countdown is filled in at send time
+                        token = render_cache.placeholder(i)
+                        deadlines[token] = race.bet_close_datetime
+                        message += (
+                            f"🏍️ {race.event.name}\n"
+                            f"🏁 {race.category.name} - {race.race_type.name}\n"
+                            f"📍 {race.event.circuit.name}\n"
+                            f"⏱️ Cierre apuestas: {token}\n\n"
+                        )
+            
+            cached = render_cache.set(key, message, tags=(RACES,), deadlines=deadlines)
+        
+        await update.message.reply_text(
+            render_cache.fill(cached, BettingService.format_time_until),
+            parse_mode="Markdown"
+        )
+    
+    async def cmd_practice_times(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show combined practice times of the latest event (/tiempos [moto2|moto3])"""
+        code = (context.args[0] if context.args else "MOTOGP").upper()
+        key = ("tiempos", code)
+        
+        cached = render_cache.get(key)
+        if cached is None:
+            with get_db() as db:
+                category = TimingService.get_category(db, code)
+                event = TimingService.get_latest_practice_event(db, category.id) if category else None
+                
+                if not category:
+                    message = "Categoría no válida. Usa MotoGP, Moto2 o Moto3"
+                elif not event:
+                    message = f"Todavía no hay tiempos de entrenamientos de {category.name}"
+                else:
+                    times = TimingService.get_combined_practice_times(db, event.id, category.id)
+                    message = (
+                        f"⏱️ *Tiempos combinados - {category.name}*\n"
+                        f"📅 {event.name}\n\n"
+                    )
+                    fastest = times[0][1] if times else 0
+                    for i, (rider, best_lap_ms) in enumerate(times, 1):
+                        gap = f" (+{TimingService.format_lap_time(best_lap_ms - fastest)})" if i > 1 else ""
+                        message += (
+                            f"{i}. #{rider.number} {rider.last_name} - "
+                            f"{TimingService.format_lap_time(best_lap_ms)}{gap}\n"
+                        )
+            
+            # Invalid categories are not cached (arbitrary user input)
+            if not category:
+                await update.message.reply_text(message)
                 return
-            
-            message = "📅 *Próximas Carreras:*\n\n"
-            
-            for race in races:
-                message += (
-                    f"🏍️ {race.event.name}\n"
-                    f"🏁 {race.category.name} - {race.race_type.name}\n"
-                    f"📍 {race.event.circuit.name}\n"
-                    f"⏱️ Cierre apuestas: {BettingService.get_time_until_close(race)}\n\n"
-                )
-            
-            await update.message.reply_text(message, parse_mode="Markdown")
+            cached = render_cache.set(key, message, tags=(TIMES,))
+        
+        await update.message.reply_text(cached.text, parse_mode="Markdown")
     
     async def cmd_cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel current operation"""
@@ -493,10 +744,21 @@ class NovaPorraBot:
         await self.app.start()
         await self.app.updater.start_polling()
         
+        # Every replica serves updates; only the leader runs scheduled jobs
+        self.scheduler = TaskScheduler(self.app.bot)
+        self.scheduler.start(paused=True)
+        self.elector = LeaderElector(
+            on_elected=self.scheduler.resume,
+            on_demoted=self.scheduler.pause
+        )
+        self.elector.start()
+        
         # Keep the bot running
         try:
             await asyncio.Event().wait()
         finally:
+            await self.elector.stop()
+            self.scheduler.stop()
             await self.app.updater.stop()
             await self.app.stop()
             await self.app.shutdown()
@@ -30,15 +30,52 @@ class Settings(BaseSettings):
     mysql_password: str
     mysql_root_password: Optional[str] = None
     
+    # Leader election between replicas (MySQL GET_LOCK)
+    leader_lock_name: str = "novaporra_scheduler"
+    leader_check_seconds: int = 5
+    
+    # Result polling after races
+    result_poll_seconds: int = 5
+    result_poll_stable_count: int = 3
+    result_poll_timeout_minutes: int = 120
+    
     # MotoGP API
     motogp_api_url: str = "https://api.motogp.com/"
     motogp_api_key: Optional[str] = None
     motogp_api_secret: Optional[str] = None
+    motogp_api_base_url: str = "https://api.motogp.pulselive.com/motogp/v1"
+    motogp_resources_url: str = "https://resources.motogp.pulselive.com"
+    api_record_dir: str = ""  # record real responses as fixtures (empty disables)
+    api_snapshot_file: str = ""  # serve the API from a season snapshot (offline rebuilds)
+    api_reference_cache_file: str = "data/api_reference_cache.json"
+    api_response_cache_dir: str = "data/http_cache"  # empty disables
+    api_cache_settle_days: int = 3
+    
+    # MotoGP API resilience
+    api_max_attempts: int = 4
+    api_backoff_base_seconds: float = 0.5
+    api_backoff_max_seconds: float = 10.0
+    api_rate_limit_per_second: float = 10.0
+    api_circuit_failure_threshold: int = 5
+    api_circuit_reset_seconds: float = 30.0
+    api_timeout_seconds: float = 20.0
+    api_poll_timeout_seconds: float = 8.0
+    
+    # HTTP connection pool
+    api_max_concurrency: int = 8
+    http_pool_limit: int = 20
+    http_pool_limit_per_host: int = 10
+    http_keepalive_seconds: int = 60
+    http_dns_ttl_seconds: int = 300
     
     # Logging
     log_level: str = "INFO"
     log_file: str = "logs/novaporra.log"
     
+    # Metrics (port 0 disables the /metrics endpoint)
+    metrics_port: int = 0
+    metrics_summary_minutes: int = 15
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
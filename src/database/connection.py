@@ -2,6 +2,7 @@
 Database connection and session management
 """
 
+import time
 from contextlib import contextmanager
 from typing import Generator
 from sqlalchemy import create_engine, event, text
@@ -11,6 +12,7 @@ from sqlalchemy.pool import QueuePool
 
 from src.config import settings
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 
 
 # Create engine with connection pooling
@@ -32,7 +34,7 @@ SessionLocal = sessionmaker(
 )
 
 
-@event.listens_for(Engine, "connect")
+@event.listens_for(engine, "connect")
 def set_mysql_params(dbapi_conn, connection_record):
     """Set MySQL connection parameters"""
     cursor = dbapi_conn.cursor()
@@ -41,6 +43,18 @@ def set_mysql_params(dbapi_conn, connection_record):
     cursor.close()
 
 
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Start timing a statement (kept on its execution context, not the connection)"""
+    context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Record statement duration for the running command"""
+    metrics.record_query(time.perf_counter() - context._query_start_time)
+
+
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
     """
@@ -58,6 +58,7 @@ class Circuit(Base):
     country = Column(String(100), nullable=False)
     location = Column(String(200))
     external_id = Column(String(100), unique=True, index=True)
+    sync_hash = Column(String(40))  # Hash of the last synced API payload
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -76,6 +77,7 @@ class Event(Base):
     event_date = Column(Date, nullable=False, index=True)
     external_id = Column(String(100), unique=True, index=True)
     is_current = Column(Boolean, default=False, index=True)
+    sync_hash = Column(String(40))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -141,6 +143,7 @@ class Rider(Base):
     number = Column(Integer, index=True)
     country = Column(String(100))
     external_id = Column(String(100), unique=True, index=True)
+    sync_hash = Column(String(40))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -161,6 +164,7 @@ class RiderSeason(Base):
     team_name = Column(String(200))
     bike = Column(String(100))
     is_active = Column(Boolean, default=True, index=True)
+    sync_hash = Column(String(40))
     
     __table_args__ = (
         UniqueConstraint("rider_id", "category_id", "season", name="unique_rider_season"),
@@ -266,9 +270,14 @@ class Session(Base):
     session_type_id = Column(Integer, ForeignKey("session_types.id", ondelete="CASCADE"), nullable=False)
     session_datetime = Column(DateTime, nullable=False, index=True)
     status = Column(Enum("scheduled", "in_progress", "finished", "cancelled"), default="scheduled")
+    sync_hash = Column(String(40))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        UniqueConstraint("race_id", "session_type_id", name="unique_race_session"),
+    )
+    
     # Relationships
     race = relationship("Race", back_populates="sessions")
     session_type = relationship("SessionType", back_populates="sessions")
@@ -284,13 +293,16 @@ class SessionResult(Base):
     rider_id = Column(Integer, ForeignKey("riders.id", ondelete="CASCADE"), nullable=False)
     position = Column(Integer, index=True)
     best_lap_time = Column(String(20))
+    best_lap_ms = Column(Integer)  # Sortable copy of best_lap_time
     best_lap_number = Column(Integer)
     total_laps = Column(Integer)
     gap_to_first = Column(String(50))
+    gap_ms = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     __table_args__ = (
         UniqueConstraint("session_id", "rider_id", name="unique_session_rider"),
+        Index("idx_session_lap", "session_id", "best_lap_ms"),
     )
     
     # Relationships
@@ -355,3 +367,25 @@ class Notification(Base):
     race_id = Column(Integer, ForeignKey("races.id", ondelete="SET NULL"))
     message = Column(Text)
     sent_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        UniqueConstraint("notification_type", "race_id", name="unique_notification_race"),
+    )
+
+
+class SyncState(Base):
+    """Backfill checkpoints (one row per season and synced entity)"""
+    __tablename__ = "sync_state"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    season = Column(Integer, nullable=False)
+    entity = Column(String(20), nullable=False)
+    status = Column(Enum("running", "done", "failed"), nullable=False)
+    row_count = Column(Integer, default=0)
+    message = Column(String(255))
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    __table_args__ = (
+        UniqueConstraint("season", "entity", name="unique_season_entity"),
+    )
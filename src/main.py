@@ -7,9 +7,11 @@ import signal
 import sys
 from typing import Optional
 
+from src.api import open_http_session, close_http_session
 from src.bot import NovaPorraBot
 from src.database import init_db
 from src.utils.logger import logger
+from src.utils.metrics import MetricsServer, metrics
 from src.config import settings
 
 
@@ -18,6 +20,7 @@ class Application:
     
     def __init__(self):
         self.bot: Optional[NovaPorraBot] = None
+        self.metrics_server: Optional[MetricsServer] = None
         self.running = False
     
     async def start(self):
@@ -28,6 +31,17 @@ class Application:
             # Initialize database
             init_db()
             
+            # Shared HTTP connection pool for API clients
+            await open_http_session()
+            
+            # Start metrics collection
+            self.metrics_server = MetricsServer(
+                metrics,
+                port=settings.metrics_port,
+                summary_minutes=settings.metrics_summary_minutes
+            )
+            await self.metrics_server.start()
+            
             # Create and start bot
             self.bot = NovaPorraBot()
             self.running = True
@@ -47,7 +61,11 @@ class Application:
         if self.running:
             logger.info("Stopping application...")
             self.running = False
-            # Cleanup tasks here if needed
+            
+            if self.metrics_server:
+                await self.metrics_server.stop()
+            
+            await close_http_session()
 
 
 def main():
@@ -2,5 +2,6 @@
 
 from src.services.betting_service import BettingService
 from src.services.scoring_service import ScoringService
+from src.services.timing_service import TimingService
 
-__all__ = ["BettingService", "ScoringService"]
+__all__ = ["BettingService", "ScoringService", "TimingService"]
@@ -0,0 +1,233 @@
+"""
+Backfill Service
+Loads whole seasons of history with bounded parallelism. Every (season,
+entity) step is checkpointed in sync_state, so an interrupted run resumes
+where it stopped.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+
+from src.database import get_db
+from src.database.models import SyncState
+from src.services.data_sync_service import DataSyncService
+from src.utils.logger import logger
+
+
+# Steps of a season: entities of a stage run concurrently, stages in order
+BACKFILL_STAGES: Tuple[Tuple[str, ...], ...] = (
+    ("calendar", "riders"),
+    ("races",),
+    ("results", "sessions"),
+)
+
+SYNC_STEPS = {
+    "calendar": DataSyncService.sync_calendar,
+    "riders": DataSyncService.sync_riders,
+    "races": DataSyncService.sync_season_races,
+    "results": DataSyncService.sync_season_results,
+    "sessions": DataSyncService.sync_session_results,
+}
+
+# Concurrent seasons upsert the same circuits and riders; a step that hits
+# a lock conflict is simply run again
+STEP_ATTEMPTS = 2
+
+
+@dataclass
+class BackfillProgress:
+    """Progress and throughput of a backfill run"""
+    total: int
+    done: int = 0
+    skipped: int = 0
+    failed: int = 0
+    blocked: int = 0
+    rows: int = 0
+    interrupted: List[Tuple[int, str]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+    
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+    
+    @property
+    def finished(self) -> int:
+        return self.done + self.skipped + self.failed + self.blocked
+    
+    def eta(self) -> Optional[float]:
+        """Seconds left at the current step rate (skipped steps excluded)"""
+        if not self.done + self.failed:
+            return None
+        per_step = self.elapsed / (self.done + self.failed)
+        return per_step * (self.total - self.finished)
+
+
+# on_step(season, entity, status, message, seconds, progress)
+StepCallback = Callable[[int, str, str, str, float, BackfillProgress], None]
+
+
+class BackfillService:
+    """Service for resumable multi-season backfills"""
+    
+    @staticmethod
+    def completed_steps(db: Session, seasons: Iterable[int]) -> Set[Tuple[int, str]]:
+        """(season, entity) steps already done"""
+        return set(
+            db.query(SyncState.season, SyncState.entity)
+            .filter(SyncState.season.in_(list(seasons)), SyncState.status == "done")
+            .all()
+        )
+    
+    @staticmethod
+    def reset_interrupted_steps(db: Session, seasons: Iterable[int]) -> List[Tuple[int, str]]:
+        """
+        Mark steps left 'running' by a killed run as failed
+        
+        Returns:
+            [(season, entity)] of the interrupted steps
+        """
+        states = (
+            db.query(SyncState)
+            .filter(SyncState.season.in_(list(seasons)), SyncState.status == "running")
+            .all()
+        )
+        for state in states:
+            state.status = "failed"
+            state.message = "Interrupted"
+        db.commit()
+        return sorted((state.season, state.entity) for state in states)
+    
+    @staticmethod
+    def checkpoint(
+        db: Session,
+        season: int,
+        entity: str,
+        status: str,
+        row_count: int = 0,
+        message: Optional[str] = None
+    ) -> None:
+        """Record the state of a step"""
+        state = db.query(SyncState).filter(
+            SyncState.season == season,
+            SyncState.entity == entity
+        ).first()
+        if not state:
+            state = SyncState(season=season, entity=entity)
+            db.add(state)
+        
+        now = datetime.utcnow()
+        if status == "running" or not state.started_at:
+            state.started_at = now
+        state.status = status
+        state.row_count = row_count
+        state.message = (message or "")[:255]
+        state.finished_at = None if status == "running" else now
+        db.commit()
+    
+    @staticmethod
+    async def run_step(
+        season: int,
+        entity: str,
+        progress: BackfillProgress,
+        on_step: Optional[StepCallback] = None
+    ) -> bool:
+        """Run one checkpointed sync step in its own DB session"""
+        started = time.monotonic()
+        with get_db() as db:
+            BackfillService.checkpoint(db, season, entity, "running")
+            for attempt in range(1, STEP_ATTEMPTS + 1):
+                count, message = await SYNC_STEPS[entity](db, season)
+                failed = message.startswith("Error")
+                if not failed:
+                    break
+                logger.warning(f"Backfill {season} {entity} attempt {attempt} failed: {message}")
+            BackfillService.checkpoint(db, season, entity, "failed" if failed else "done", count, message)
+        
+        if failed:
+            progress.failed += 1
+        else:
+            progress.done += 1
+            progress.rows += count
+        if on_step:
+            on_step(season, entity, "failed" if failed else "done", message, time.monotonic() - started, progress)
+        return not failed
+    
+    @staticmethod
+    async def backfill_season(
+        season: int,
+        entities: List[str],
+        completed: Set[Tuple[int, str]],
+        progress: BackfillProgress,
+        on_step: Optional[StepCallback] = None
+    ) -> bool:
+        """Run the pending steps of a season, stage by stage"""
+        for stage in BACKFILL_STAGES:
+            pending = []
+            for entity in stage:
+                if entity not in entities:
+                    continue
+                if (season, entity) in completed:
+                    progress.skipped += 1
+                    if on_step:
+                        on_step(season, entity, "skipped", "", 0.0, progress)
+                else:
+                    pending.append(entity)
+            
+            results = await asyncio.gather(
+                *(BackfillService.run_step(season, entity, progress, on_step) for entity in pending)
+            )
+            if not all(results):
+                # Later stages depend on this one; resume picks the season up again
+                remaining = [
+                    entity for later in BACKFILL_STAGES[BACKFILL_STAGES.index(stage) + 1:]
+                    for entity in later if entity in entities and (season, entity) not in completed
+                ]
+                progress.blocked += len(remaining)
+                return False
+        return True
+    
+    @staticmethod
+    async def backfill(
+        seasons: List[int],
+        entities: Optional[List[str]] = None,
+        parallel: int = 2,
+        force: bool = False,
+        on_step: Optional[StepCallback] = None
+    ) -> BackfillProgress:
+        """
+        Backfill several seasons, `parallel` seasons at a time
+        
+        Args:
+            entities: Steps to run (all by default)
+            force: Ignore checkpoints and run every step again
+        
+        Returns:
+            Final progress (failed/blocked steps run again on the next call)
+        """
+        entities = entities or list(SYNC_STEPS)
+        completed = set()
+        with get_db() as db:
+            interrupted = BackfillService.reset_interrupted_steps(db, seasons)
+            if not force:
+                completed = BackfillService.completed_steps(db, seasons)
+        if interrupted:
+            logger.warning(f"Backfill: {len(interrupted)} steps interrupted by a previous run will run again")
+        
+        progress = BackfillProgress(total=len(seasons) * len(entities), interrupted=interrupted)
+        semaphore = asyncio.Semaphore(parallel)
+        
+        async def bounded(season: int) -> bool:
+            async with semaphore:
+                return await BackfillService.backfill_season(season, entities, completed, progress, on_step)
+        
+        await asyncio.gather(*(bounded(season) for season in seasons))
+        logger.info(
+            f"Backfill {seasons[0]}-{seasons[-1]}: {progress.done} steps done, "
+            f"{progress.skipped} skipped, {progress.failed} failed, {progress.blocked} blocked "
+            f"in {progress.elapsed:.0f}s"
+        )
+        return progress
@@ -4,13 +4,17 @@ Handles bet creation, updates, and validations
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_
+from sqlalchemy.dialects.mysql import insert
 
-from src.database.models import Bet, Race, Rider, User
+from src.database.models import (
+    Bet, Category, Event, Notification, Race, RaceType, Rider, RiderSeason, User
+)
 from src.config import settings
 from src.utils.logger import logger
+from src.utils.render_cache import render_cache, RACES
 
 
 class BettingService:
@@ -43,8 +47,13 @@ class BettingService:
     @staticmethod
     def get_time_until_close(race: Race) -> str:
         """Get human-readable time until betting closes"""
+        return BettingService.format_time_until(race.bet_close_datetime)
+    
+    @staticmethod
+    def format_time_until(deadline: datetime) -> str:
+        """Get human-readable time until a deadline"""
         now = datetime.utcnow()
-        delta = race.bet_close_datetime - now
+        delta = deadline - now
         
         if delta.total_seconds() < 0:
             return "Cerrado"
@@ -205,6 +214,7 @@ class BettingService:
         
         race.status = "betting_closed"
         db.commit()
+        render_cache.invalidate(RACES)
         
         logger.info(f"Betting closed for race {race_id}")
         return True
@@ -220,3 +230,229 @@ class BettingService:
                 Race.status.in_(["upcoming", "betting_open"])
             )
         ).all()
+    
+    @staticmethod
+    def get_closing_warning_recipients(
+        db: Session,
+        window_minutes: int,
+        race_id: Optional[int] = None
+    ) -> Dict[int, dict]:
+        """
+        Get races closing within the window that have not been warned yet,
+        together with the telegram IDs of users who bet on them (one query)
+        
+        Returns:
+            race_id -> {"event", "category", "race_type", "close", "recipients"}
+        """
+        now = datetime.utcnow()
+        already_warned = db.query(Notification.id).filter(
+            and_(
+                Notification.race_id == Race.id,
+                Notification.notification_type == "bet_closing"
+            )
+        ).exists()
+        
+        query = db.query(
+            Race.id,
+            Race.bet_close_datetime,
+            Event.name,
+            Category.name,
+            RaceType.name,
+            User.telegram_id
+        ).join(Event, Event.id == Race.event_id).join(
+            Category, Category.id == Race.category_id
+        ).join(
+            RaceType, RaceType.id == Race.race_type_id
+        ).outerjoin(
+            Bet, Bet.race_id == Race.id
+        ).outerjoin(
+            User, User.id == Bet.user_id
+        ).filter(
+            and_(
+                Race.bet_close_datetime <= now + timedelta(minutes=window_minutes),
+                Race.bet_close_datetime > now,
+                Race.status.in_(["upcoming", "betting_open"]),
+                ~already_warned
+            )
+        )
+        
+        if race_id is not None:
+            query = query.filter(Race.id == race_id)
+        
+        races: Dict[int, dict] = {}
+        for rid, close, event_name, category_name, race_type_name, telegram_id in query.all():
+            race = races.setdefault(rid, {
+                "event": event_name,
+                "category": category_name,
+                "race_type": race_type_name,
+                "close": close,
+                "recipients": set()
+            })
+            if telegram_id is not None:
+                race["recipients"].add(telegram_id)
+        
+        return races
+    
+    @staticmethod
+    def mark_closing_warnings_sent(db: Session, race_ids: List[int]) -> None:
+        """
+        Log closing warnings for several races in one statement
+        
+        The unique (notification_type, race_id) key makes this idempotent.
+        """
+        if not race_ids:
+            return
+        
+        stmt = insert(Notification).prefix_with("IGNORE").values([
+            {
+                "notification_type": "bet_closing",
+                "race_id": race_id,
+                "message": f"Betting closing warning for race {race_id}",
+                "sent_at": datetime.utcnow()
+            }
+            for race_id in race_ids
+        ])
+        db.execute(stmt)
+        db.commit()
+    
+    @staticmethod
+    def get_weekend_races(db: Session) -> List[Race]:
+        """Get all races of the current event that are still open for betting"""
+        now = datetime.utcnow()
+        
+        return db.query(Race).join(Event).options(
+            joinedload(Race.category),
+            joinedload(Race.race_type),
+            joinedload(Race.event)
+        ).filter(
+            and_(
+                Event.is_current == True,
+                Race.bet_close_datetime > now,
+                Race.status.in_(["upcoming", "betting_open"])
+            )
+        ).order_by(Race.race_datetime).all()
+    
+    @staticmethod
+    def get_rosters(
+        db: Session,
+        season: int,
+        category_ids: List[int]
+    ) -> Dict[int, List[Rider]]:
+        """
+        Get active riders per category for a season in a single query
+        
+        Returns:
+            Dictionary mapping category_id to riders ordered by number
+        """
+        rows = db.query(RiderSeason.category_id, Rider).join(
+            Rider, Rider.id == RiderSeason.rider_id
+        ).filter(
+            and_(
+                RiderSeason.season == season,
+                RiderSeason.category_id.in_(category_ids),
+                RiderSeason.is_active == True
+            )
+        ).order_by(Rider.number).all()
+        
+        rosters: Dict[int, List[Rider]] = {cat_id: [] for cat_id in category_ids}
+        for category_id, rider in rows:
+            rosters[category_id].append(rider)
+        
+        return rosters
+    
+    @staticmethod
+    def validate_weekend_picks(
+        picks: Dict[int, Tuple[int, int, int]],
+        open_race_ids: Set[int],
+        rosters: Dict[int, Set[int]]
+    ) -> Tuple[bool, str]:
+        """
+        Validate a weekend bet slip against open races and cached rosters
+        
+        Args:
+            picks: race_id -> (first, second, third) rider IDs
+            open_race_ids: Races still accepting bets
+            rosters: race_id -> rider IDs allowed in that race
+        
+        Returns:
+            (valid, message)
+        """
+        if not picks:
+            return False, "No has seleccionado ninguna carrera"
+        
+        for race_id, podium in picks.items():
+            if race_id not in open_race_ids:
+                return False, "Una de las carreras ya no admite apuestas"
+            
+            if len(set(podium)) != 3:
+                return False, "Los pilotos deben ser diferentes"
+            
+            allowed = rosters.get(race_id, set())
+            if not all(rider_id in allowed for rider_id in podium):
+                return False, "Uno o más pilotos no son válidos"
+        
+        return True, "Apuestas válidas"
+    
+    @staticmethod
+    def place_weekend_bets(
+        db: Session,
+        user_id: int,
+        picks: Dict[int, Tuple[int, int, int]],
+        rosters: Dict[int, Set[int]]
+    ) -> Tuple[int, str]:
+        """
+        Create or update the user's bets for several races at once
+        
+        All bets are written with a single multi-row upsert and committed
+        in one transaction.
+        
+        Args:
+            picks: race_id -> (first, second, third) rider IDs
+            rosters: race_id -> rider IDs allowed in that race
+        
+        Returns:
+            (bets_saved, message)
+        """
+        now = datetime.utcnow()
+        
+        # Re-check the deadline inside the transaction
+        open_race_ids = {
+            race_id for (race_id,) in db.query(Race.id).filter(
+                and_(
+                    Race.id.in_(list(picks.keys())),
+                    Race.bet_close_datetime > now,
+                    Race.status.in_(["upcoming", "betting_open"])
+                )
+            ).all()
+        }
+        
+        valid, message = BettingService.validate_weekend_picks(picks, open_race_ids, rosters)
+        if not valid:
+            return 0, message
+        
+        rows = [
+            {
+                "user_id": user_id,
+                "race_id": race_id,
+                "first_place_rider_id": first,
+                "second_place_rider_id": second,
+                "third_place_rider_id": third,
+                "created_at": now,
+                "updated_at": now
+            }
+            for race_id, (first, second, third) in picks.items()
+        ]
+        
+        stmt = insert(Bet).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            first_place_rider_id=stmt.inserted.first_place_rider_id,
+            second_place_rider_id=stmt.inserted.second_place_rider_id,
+            third_place_rider_id=stmt.inserted.third_place_rider_id,
+            updated_at=stmt.inserted.updated_at
+        )
+        
+        db.execute(stmt)
+        db.commit()
+        
+        logger.info(f"Weekend bets saved: User {user_id}, {len(rows)} races")
+        return len(rows), f"{len(rows)} apuestas registradas correctamente"
@@ -3,186 +3,617 @@ Data Sync Service
 Synchronizes MotoGP data from API to database
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Tuple, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.dialects.mysql import insert
 
 from src.api import get_motogp_client
+from src.api.payloads import ClassificationEntry, EventInfo, RiderInfo, SessionInfo, parse_lap_time
 from src.database.models import (
-    Event, Race, Circuit, Category, RaceType, Rider, RiderSeason,
+    Event, Race, Circuit, Category, RaceType, Rider, RiderSeason, RaceResult,
     Session as DBSession, SessionType, SessionResult
 )
 from src.config import settings
+from src.services.scoring_service import ScoringService
 from src.utils.logger import logger
+from src.utils.render_cache import render_cache, RACES, TIMES
+
+
+# Race type code -> API session type
+RACE_SESSION_TYPES = {
+    "RACE": "RAC",
+    "SPRINT": "SPR"
+}
+
+# Practice/qualifying classifications are fetched once a session of this
+# length would be over
+SESSION_LENGTH_MINUTES = 60
+
+# API classification status -> race result status
+RESULT_STATUSES = {
+    "INSTND": "finished",
+    "FINISHED": "finished",
+    "OUTSTND": "dnf",
+    "DNF": "dnf",
+    "NC": "dnf",
+    "DNS": "dns",
+    "DSQ": "dsq",
+    "DQ": "dsq",
+    "EXCLUDED": "dsq"
+}
+
+
+def result_status(entry: ClassificationEntry) -> str:
+    """Race result status of a classification row (unknown -> by position)"""
+    status = RESULT_STATUSES.get((entry.status or "").upper())
+    if status:
+        return status
+    return "finished" if entry.position else "dnf"
+
+
+@dataclass
+class SyncStats:
+    """Row counts of one synced entity"""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    
+    def __str__(self) -> str:
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
+
+def row_hash(row: Dict[str, Any]) -> str:
+    """Stable hash of the synced fields of a row"""
+    fields = {key: value for key, value in row.items() if key != "sync_hash"}
+    canonical = json.dumps(fields, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def naive_utc(value: datetime) -> datetime:
+    """API datetimes carry an offset; the database stores naive UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def diff_rows(
+    rows: Dict[Any, Dict[str, Any]],
+    existing_hashes: Dict[Any, Optional[str]]
+) -> Tuple[List[Dict[str, Any]], SyncStats]:
+    """
+    Keep only new or changed rows
+    
+    Args:
+        rows: Rows to sync keyed by natural key (sync_hash is added to each)
+        existing_hashes: Natural key -> stored sync_hash of rows already in DB
+    
+    Returns:
+        (rows to write, stats)
+    """
+    stats = SyncStats()
+    changed = []
+    for key, row in rows.items():
+        row["sync_hash"] = row_hash(row)
+        if key not in existing_hashes:
+            stats.inserted += 1
+        elif existing_hashes[key] != row["sync_hash"]:
+            stats.updated += 1
+        else:
+            stats.unchanged += 1
+            continue
+        changed.append(row)
+    return changed, stats
 
 
 class DataSyncService:
     """Service for syncing MotoGP data from API to database"""
     
     @staticmethod
-    async def sync_calendar(db: Session, season: int) -> Tuple[int, str]:
+    def circuit_rows(events_data: List[EventInfo]) -> Dict[str, Dict[str, Any]]:
+        """Circuit rows keyed by external_id (first event wins)"""
+        rows = {}
+        for event_data in events_data:
+            if event_data.circuit_id and event_data.circuit_id not in rows:
+                rows[event_data.circuit_id] = {
+                    "name": event_data.circuit,
+                    "country": event_data.country,
+                    "location": event_data.location,
+                    "external_id": event_data.circuit_id
+                }
+        return rows
+    
+    @staticmethod
+    def event_rows(
+        events_data: List[EventInfo],
+        season: int,
+        circuit_ids: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        """Event rows for a bulk upsert (circuit resolved through circuit_ids)"""
+        return [
+            {
+                "season": season,
+                "circuit_id": circuit_ids[event_data.circuit_id],
+                "name": event_data.name,
+                "country": event_data.country,
+                "event_date": event_data.date_start.date(),
+                "external_id": event_data.event_id
+            }
+            for event_data in events_data
+            if event_data.circuit_id in circuit_ids
+        ]
+    
+    @staticmethod
+    async def sync_calendar(db: Session, season: int, dry_run: bool = False) -> Tuple[int, str]:
         """
         Sync calendar events from API to database
         
+        Circuits and events are preloaded with one query each and written
+        with bulk upserts, so a sync takes a fixed handful of statements.
+        Rows whose payload hash is unchanged are not written at all.
+        
+        Args:
+            dry_run: Return (changes, plan JSON) instead of writing
+        
         Returns:
             (events_synced, message)
         """
+        if dry_run:
+            return await DataSyncService.plan_sync(db, season, "calendar")
         try:
             async with get_motogp_client() as api:
                 events_data = await api.get_calendar(season)
-                
-                if not events_data:
-                    return 0, "No events found"
-                
-                events_synced = 0
-                
-                for event_data in events_data:
-                    # Skip test events
-                    if event_data.get("test", False):
-                        continue
-                    
-                    # Get or create circuit
-                    circuit = db.query(Circuit).filter(
-                        Circuit.external_id == event_data["circuit_id"]
-                    ).first()
-                    
-                    if not circuit:
-                        circuit = Circuit(
-                            name=event_data["circuit"],
-                            country=event_data["country"],
-                            location=event_data.get("location"),
-                            external_id=event_data["circuit_id"]
-                        )
-                        db.add(circuit)
-                        db.flush()
-                    
-                    # Get or create event
-                    event = db.query(Event).filter(
-                        Event.external_id == event_data["event_id"]
-                    ).first()
-                    
-                    if not event:
-                        event = Event(
-                            season=season,
-                            circuit_id=circuit.id,
-                            name=event_data["name"],
-                            country=event_data["country"],
-                            event_date=datetime.fromisoformat(event_data["date_start"].replace("Z", "+00:00")).date(),
-                            external_id=event_data["event_id"]
-                        )
-                        db.add(event)
-                        events_synced += 1
-                    else:
-                        # Update existing event
-                        event.name = event_data["name"]
-                        event.country = event_data["country"]
-                        event.event_date = datetime.fromisoformat(event_data["date_start"].replace("Z", "+00:00")).date()
-                
-                db.commit()
-                logger.info(f"Synced {events_synced} events for season {season}")
-                return events_synced, f"Synced {events_synced} events"
-                
+            
+            if not events_data:
+                return 0, "No events found"
+            
+            # Skip test events and events without dates or circuit
+            events_data = [
+                event_data for event_data in events_data
+                if not event_data.test and event_data.date_start and event_data.circuit_id
+            ]
+            
+            # Circuits: write new/changed ones, then resolve every id
+            circuit_rows = DataSyncService.circuit_rows(events_data)
+            circuits = (
+                db.query(Circuit.external_id, Circuit.id, Circuit.sync_hash)
+                .filter(Circuit.external_id.in_(circuit_rows))
+                .all()
+            )
+            circuit_ids = {ext_id: circuit_id for ext_id, circuit_id, _ in circuits}
+            changed_circuits, circuit_stats = diff_rows(
+                circuit_rows, {ext_id: sync_hash for ext_id, _, sync_hash in circuits}
+            )
+            if changed_circuits:
+                stmt = insert(Circuit).values(changed_circuits)
+                stmt = stmt.on_duplicate_key_update(
+                    name=stmt.inserted.name,
+                    country=stmt.inserted.country,
+                    location=stmt.inserted.location,
+                    sync_hash=stmt.inserted.sync_hash
+                )
+                db.execute(stmt)
+            new_circuits = [ext_id for ext_id in circuit_rows if ext_id not in circuit_ids]
+            if new_circuits:
+                circuit_ids.update(
+                    db.query(Circuit.external_id, Circuit.id)
+                    .filter(Circuit.external_id.in_(new_circuits))
+                    .all()
+                )
+            
+            # Events: one multi-row upsert of new/changed events
+            event_rows = {
+                row["external_id"]: row
+                for row in DataSyncService.event_rows(events_data, season, circuit_ids)
+            }
+            event_hashes = dict(
+                db.query(Event.external_id, Event.sync_hash)
+                .filter(Event.external_id.in_(event_rows))
+                .all()
+            )
+            changed_events, event_stats = diff_rows(event_rows, event_hashes)
+            if changed_events:
+                stmt = insert(Event).values(changed_events)
+                stmt = stmt.on_duplicate_key_update(
+                    circuit_id=stmt.inserted.circuit_id,
+                    name=stmt.inserted.name,
+                    country=stmt.inserted.country,
+                    event_date=stmt.inserted.event_date,
+                    sync_hash=stmt.inserted.sync_hash
+                )
+                db.execute(stmt)
+            
+            db.commit()
+            if changed_events:
+                render_cache.invalidate(RACES)
+            
+            logger.info(f"Calendar {season}: events {event_stats}; circuits {circuit_stats}")
+            return event_stats.inserted, f"Events: {event_stats}"
+        
         except Exception as e:
             logger.error(f"Error syncing calendar: {e}", exc_info=True)
             db.rollback()
             return 0, f"Error: {str(e)}"
     
     @staticmethod
-    async def sync_riders(db: Session, season: int) -> Tuple[int, str]:
+    async def plan_sync(db: Session, season: int, entity: str) -> Tuple[int, str]:
+        """Dry run of one sync entity: (planned changes, plan JSON)"""
+        # Imported here: the plan service builds on this module
+        from src.services.sync_plan_service import SyncPlanService
+        
+        plan = await SyncPlanService.build_plan(db, season, [entity])
+        return plan.change_count, plan.to_json()
+    
+    @staticmethod
+    def split_name(full_name: Optional[str]) -> Tuple[str, str]:
+        """Split an API full_name into first and last name"""
+        parts = (full_name or "").split()
+        if not parts:
+            return "", ""
+        return parts[0], " ".join(parts[1:])
+    
+    @staticmethod
+    def rider_rows(
+        riders_by_category: Dict[int, List[RiderInfo]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Rider and rider-season rows for bulk upserts
+        
+        Returns:
+            (rider rows keyed by external_id, rider-season rows with
+            rider_external_id instead of rider_id)
+        """
+        riders = {}
+        seasons = []
+        for category_id, riders_data in riders_by_category.items():
+            for rider_data in riders_data:
+                # Skip if no number
+                if not rider_data.number:
+                    continue
+                
+                first_name, last_name = DataSyncService.split_name(rider_data.full_name)
+                riders[rider_data.rider_id] = {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "number": rider_data.number,
+                    "country": rider_data.country,
+                    "external_id": rider_data.rider_id
+                }
+                seasons.append({
+                    "rider_external_id": rider_data.rider_id,
+                    "category_id": category_id,
+                    "team_name": rider_data.team,
+                    "bike": rider_data.bike
+                })
+        return riders, seasons
+    
+    @staticmethod
+    async def sync_riders(db: Session, season: int, dry_run: bool = False) -> Tuple[int, str]:
         """
         Sync riders from API to database
         
+        Categories are fetched from the API concurrently; new or changed
+        riders and rider seasons are then written with one multi-row upsert each.
+        
+        Args:
+            dry_run: Return (changes, plan JSON) instead of writing
+        
         Returns:
             (riders_synced, message)
         """
+        if dry_run:
+            return await DataSyncService.plan_sync(db, season, "riders")
         try:
+            categories = [
+                (category.id, category.code)
+                for category in db.query(Category).filter(Category.is_active == True).all()
+            ]
+            
             async with get_motogp_client() as api:
-                # Get categories from DB
-                categories = db.query(Category).filter(Category.is_active == True).all()
-                
-                total_riders_synced = 0
-                
-                for category in categories:
+                async def fetch(category_code: str) -> List[RiderInfo]:
                     # Get category UUID from API
-                    category_uuid = await api.get_category_id(category.code, season)
+                    category_uuid = await api.get_category_id(category_code, season)
                     if not category_uuid:
-                        logger.warning(f"Could not find UUID for category {category.code}")
-                        continue
-                    
-                    # Get riders for this category
-                    riders_data = await api.get_riders(season, category_uuid)
-                    
-                    for rider_data in riders_data:
-                        # Skip if no number
-                        if not rider_data.get("number"):
-                            continue
-
-                        # Normalize name: API may provide full_name rather than first/last
-                        full_name = rider_data.get("full_name") or ""
-                        first_name = rider_data.get("first_name")
-                        last_name = rider_data.get("last_name")
-                        if not first_name and full_name:
-                            parts = full_name.split()
-                            first_name = parts[0]
-                            last_name = " ".join(parts[1:]) if len(parts) > 1 else ""
-
-                        # Get or create rider
-                        rider = db.query(Rider).filter(
-                            Rider.external_id == rider_data["rider_id"]
-                        ).first()
-
-                        if not rider:
-                            rider = Rider(
-                                first_name=first_name,
-                                last_name=last_name,
-                                number=rider_data.get("number"),
-                                country=rider_data.get("country"),
-                                external_id=rider_data["rider_id"]
-                            )
-                            db.add(rider)
-                            db.flush()
-                            total_riders_synced += 1
-                        else:
-                            # Update rider info
-                            rider.first_name = first_name
-                            rider.last_name = last_name
-                            rider.number = rider_data.get("number")
-                            rider.country = rider_data.get("country")
-                        
-                        # Create or update rider season
-                        rider_season = db.query(RiderSeason).filter(
-                            and_(
-                                RiderSeason.rider_id == rider.id,
-                                RiderSeason.category_id == category.id,
-                                RiderSeason.season == season
-                            )
-                        ).first()
-                        
-                        if not rider_season:
-                            rider_season = RiderSeason(
-                                rider_id=rider.id,
-                                category_id=category.id,
-                                season=season,
-                                team_name=rider_data.get("team"),
-                                bike=rider_data.get("bike"),
-                                is_active=True
-                            )
-                            db.add(rider_season)
-                        else:
-                            rider_season.team_name = rider_data.get("team")
-                            rider_season.bike = rider_data.get("bike")
-                            rider_season.is_active = True
-                
-                db.commit()
-                logger.info(f"Synced {total_riders_synced} riders for season {season}")
-                return total_riders_synced, f"Synced {total_riders_synced} riders"
+                        logger.warning(f"Could not find UUID for category {category_code}")
+                        return []
+                    return await api.get_riders(season, category_uuid)
                 
+                fetched = await asyncio.gather(*(fetch(code) for _, code in categories))
+            
+            riders_by_category = {
+                category_id: riders_data
+                for (category_id, _), riders_data in zip(categories, fetched)
+            }
+            rider_rows, season_rows = DataSyncService.rider_rows(riders_by_category)
+            if not rider_rows:
+                return 0, "No riders found"
+            
+            riders = (
+                db.query(Rider.external_id, Rider.id, Rider.sync_hash)
+                .filter(Rider.external_id.in_(rider_rows))
+                .all()
+            )
+            rider_ids = {ext_id: rider_id for ext_id, rider_id, _ in riders}
+            changed_riders, rider_stats = diff_rows(
+                rider_rows, {ext_id: sync_hash for ext_id, _, sync_hash in riders}
+            )
+            if changed_riders:
+                stmt = insert(Rider).values(changed_riders)
+                stmt = stmt.on_duplicate_key_update(
+                    first_name=stmt.inserted.first_name,
+                    last_name=stmt.inserted.last_name,
+                    number=stmt.inserted.number,
+                    country=stmt.inserted.country,
+                    sync_hash=stmt.inserted.sync_hash
+                )
+                db.execute(stmt)
+            
+            new_riders = [ext_id for ext_id in rider_rows if ext_id not in rider_ids]
+            if new_riders:
+                rider_ids.update(
+                    db.query(Rider.external_id, Rider.id)
+                    .filter(Rider.external_id.in_(new_riders))
+                    .all()
+                )
+            
+            season_rows = {
+                (rider_ids[row["rider_external_id"]], row["category_id"]): {
+                    "rider_id": rider_ids[row["rider_external_id"]],
+                    "category_id": row["category_id"],
+                    "season": season,
+                    "team_name": row["team_name"],
+                    "bike": row["bike"],
+                    "is_active": True
+                }
+                for row in season_rows
+            }
+            season_hashes = {
+                (rider_id, category_id): sync_hash
+                for rider_id, category_id, sync_hash in
+                db.query(RiderSeason.rider_id, RiderSeason.category_id, RiderSeason.sync_hash)
+                .filter(RiderSeason.season == season)
+                .all()
+            }
+            changed_seasons, season_stats = diff_rows(season_rows, season_hashes)
+            if changed_seasons:
+                stmt = insert(RiderSeason).values(changed_seasons)
+                stmt = stmt.on_duplicate_key_update(
+                    team_name=stmt.inserted.team_name,
+                    bike=stmt.inserted.bike,
+                    is_active=stmt.inserted.is_active,
+                    sync_hash=stmt.inserted.sync_hash
+                )
+                db.execute(stmt)
+            
+            db.commit()
+            
+            logger.info(f"Riders {season}: riders {rider_stats}; rider seasons {season_stats}")
+            return rider_stats.inserted, f"Riders: {rider_stats}"
+        
         except Exception as e:
             logger.error(f"Error syncing riders: {e}", exc_info=True)
             db.rollback()
             return 0, f"Error: {str(e)}"
     
+    @staticmethod
+    def session_type_code(session: SessionInfo) -> Optional[str]:
+        """Local session type code of an API session (FP1, Q2, WUP...), None for races"""
+        if session.type in ("FP", "Q") and session.number:
+            return f"{session.type}{session.number}"
+        if session.type in ("PR", "WUP"):
+            return session.type
+        return None
+    
+    @staticmethod
+    def schedule_rows(
+        sessions_by_pair: Dict[Tuple[int, int], List[SessionInfo]],
+        race_type_ids: Dict[str, int],
+        session_type_ids: Dict[str, int]
+    ) -> Tuple[Dict[Tuple[int, int, int], Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Race and session rows from the session schedule of (event_id, category_id) pairs
+        
+        Returns:
+            (race rows keyed by (event_id, category_id, race_type_id), session
+            rows with race_key instead of race_id)
+        """
+        race_type_by_session = {
+            session_type: race_type_ids[code]
+            for code, session_type in RACE_SESSION_TYPES.items()
+            if code in race_type_ids
+        }
+        now = datetime.utcnow()
+        races = {}
+        sessions = []
+        for (event_id, category_id), schedule in sessions_by_pair.items():
+            owner = None
+            for session in schedule:
+                race_type_id = race_type_by_session.get(session.type)
+                if race_type_id is None or not session.date:
+                    continue
+                race_datetime = naive_utc(session.date)
+                bet_close_datetime = race_datetime - timedelta(minutes=settings.bet_close_minutes)
+                key = (event_id, category_id, race_type_id)
+                races[key] = {
+                    "event_id": event_id,
+                    "category_id": category_id,
+                    "race_type_id": race_type_id,
+                    "race_datetime": race_datetime,
+                    "bet_close_datetime": bet_close_datetime,
+                    # Races synced after their deadline never open for bets
+                    "status": "betting_closed" if bet_close_datetime <= now else "upcoming"
+                }
+                # Practice and qualifying belong to the main race (sprint if none)
+                if owner is None or session.type == RACE_SESSION_TYPES["RACE"]:
+                    owner = key
+            
+            if owner is None:
+                continue
+            for session in schedule:
+                session_type_id = session_type_ids.get(DataSyncService.session_type_code(session))
+                if session_type_id is None or not session.date:
+                    continue
+                session_datetime = naive_utc(session.date)
+                sessions.append({
+                    "race_key": owner,
+                    "session_type_id": session_type_id,
+                    "session_datetime": session_datetime,
+                    "status": "finished" if session_datetime <= now else "scheduled"
+                })
+        return races, sessions
+    
+    @staticmethod
+    async def sync_season_races(
+        db: Session,
+        season: int,
+        event_external_id: Optional[str] = None,
+        dry_run: bool = False
+    ) -> Tuple[int, str]:
+        """
+        Sync races (SPR/RAC) and their sessions (FP/PR/Q/WUP) from the API schedule
+        
+        The schedules of every event and category are fetched concurrently;
+        races and sessions are then written with one multi-row upsert each.
+        Races whose times moved get their close/warning jobs re-armed.
+        
+        Args:
+            event_external_id: Only sync this event (whole season if None)
+            dry_run: Return (changes, plan JSON) of the whole season instead of writing
+        
+        Returns:
+            (races_synced, message)
+        """
+        if dry_run:
+            return await DataSyncService.plan_sync(db, season, "races")
+        try:
+            events_query = db.query(Event.id, Event.external_id).filter(Event.season == season)
+            if event_external_id:
+                events_query = events_query.filter(Event.external_id == event_external_id)
+            events = [(event_id, ext_id) for event_id, ext_id in events_query.all() if ext_id]
+            if not events:
+                return 0, "Event not found in database" if event_external_id else "No events found"
+            
+            categories = [
+                (category.id, category.code)
+                for category in db.query(Category).filter(Category.is_active == True).all()
+            ]
+            race_type_ids = {code: rt_id for code, rt_id in db.query(RaceType.code, RaceType.id).all()}
+            session_type_ids = {code: st_id for code, st_id in db.query(SessionType.code, SessionType.id).all()}
+            
+            async with get_motogp_client() as api:
+                uuids = await asyncio.gather(
+                    *(api.get_category_id(code, season) for _, code in categories)
+                )
+                pairs = [
+                    (event_id, ext_id, category_id, category_uuid)
+                    for event_id, ext_id in events
+                    for (category_id, _), category_uuid in zip(categories, uuids)
+                    if category_uuid
+                ]
+                semaphore = asyncio.Semaphore(settings.api_max_concurrency)
+                
+                async def fetch(ext_id: str, category_uuid: str) -> List[SessionInfo]:
+                    async with semaphore:
+                        return await api.get_sessions(ext_id, category_uuid)
+                
+                schedules = await asyncio.gather(
+                    *(fetch(ext_id, category_uuid) for _, ext_id, _, category_uuid in pairs)
+                )
+            
+            sessions_by_pair = {
+                (event_id, category_id): schedule
+                for (event_id, _, category_id, _), schedule in zip(pairs, schedules)
+            }
+            race_rows, session_rows = DataSyncService.schedule_rows(
+                sessions_by_pair, race_type_ids, session_type_ids
+            )
+            if not race_rows:
+                return 0, "No races found"
+            
+            # Races: insert new ones, move the ones whose start time changed.
+            # Status is only set on insert; finished/cancelled races are left alone
+            event_ids = [event_id for event_id, _ in events]
+            existing = {
+                (race.event_id, race.category_id, race.race_type_id): race
+                for race in db.query(Race).filter(Race.event_id.in_(event_ids)).all()
+            }
+            race_stats = SyncStats()
+            changed_races = []
+            moved_ids = []
+            for key, row in race_rows.items():
+                race = existing.get(key)
+                if race is None:
+                    race_stats.inserted += 1
+                elif race.race_datetime != row["race_datetime"] and race.status not in ("finished", "cancelled"):
+                    race_stats.updated += 1
+                    moved_ids.append(race.id)
+                else:
+                    race_stats.unchanged += 1
+                    continue
+                changed_races.append(row)
+            if changed_races:
+                stmt = insert(Race).values(changed_races)
+                stmt = stmt.on_duplicate_key_update(
+                    race_datetime=stmt.inserted.race_datetime,
+                    bet_close_datetime=stmt.inserted.bet_close_datetime
+                )
+                db.execute(stmt)
+            
+            race_ids = {key: race.id for key, race in existing.items()}
+            if race_stats.inserted:
+                race_ids.update(
+                    ((event_id, category_id, race_type_id), race_id)
+                    for race_id, event_id, category_id, race_type_id in
+                    db.query(Race.id, Race.event_id, Race.category_id, Race.race_type_id)
+                    .filter(Race.event_id.in_(event_ids))
+                    .all()
+                )
+            new_ids = [race_ids[key] for key in race_rows if key not in existing]
+            
+            # Sessions: one multi-row upsert of new/changed sessions
+            session_rows = {
+                (race_ids[row["race_key"]], row["session_type_id"]): {
+                    "race_id": race_ids[row["race_key"]],
+                    "session_type_id": row["session_type_id"],
+                    "session_datetime": row["session_datetime"],
+                    "status": row["status"]
+                }
+                for row in session_rows
+            }
+            session_hashes = {
+                (race_id, session_type_id): sync_hash
+                for race_id, session_type_id, sync_hash in
+                db.query(DBSession.race_id, DBSession.session_type_id, DBSession.sync_hash)
+                .filter(DBSession.race_id.in_(set(race_ids.values())))
+                .all()
+            }
+            changed_sessions, session_stats = diff_rows(session_rows, session_hashes)
+            if changed_sessions:
+                stmt = insert(DBSession).values(changed_sessions)
+                stmt = stmt.on_duplicate_key_update(
+                    session_datetime=stmt.inserted.session_datetime,
+                    status=stmt.inserted.status,
+                    sync_hash=stmt.inserted.sync_hash
+                )
+                db.execute(stmt)
+            
+            db.commit()
+            if changed_races:
+                render_cache.invalidate(RACES)
+                DataSyncService.rearm_races(db, moved_ids + new_ids)
+            
+            logger.info(f"Races {season}: races {race_stats}; sessions {session_stats}")
+            return race_stats.inserted + race_stats.updated, f"Races: {race_stats}"
+        
+        except Exception as e:
+            logger.error(f"Error syncing races: {e}", exc_info=True)
+            db.rollback()
+            return 0, f"Error: {str(e)}"
+    
     @staticmethod
     async def sync_event_races(db: Session, event_external_id: str, season: int) -> Tuple[int, str]:
         """
@@ -195,127 +626,375 @@ class DataSyncService:
         Returns:
             (races_synced, message)
         """
+        return await DataSyncService.sync_season_races(db, season, event_external_id)
+    
+    @staticmethod
+    def rearm_races(db: Session, race_ids: List[int]) -> None:
+        """
+        Move the close/warning/result jobs of new or rescheduled races
+        
+        Only possible inside the bot process; elsewhere the hourly arm job
+        and the close safety net pick the new times up.
+        """
+        if not race_ids:
+            return
+        # Imported here: the scheduler imports the services package
+        from src.utils.scheduler import rearm_races
+        
+        races = db.query(Race).filter(
+            Race.id.in_(race_ids),
+            Race.status.in_(["upcoming", "betting_open"])
+        ).all()
+        armed = rearm_races(races)
+        if armed:
+            logger.info(f"Re-armed jobs for {armed} races")
+    
+    @staticmethod
+    async def sync_season_results(db: Session, season: int, dry_run: bool = False) -> Tuple[int, str]:
+        """
+        Store the results of every past race of a season that has none yet
+        
+        Classifications are fetched concurrently; each race is then stored
+        and settled through update_race_results.
+        
+        Args:
+            dry_run: Return (changes, plan JSON) instead of writing; the plan
+                also covers races whose stored classification changed
+        
+        Returns:
+            (races_synced, message)
+        """
+        if dry_run:
+            return await DataSyncService.plan_sync(db, season, "results")
         try:
-            # Get event from DB
-            event = db.query(Event).filter(
-                Event.external_id == event_external_id
-            ).first()
-            
-            if not event:
-                return 0, "Event not found in database"
+            ended_before = datetime.utcnow() - timedelta(minutes=SESSION_LENGTH_MINUTES)
+            due = (
+                db.query(Race.id, Event.external_id, Category.code, RaceType.code)
+                .join(Event, Race.event_id == Event.id)
+                .join(Category, Race.category_id == Category.id)
+                .join(RaceType, Race.race_type_id == RaceType.id)
+                .filter(
+                    Event.season == season,
+                    Race.race_datetime <= ended_before,
+                    Race.status != "cancelled",
+                    ~Race.race_results.any()
+                )
+                .all()
+            )
+            if not due:
+                return 0, "No races awaiting results"
             
             async with get_motogp_client() as api:
-                # Get event details with session schedule
-                event_data = await api.get_event_details(event_external_id, season)
+                category_codes = sorted({category_code for _, _, category_code, _ in due})
+                uuids = dict(zip(category_codes, await asyncio.gather(
+                    *(api.get_category_id(code, season) for code in category_codes)
+                )))
+                semaphore = asyncio.Semaphore(settings.api_max_concurrency)
                 
-                if not event_data:
-                    return 0, "Could not fetch event details from API"
+                async def fetch(event_ext_id: str, category_code: str, race_type_code: str):
+                    category_uuid = uuids.get(category_code)
+                    if not category_uuid:
+                        return []
+                    async with semaphore:
+                        session_id = await api.get_race_session_id(
+                            event_ext_id, category_uuid, RACE_SESSION_TYPES[race_type_code]
+                        )
+                        if not session_id:
+                            return []
+                        return await api.get_race_results(event_ext_id, session_id, category_uuid, season)
                 
-                # Get categories and race types
-                categories = {cat.code: cat for cat in db.query(Category).all()}
-                race_types = {rt.code: rt for rt in db.query(RaceType).all()}
+                classifications = await asyncio.gather(*(
+                    fetch(event_ext_id, category_code, race_type_code)
+                    for _, event_ext_id, category_code, race_type_code in due
+                ))
+            
+            races_synced = 0
+            for (race_id, _, _, _), results_data in zip(due, classifications):
+                if not results_data:
+                    continue
+                await DataSyncService.update_race_results(db, race_id, results_data=results_data)
+                races_synced += 1
+            
+            logger.info(f"Race results {season}: {races_synced}/{len(due)} races")
+            return races_synced, f"Results: {races_synced} of {len(due)} races"
+        
+        except Exception as e:
+            logger.error(f"Error syncing race results: {e}", exc_info=True)
+            db.rollback()
+            return 0, f"Error: {str(e)}"
+    
+    @staticmethod
+    def session_result_rows(
+        session_id: int,
+        results_data: List[ClassificationEntry],
+        rider_ids: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Session result rows for a bulk upsert
+        
+        Lap times are parsed once here into integer milliseconds; the gap
+        is derived from the fastest lap instead of the display string.
+        """
+        laps = {entry.rider_id: parse_lap_time(entry.best_lap_time) for entry in results_data}
+        fastest = min((ms for ms in laps.values() if ms is not None), default=None)
+        rows = []
+        for entry in results_data:
+            rider_id = rider_ids.get(entry.rider_id)
+            if rider_id is None:
+                logger.warning(f"Rider {entry.rider_id} not found in database")
+                continue
+            
+            best_lap_ms = laps[entry.rider_id]
+            rows.append({
+                "session_id": session_id,
+                "rider_id": rider_id,
+                "position": entry.position,
+                "best_lap_time": entry.best_lap_time,
+                "best_lap_ms": best_lap_ms,
+                "best_lap_number": entry.best_lap_number,
+                "total_laps": entry.total_laps,
+                "gap_to_first": entry.gap,
+                "gap_ms": best_lap_ms - fastest if best_lap_ms is not None else None
+            })
+        return rows
+    
+    @staticmethod
+    async def sync_session_results(
+        db: Session,
+        season: int,
+        since: Optional[datetime] = None
+    ) -> Tuple[int, str]:
+        """
+        Store practice/qualifying classifications of sessions without results
+        
+        Schedules and classifications are fetched concurrently and all rows
+        are written with one multi-row upsert.
+        
+        Args:
+            since: Ignore sessions that started before this time (None: whole season)
+        
+        Returns:
+            (sessions_synced, message)
+        """
+        try:
+            ended_before = datetime.utcnow() - timedelta(minutes=SESSION_LENGTH_MINUTES)
+            query = (
+                db.query(DBSession.id, SessionType.code, Event.external_id, Category.code)
+                .join(SessionType, DBSession.session_type_id == SessionType.id)
+                .join(Race, DBSession.race_id == Race.id)
+                .join(Event, Race.event_id == Event.id)
+                .join(Category, Race.category_id == Category.id)
+                .filter(
+                    Event.season == season,
+                    DBSession.session_datetime <= ended_before,
+                    ~DBSession.session_results.any()
+                )
+            )
+            if since:
+                query = query.filter(DBSession.session_datetime >= since)
+            due = query.all()
+            if not due:
+                return 0, "No sessions awaiting results"
+            
+            pairs = sorted({(event_ext_id, category_code) for _, _, event_ext_id, category_code in due})
+            category_codes = sorted({category_code for _, category_code in pairs})
+            
+            async with get_motogp_client() as api:
+                uuids = dict(zip(category_codes, await asyncio.gather(
+                    *(api.get_category_id(code, season) for code in category_codes)
+                )))
+                semaphore = asyncio.Semaphore(settings.api_max_concurrency)
                 
-                races_synced = 0
+                async def bounded(coro):
+                    async with semaphore:
+                        return await coro
                 
-                # Process each category
-                for cat_code, category in categories.items():
-                    # Get category UUID
-                    category_uuid = await api.get_category_id(cat_code, season)
-                    if not category_uuid:
-                        continue
-                    
-                    # Find race sessions in event data
-                    # This requires parsing the event data structure
-                    # TODO: Implement based on actual API response structure
-                    
-                    logger.info(f"Processed category {cat_code} for event {event.name}")
+                pairs = [pair for pair in pairs if uuids.get(pair[1])]
+                schedules = await asyncio.gather(*(
+                    bounded(api.get_sessions(event_ext_id, uuids[category_code]))
+                    for event_ext_id, category_code in pairs
+                ))
+                # (event, category, session type code) -> API session id
+                api_session_ids = {}
+                for (event_ext_id, category_code), schedule in zip(pairs, schedules):
+                    for session in schedule:
+                        code = DataSyncService.session_type_code(session)
+                        api_session_ids[(event_ext_id, category_code, code)] = session.session_id
                 
+                fetches = []
+                for session_id, code, event_ext_id, category_code in due:
+                    api_session_id = api_session_ids.get((event_ext_id, category_code, code))
+                    if api_session_id:
+                        fetches.append((session_id, event_ext_id, category_code, api_session_id))
+                classifications = await asyncio.gather(*(
+                    bounded(api.get_session_results(
+                        event_ext_id, api_session_id, uuids[category_code], season
+                    ))
+                    for _, event_ext_id, category_code, api_session_id in fetches
+                ))
+            
+            rider_ids = dict(
+                db.query(Rider.external_id, Rider.id)
+                .filter(Rider.external_id.in_({
+                    entry.rider_id for results_data in classifications for entry in results_data
+                }))
+                .all()
+            )
+            rows = []
+            sessions_synced = 0
+            for (session_id, _, _, _), results_data in zip(fetches, classifications):
+                session_rows = DataSyncService.session_result_rows(session_id, results_data, rider_ids)
+                if session_rows:
+                    sessions_synced += 1
+                    rows.extend(session_rows)
+            
+            if rows:
+                stmt = insert(SessionResult).values(rows)
+                stmt = stmt.on_duplicate_key_update(
+                    position=stmt.inserted.position,
+                    best_lap_time=stmt.inserted.best_lap_time,
+                    best_lap_ms=stmt.inserted.best_lap_ms,
+                    best_lap_number=stmt.inserted.best_lap_number,
+                    total_laps=stmt.inserted.total_laps,
+                    gap_to_first=stmt.inserted.gap_to_first,
+                    gap_ms=stmt.inserted.gap_ms
+                )
+                db.execute(stmt)
                 db.commit()
-                return races_synced, f"Synced {races_synced} races"
-                
+                render_cache.invalidate(TIMES)
+            
+            logger.info(f"Session results {season}: {sessions_synced}/{len(due)} sessions, {len(rows)} rows")
+            return sessions_synced, f"Sessions: {sessions_synced} of {len(due)} with results"
+        
         except Exception as e:
-            logger.error(f"Error syncing races: {e}", exc_info=True)
+            logger.error(f"Error syncing session results: {e}", exc_info=True)
             db.rollback()
             return 0, f"Error: {str(e)}"
     
+    @staticmethod
+    def result_rows(
+        race_id: int,
+        results_data: List[ClassificationEntry],
+        rider_ids: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Race result rows for a batch insert
+        
+        Riders without a classified position (crashes, DNS, DSQ) are placed
+        after the classified ones in API order, since positions are unique.
+        Riders missing from rider_ids are skipped.
+        """
+        rows = []
+        next_position = max((entry.position or 0 for entry in results_data), default=0) + 1
+        for entry in results_data:
+            rider_id = rider_ids.get(entry.rider_id)
+            if rider_id is None:
+                logger.warning(f"Rider {entry.rider_id} not found in database")
+                continue
+            
+            status = result_status(entry)
+            position = entry.position if status == "finished" else None
+            if not position:
+                position = next_position
+                next_position += 1
+            rows.append({
+                "race_id": race_id,
+                "rider_id": rider_id,
+                "position": position,
+                "points": 0,  # Official championship points, not our betting points
+                "time_gap": entry.gap,
+                "status": status
+            })
+        return rows
+    
     @staticmethod
     async def update_race_results(
         db: Session,
-        race_id: int
+        race_id: int,
+        results_data: Optional[List[ClassificationEntry]] = None
     ) -> Tuple[bool, str]:
         """
-        Update race results from API
+        Store race results from API and settle the race
+        
+        Results are written in one batch and committed together with the
+        bet scores and standings. If the race cannot be settled (e.g. an
+        incomplete podium) nothing is stored, so the race is picked up again.
         
         Args:
             race_id: Database race ID
+            results_data: Already fetched classification (skips the API call)
         
         Returns:
-            (success, message)
+            (settled, message)
         """
         try:
-            from src.database.models import RaceResult
-            
             # Get race from DB
             race = db.query(Race).filter(Race.id == race_id).first()
             if not race:
                 return False, "Race not found"
             
-            # Get event external ID
-            event_external_id = race.event.external_id
-            season = race.event.season
-            
-            async with get_motogp_client() as api:
-                # Get category UUID
-                category_uuid = await api.get_category_id(race.category.code, season)
-                if not category_uuid:
-                    return False, "Category not found in API"
-                
-                # Determine session ID based on race type
-                # This is a simplified version - actual implementation needs proper session ID mapping
-                session_id = "RAC" if race.race_type.code == "RACE" else "SPR"
-                
-                # Get results from API
-                results_data = await api.get_race_results(
-                    event_external_id,
-                    session_id,
-                    category_uuid,
-                    season
-                )
-                
-                if not results_data:
-                    return False, "No results available from API"
-                
-                # Clear existing results
-                db.query(RaceResult).filter(RaceResult.race_id == race_id).delete()
+            if results_data is None:
+                # Get event external ID
+                event_external_id = race.event.external_id
+                season = race.event.season
                 
-                # Insert new results
-                for result_data in results_data:
-                    # Find rider by external ID
-                    rider = db.query(Rider).filter(
-                        Rider.external_id == result_data["rider_id"]
-                    ).first()
+                async with get_motogp_client() as api:
+                    # Get category UUID
+                    category_uuid = await api.get_category_id(race.category.code, season)
+                    if not category_uuid:
+                        return False, "Category not found in API"
                     
-                    if not rider:
-                        logger.warning(f"Rider {result_data['rider_id']} not found in database")
-                        continue
+                    # Find the race (RAC) or sprint (SPR) session of the event
+                    session_type = RACE_SESSION_TYPES[race.race_type.code]
+                    session_id = await api.get_race_session_id(
+                        event_external_id,
+                        category_uuid,
+                        session_type
+                    )
+                    if not session_id:
+                        return False, f"Session {session_type} not found in API"
                     
-                    result = RaceResult(
-                        race_id=race_id,
-                        rider_id=rider.id,
-                        position=result_data["position"],
-                        points=0,  # Official championship points, not our betting points
-                        time_gap=result_data.get("gap"),
-                        status="finished"
+                    # Get results from API
+                    results_data = await api.get_race_results(
+                        event_external_id,
+                        session_id,
+                        category_uuid,
+                        season
                     )
-                    db.add(result)
-                
-                # Update race status
-                race.status = "finished"
-                
-                db.commit()
-                logger.info(f"Updated results for race {race_id}")
-                return True, f"Updated {len(results_data)} results"
-                
+            
+            if not results_data:
+                return False, "No results available from API"
+            
+            # Resolve every rider with one query
+            rider_ids = dict(
+                db.query(Rider.external_id, Rider.id)
+                .filter(Rider.external_id.in_({entry.rider_id for entry in results_data}))
+                .all()
+            )
+            rows = DataSyncService.result_rows(race_id, results_data, rider_ids)
+            
+            # Results of an already settled race are being replaced: score it again
+            ScoringService.revert_race_scores(db, [race_id])
+            
+            # Replace existing results in one batch
+            db.query(RaceResult).filter(RaceResult.race_id == race_id).delete()
+            if rows:
+                db.execute(insert(RaceResult).values(rows))
+            race.status = "finished"
+            
+            # Score bets and update standings in the same transaction: a race
+            # that cannot be settled keeps no results, so it is fetched again
+            settled, message = ScoringService.process_race_results(db, race_id)
+            if not settled:
+                db.rollback()
+                logger.warning(f"Race {race_id} not settled: {message}")
+                return False, message
+            
+            db.commit()
+            render_cache.invalidate(RACES)
+            logger.info(f"Stored {len(rows)} results for race {race_id}")
+            return True, f"Updated {len(rows)} results; {message}"
+        
         except Exception as e:
             logger.error(f"Error updating race results: {e}", exc_info=True)
             db.rollback()
@@ -332,6 +1011,8 @@ async def sync_all_data(db: Session, season: int) -> Dict[str, Any]:
     results = {
         "calendar": {"count": 0, "message": ""},
         "riders": {"count": 0, "message": ""},
+        "races": {"count": 0, "message": ""},
+        "sessions": {"count": 0, "message": ""},
         "success": False
     }
     
@@ -344,8 +1025,16 @@ async def sync_all_data(db: Session, season: int) -> Dict[str, Any]:
         count, msg = await DataSyncService.sync_riders(db, season)
         results["riders"] = {"count": count, "message": msg}
         
-        results["success"] = True
+        # Sync races and sessions (needs the events)
+        count, msg = await DataSyncService.sync_season_races(db, season)
+        results["races"] = {"count": count, "message": msg}
         
+        # Sync practice/qualifying times
+        count, msg = await DataSyncService.sync_session_results(db, season)
+        results["sessions"] = {"count": count, "message": msg}
+        
+        results["success"] = True
+    
     except Exception as e:
         logger.error(f"Error in sync_all_data: {e}")
         results["message"] = str(e)
@@ -0,0 +1,182 @@
+"""
+Race Poller
+Polls race classifications after the chequered flag and settles bets
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+from src.api import get_motogp_client
+from src.api.payloads import ClassificationEntry
+from src.config import settings
+from src.database import get_db
+from src.database.models import Race
+from src.services.data_sync_service import DataSyncService, RACE_SESSION_TYPES
+from src.utils.logger import logger
+
+
+# Expected session length by race type code (start to chequered flag)
+RACE_DURATION_MINUTES = {
+    "SPRINT": 20,
+    "RACE": 40
+}
+
+
+class RacePoller:
+    """
+    Adaptive result poller
+    
+    Idle unless a race is past its scheduled end without results. For those
+    races the classification is polled every few seconds with conditional
+    requests until it stops changing, then the race is settled.
+    """
+    
+    def __init__(self):
+        self._active: Set[int] = set()
+        # Background polls started by poll_due_races (references keep them alive)
+        self._tasks: Set[asyncio.Task] = set()
+    
+    @staticmethod
+    def expected_end(race: Race) -> datetime:
+        """Scheduled end of a race"""
+        minutes = RACE_DURATION_MINUTES.get(race.race_type.code, 40)
+        return race.race_datetime + timedelta(minutes=minutes)
+    
+    @staticmethod
+    def get_races_awaiting_results(db, now: Optional[datetime] = None) -> List[Race]:
+        """Races whose scheduled end has passed but are not finished yet"""
+        now = now or datetime.utcnow()
+        # Give up on races whose polling window has long expired
+        window_start = now - timedelta(minutes=settings.result_poll_timeout_minutes + 60)
+        
+        races = db.query(Race).filter(
+            Race.race_datetime > window_start,
+            Race.race_datetime <= now,
+            Race.status.in_(["betting_closed", "in_progress"])
+        ).all()
+        
+        return [race for race in races if RacePoller.expected_end(race) <= now]
+    
+    @staticmethod
+    def is_stable(unchanged_polls: int, results: Optional[List[ClassificationEntry]]) -> bool:
+        """Classification is final once it stopped changing and has a podium"""
+        return (
+            results is not None
+            and len(results) >= 3
+            and unchanged_polls >= settings.result_poll_stable_count
+        )
+    
+    async def poll_due_races(self) -> List[int]:
+        """
+        Start polling every race past its scheduled end
+        
+        Polls run in the background (each can take up to the poll timeout),
+        so the periodic sweep returns at once and keeps picking up races.
+        
+        Returns:
+            IDs of the races whose polling was started
+        """
+        with get_db() as db:
+            race_ids = [race.id for race in self.get_races_awaiting_results(db)]
+        
+        started = []
+        for race_id in race_ids:
+            if race_id in self._active:
+                continue
+            task = asyncio.create_task(self.poll_race(race_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            started.append(race_id)
+        return started
+    
+    async def poll_race(self, race_id: int) -> bool:
+        """
+        Poll a race classification until it stabilizes, then settle it
+        
+        Returns:
+            True if results were stored and bets settled
+        """
+        if race_id in self._active:
+            return False
+        self._active.add(race_id)
+        
+        try:
+            with get_db() as db:
+                race = db.query(Race).filter(Race.id == race_id).first()
+                if not race or race.status == "finished":
+                    return False
+                event_id = race.event.external_id
+                season = race.event.season
+                category_code = race.category.code
+                session_type = RACE_SESSION_TYPES[race.race_type.code]
+            
+            results = await self._wait_for_classification(
+                event_id, season, category_code, session_type
+            )
+            if not results:
+                logger.warning(f"Results for race {race_id} did not stabilize")
+                return False
+            
+            with get_db() as db:
+                success, message = await DataSyncService.update_race_results(
+                    db, race_id, results_data=results
+                )
+                if not success:
+                    logger.warning(f"Could not settle race {race_id}: {message}")
+                    return False
+                
+                logger.info(f"Race {race_id} settled: {message}")
+                return True
+        
+        except Exception as e:
+            logger.error(f"Error polling race {race_id}: {e}", exc_info=True)
+            return False
+        finally:
+            self._active.discard(race_id)
+    
+    async def _wait_for_classification(
+        self,
+        event_id: str,
+        season: int,
+        category_code: str,
+        session_type: str
+    ) -> Optional[List[ClassificationEntry]]:
+        """Poll until the classification is stable or the timeout expires"""
+        deadline = time.monotonic() + settings.result_poll_timeout_minutes * 60
+        
+        async with get_motogp_client() as api:
+            category_uuid = await api.get_category_id(category_code, season)
+            if not category_uuid:
+                return None
+            
+            session_id = None
+            etag: Optional[str] = None
+            results: Optional[List[ClassificationEntry]] = None
+            unchanged = 0
+            
+            while time.monotonic() < deadline:
+                try:
+                    if not session_id:
+                        session_id = await api.get_race_session_id(
+                            event_id, category_uuid, session_type
+                        )
+                    
+                    if session_id:
+                        fresh, etag = await api.get_classification_if_changed(session_id, etag)
+                        if fresh is None or fresh == results:
+                            unchanged += 1
+                        else:
+                            results = fresh
+                            unchanged = 0
+                        
+                        if self.is_stable(unchanged, results):
+                            return results
+                
+                except Exception as e:
+                    logger.warning(f"Result poll failed for session {session_id}: {e}")
+                
+                await asyncio.sleep(settings.result_poll_seconds)
+        
+        return None
@@ -4,7 +4,7 @@ Calculates points from race results
 """
 
 from typing import List, Dict, Tuple, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_
 
 from src.database.models import (
@@ -13,6 +13,7 @@ from src.database.models import (
 )
 from src.config import settings
 from src.utils.logger import logger
+from src.utils.render_cache import render_cache, STANDINGS
 
 
 class ScoringService:
@@ -126,7 +127,7 @@ class ScoringService:
             return True, "Sin apuestas para procesar"
         
         # Calculate scores for each bet
-        scores_created = 0
+        new_scores = []
         for bet in bets:
             # Check if score already exists
             existing_score = db.query(BetScore).filter(
@@ -153,25 +154,62 @@ class ScoringService:
             )
             
             db.add(bet_score)
-            scores_created += 1
+            new_scores.append(bet_score)
         
-        db.commit()
+        # Committed together with the championship standings
+        db.flush()
+        
+        # Update championship standings (only with the scores created now)
+        ScoringService.update_championship_standings(db, race, new_scores)
+        
+        logger.info(f"Processed {len(new_scores)} bets for race {race_id}")
+        return True, f"Procesadas {len(new_scores)} apuestas"
+    
+    @staticmethod
+    def revert_race_scores(db: Session, race_ids: List[int]) -> int:
+        """
+        Remove the scores of races whose results are being replaced
+        
+        Their points are taken back from the championship standings so the
+        races can be settled again. Does not commit: the caller commits
+        together with the new results.
+        
+        Returns:
+            Number of scores removed
+        """
+        if not race_ids:
+            return 0
         
-        # Update championship standings
-        ScoringService.update_championship_standings(db, race)
+        races = {race.id: race for race in db.query(Race).filter(Race.id.in_(race_ids)).all()}
+        scores = db.query(BetScore).filter(BetScore.race_id.in_(race_ids)).all()
+        for score in scores:
+            race = races[score.race_id]
+            standing = db.query(ChampionshipStanding).filter(
+                and_(
+                    ChampionshipStanding.season == race.event.season,
+                    ChampionshipStanding.category_id == race.category_id,
+                    ChampionshipStanding.user_id == score.user_id
+                )
+            ).first()
+            if standing:
+                standing.total_points -= score.total_points
+                standing.races_participated -= 1
+            db.delete(score)
         
-        logger.info(f"Processed {scores_created} bets for race {race_id}")
-        return True, f"Procesadas {scores_created} apuestas"
+        logger.info(f"Reverted {len(scores)} scores for races {sorted(races)}")
+        return len(scores)
     
     @staticmethod
-    def update_championship_standings(db: Session, race: Race) -> None:
-        """Update championship standings after a race"""
+    def update_championship_standings(db: Session, race: Race, scores: List[BetScore]) -> None:
+        """
+        Add new scores of a race to the championship standings
+        
+        Only scores not counted yet may be passed: standings are cumulative,
+        so adding a score twice doubles its points.
+        """
         season = race.event.season
         category_id = race.category_id
         
-        # Get all scores for this race
-        scores = db.query(BetScore).filter(BetScore.race_id == race.id).all()
-        
         for score in scores:
             # Get or create championship standing
             standing = db.query(ChampionshipStanding).filter(
@@ -260,6 +298,7 @@ class ScoringService:
             global_standing.races_participated = points["races"]
         
         db.commit()
+        render_cache.invalidate(STANDINGS)
         logger.info(f"Updated global standings for season {season}")
     
     @staticmethod
@@ -288,7 +327,9 @@ class ScoringService:
         limit: int = 10
     ) -> List[GlobalStanding]:
         """Get global standings"""
-        return db.query(GlobalStanding).filter(
+        return db.query(GlobalStanding).options(
+            joinedload(GlobalStanding.user)
+        ).filter(
             GlobalStanding.season == season
         ).order_by(
             GlobalStanding.total_points.desc()
@@ -0,0 +1,669 @@
+"""
+Sync Plan Service
+Dry-run mode of the data sync: computes the insert/update/delete plan of a
+season against one consistent read of the database and emits it as JSON.
+A saved plan is applied with one batched statement per table.
+
+Plan rows reference parents by natural key (external ids, race keys), so
+rows whose parents are only created by the same plan can be planned too;
+ids are resolved when the plan is applied.
+"""
+
+import asyncio
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Date, DateTime
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+
+from src.api import get_motogp_client
+from src.api.payloads import ClassificationEntry, EventInfo, RiderInfo
+from src.config import settings
+from src.database.models import (
+    Category, Circuit, Event, Race, RaceResult, RaceType, Rider, RiderSeason,
+    Session as DBSession, SessionType
+)
+from src.services.data_sync_service import (
+    DataSyncService, RACE_SESSION_TYPES, SESSION_LENGTH_MINUTES, naive_utc, row_hash
+)
+from src.services.scoring_service import ScoringService
+from src.utils.logger import logger
+from src.utils.render_cache import render_cache, RACES
+
+
+PLAN_FORMAT = 1
+
+# Tables in apply order (parents first)
+PLAN_MODELS = {
+    "circuits": Circuit,
+    "events": Event,
+    "riders": Rider,
+    "rider_seasons": RiderSeason,
+    "races": Race,
+    "sessions": DBSession,
+    "race_results": RaceResult,
+}
+
+# Sync entity -> tables it plans
+PLAN_ENTITIES = {
+    "calendar": ("circuits", "events"),
+    "riders": ("riders", "rider_seasons"),
+    "races": ("races", "sessions"),
+    "results": ("race_results",),
+}
+
+# (event external id, category id, race type id)
+RaceKey = Tuple[str, int, int]
+
+
+@dataclass
+class TableChanges:
+    """Planned changes of one table"""
+    insert: List[Dict[str, Any]] = field(default_factory=list)
+    update: List[Dict[str, Any]] = field(default_factory=list)
+    delete: List[Any] = field(default_factory=list)
+    unchanged: int = 0
+    
+    def __str__(self) -> str:
+        return f"+{len(self.insert)} ~{len(self.update)} -{len(self.delete)} ={self.unchanged}"
+
+
+@dataclass
+class SyncPlan:
+    """Insert/update/delete plan of a season"""
+    season: int
+    entities: List[str]
+    tables: Dict[str, TableChanges] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat(timespec="seconds"))
+    
+    def table(self, name: str) -> TableChanges:
+        return self.tables.setdefault(name, TableChanges())
+    
+    @property
+    def change_count(self) -> int:
+        return sum(
+            len(changes.insert) + len(changes.update) + len(changes.delete)
+            for changes in self.tables.values()
+        )
+    
+    def summary(self) -> str:
+        return ", ".join(f"{name} {self.tables[name]}" for name in PLAN_MODELS if name in self.tables)
+    
+    def to_json(self, indent: Optional[int] = None) -> str:
+        # default=str keeps datetimes in the form row_hash() sees them
+        return json.dumps({
+            "format": PLAN_FORMAT,
+            "season": self.season,
+            "entities": self.entities,
+            "created_at": self.created_at,
+            "tables": {name: asdict(changes) for name, changes in self.tables.items()}
+        }, default=str, ensure_ascii=False, indent=indent)
+    
+    @classmethod
+    def from_json(cls, text: str) -> "SyncPlan":
+        data = json.loads(text)
+        if data.get("format") != PLAN_FORMAT:
+            raise ValueError(f"Unsupported sync plan format: {data.get('format')}")
+        
+        plan = cls(season=data["season"], entities=data["entities"], created_at=data["created_at"])
+        for name, changes in data["tables"].items():
+            columns = PLAN_MODELS[name].__table__.columns
+            plan.tables[name] = TableChanges(
+                insert=[_decode_row(row, columns) for row in changes["insert"]],
+                update=[_decode_row(row, columns) for row in changes["update"]],
+                delete=[tuple(key) if isinstance(key, list) else key for key in changes["delete"]],
+                unchanged=changes["unchanged"]
+            )
+        return plan
+
+
+def _decode_row(row: Dict[str, Any], columns) -> Dict[str, Any]:
+    """Restore the Python types a JSON round trip loses"""
+    decoded = {}
+    for key, value in row.items():
+        column = columns.get(key)
+        if value is not None and column is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and column is not None and isinstance(column.type, Date):
+            value = date.fromisoformat(value)
+        elif isinstance(value, list):
+            value = tuple(value)
+        decoded[key] = value
+    return decoded
+
+
+def plan_changes(
+    changes: TableChanges,
+    rows: Dict[Any, Dict[str, Any]],
+    existing_hashes: Dict[Any, Optional[str]],
+    resolve: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]] = lambda row: row
+) -> None:
+    """
+    Sort rows into inserts, updates and unchanged ones
+    
+    Args:
+        rows: Plan rows keyed by natural key
+        existing_hashes: Natural key -> stored sync_hash
+        resolve: Row as it would be stored (None when a parent does not exist yet)
+    """
+    for key, row in rows.items():
+        if key not in existing_hashes:
+            changes.insert.append(row)
+            continue
+        stored = resolve(row)
+        if stored is None or row_hash(stored) != existing_hashes[key]:
+            changes.update.append(row)
+        else:
+            changes.unchanged += 1
+
+
+class SyncPlanService:
+    """Service for dry-run sync plans and batched plan application"""
+    
+    @staticmethod
+    async def build_plan(
+        db: Session,
+        season: int,
+        entities: Optional[List[str]] = None
+    ) -> SyncPlan:
+        """
+        Compute what a sync of the season would change, without writing
+        
+        Every database read happens inside one transaction (a single
+        consistent InnoDB snapshot) that is rolled back; nothing is written.
+        
+        Args:
+            entities: Subset of calendar, riders, races, results (all by default)
+        """
+        entities = entities or list(PLAN_ENTITIES)
+        plan = SyncPlan(season=season, entities=entities)
+        
+        db.rollback()
+        try:
+            categories = [
+                (category.id, category.code)
+                for category in db.query(Category).filter(Category.is_active == True).all()
+            ]
+            race_type_ids = dict(db.query(RaceType.code, RaceType.id).all())
+            session_type_ids = dict(db.query(SessionType.code, SessionType.id).all())
+            
+            fetched = await SyncPlanService._fetch(season, entities, categories)
+            snapshot = SyncPlanService._read_snapshot(db, season)
+            
+            if "calendar" in entities:
+                SyncPlanService._plan_calendar(plan, fetched["events"], snapshot)
+            if "riders" in entities:
+                SyncPlanService._plan_riders(plan, fetched["riders"], snapshot)
+            if "races" in entities:
+                # Schedules are keyed by external event id, so are the race keys
+                race_rows, session_rows = DataSyncService.schedule_rows(
+                    fetched["schedules"], race_type_ids, session_type_ids
+                )
+                SyncPlanService._plan_races(
+                    plan, race_rows, session_rows, set(fetched["schedules"]), snapshot
+                )
+            if "results" in entities:
+                SyncPlanService._plan_results(plan, fetched["classifications"], race_type_ids, snapshot)
+        finally:
+            db.rollback()
+        
+        logger.info(f"Sync plan {season}: {plan.summary()}")
+        return plan
+    
+    @staticmethod
+    async def _fetch(season: int, entities: List[str], categories: List[Tuple[int, str]]) -> Dict[str, Any]:
+        """Fetch every API payload the plan needs, concurrently"""
+        fetched = {"events": [], "riders": {}, "schedules": {}, "classifications": {}}
+        semaphore = asyncio.Semaphore(settings.api_max_concurrency)
+        
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+        
+        async with get_motogp_client() as api:
+            uuids = await asyncio.gather(*(api.get_category_id(code, season) for _, code in categories))
+            categories = [
+                (category_id, category_uuid)
+                for (category_id, _), category_uuid in zip(categories, uuids)
+                if category_uuid
+            ]
+            
+            if "riders" in entities:
+                riders = await asyncio.gather(
+                    *(bounded(api.get_riders(season, category_uuid)) for _, category_uuid in categories)
+                )
+                fetched["riders"] = {
+                    category_id: riders_data
+                    for (category_id, _), riders_data in zip(categories, riders)
+                }
+            
+            if not {"calendar", "races", "results"} & set(entities):
+                return fetched
+            
+            # Same filter as sync_calendar
+            fetched["events"] = [
+                event_data for event_data in await api.get_calendar(season)
+                if not event_data.test and event_data.date_start and event_data.circuit_id
+            ]
+            if not {"races", "results"} & set(entities):
+                return fetched
+            
+            pairs = [
+                (event_data.event_id, category_id, category_uuid)
+                for event_data in fetched["events"]
+                for category_id, category_uuid in categories
+            ]
+            schedules = await asyncio.gather(
+                *(bounded(api.get_sessions(event_id, category_uuid)) for event_id, _, category_uuid in pairs)
+            )
+            fetched["schedules"] = {
+                (event_id, category_id): schedule
+                for (event_id, category_id, _), schedule in zip(pairs, schedules)
+            }
+            
+            if "results" in entities:
+                ended_before = datetime.utcnow() - timedelta(minutes=SESSION_LENGTH_MINUTES)
+                race_sessions = [
+                    (event_id, category_id, category_uuid, session)
+                    for (event_id, category_id, category_uuid), schedule in zip(pairs, schedules)
+                    for session in schedule
+                    if session.type in RACE_SESSION_TYPES.values()
+                    and session.date and naive_utc(session.date) <= ended_before
+                ]
+                classifications = await asyncio.gather(*(
+                    bounded(api.get_race_results(event_id, session.session_id, category_uuid, season))
+                    for event_id, _, category_uuid, session in race_sessions
+                ))
+                fetched["classifications"] = {
+                    (event_id, category_id, session.type): results_data
+                    for (event_id, category_id, _, session), results_data in zip(race_sessions, classifications)
+                    if results_data
+                }
+        return fetched
+    
+    @staticmethod
+    def _read_snapshot(db: Session, season: int) -> Dict[str, Any]:
+        """Read every table the plan is compared against (same transaction)"""
+        events = db.query(Event.external_id, Event.id, Event.sync_hash).filter(Event.season == season).all()
+        event_ids = [event_id for _, event_id, _ in events]
+        event_ext = {event_id: ext_id for ext_id, event_id, _ in events}
+        riders = db.query(Rider.external_id, Rider.id, Rider.sync_hash).all()
+        
+        races = {}
+        for race_id, event_id, category_id, race_type_id, race_datetime, status in (
+            db.query(Race.id, Race.event_id, Race.category_id, Race.race_type_id, Race.race_datetime, Race.status)
+            .filter(Race.event_id.in_(event_ids))
+            .all()
+        ):
+            races[(event_ext[event_id], category_id, race_type_id)] = (race_id, race_datetime, status)
+        race_ids = [race_id for race_id, _, _ in races.values()]
+        
+        results: Dict[int, set] = {}
+        for race_id, rider_id, position, status, time_gap in (
+            db.query(
+                RaceResult.race_id, RaceResult.rider_id, RaceResult.position,
+                RaceResult.status, RaceResult.time_gap
+            )
+            .filter(RaceResult.race_id.in_(race_ids))
+            .all()
+        ):
+            results.setdefault(race_id, set()).add((rider_id, position, status, time_gap))
+        
+        return {
+            "circuits": {ext_id: (circuit_id, sync_hash) for ext_id, circuit_id, sync_hash in
+                         db.query(Circuit.external_id, Circuit.id, Circuit.sync_hash).all()},
+            "events": {ext_id: (event_id, sync_hash) for ext_id, event_id, sync_hash in events},
+            "riders": {ext_id: (rider_id, sync_hash) for ext_id, rider_id, sync_hash in riders},
+            "rider_seasons": {
+                (rider_id, category_id): sync_hash
+                for rider_id, category_id, sync_hash in
+                db.query(RiderSeason.rider_id, RiderSeason.category_id, RiderSeason.sync_hash)
+                .filter(RiderSeason.season == season)
+                .all()
+            },
+            "races": races,
+            "sessions": {
+                (race_id, session_type_id): (session_id, sync_hash)
+                for session_id, race_id, session_type_id, sync_hash in
+                db.query(DBSession.id, DBSession.race_id, DBSession.session_type_id, DBSession.sync_hash)
+                .filter(DBSession.race_id.in_(race_ids))
+                .all()
+            },
+            "results": results,
+        }
+    
+    @staticmethod
+    def _plan_calendar(plan: SyncPlan, events_data: List[EventInfo], snapshot: Dict[str, Any]) -> None:
+        circuits = snapshot["circuits"]
+        plan_changes(
+            plan.table("circuits"),
+            DataSyncService.circuit_rows(events_data),
+            {ext_id: sync_hash for ext_id, (_, sync_hash) in circuits.items()}
+        )
+        
+        # Keep the circuit external id; the id is resolved on apply
+        event_rows = {}
+        circuit_refs = {event_data.circuit_id: event_data.circuit_id for event_data in events_data}
+        for row in DataSyncService.event_rows(events_data, plan.season, circuit_refs):
+            row["circuit_external_id"] = row.pop("circuit_id")
+            event_rows[row["external_id"]] = row
+        
+        def resolve(row):
+            circuit = circuits.get(row["circuit_external_id"])
+            if circuit is None:
+                return None
+            stored = {key: value for key, value in row.items() if key != "circuit_external_id"}
+            stored["circuit_id"] = circuit[0]
+            return stored
+        
+        plan_changes(
+            plan.table("events"),
+            event_rows,
+            {ext_id: sync_hash for ext_id, (_, sync_hash) in snapshot["events"].items()},
+            resolve
+        )
+    
+    @staticmethod
+    def _plan_riders(
+        plan: SyncPlan,
+        riders_by_category: Dict[int, List[RiderInfo]],
+        snapshot: Dict[str, Any]
+    ) -> None:
+        riders = snapshot["riders"]
+        rider_rows, season_rows = DataSyncService.rider_rows(riders_by_category)
+        plan_changes(
+            plan.table("riders"),
+            rider_rows,
+            {ext_id: sync_hash for ext_id, (_, sync_hash) in riders.items()}
+        )
+        
+        rows = {
+            (row["rider_external_id"], row["category_id"]): {
+                "rider_external_id": row["rider_external_id"],
+                "category_id": row["category_id"],
+                "season": plan.season,
+                "team_name": row["team_name"],
+                "bike": row["bike"],
+                "is_active": True
+            }
+            for row in season_rows
+        }
+        rider_ext = {rider_id: ext_id for ext_id, (rider_id, _) in riders.items()}
+        
+        def resolve(row):
+            stored = {key: value for key, value in row.items() if key != "rider_external_id"}
+            stored["rider_id"] = riders[row["rider_external_id"]][0]
+            return stored
+        
+        plan_changes(
+            plan.table("rider_seasons"),
+            rows,
+            {
+                (rider_ext[rider_id], category_id): sync_hash
+                for (rider_id, category_id), sync_hash in snapshot["rider_seasons"].items()
+            },
+            resolve
+        )
+    
+    @staticmethod
+    def _plan_races(
+        plan: SyncPlan,
+        race_rows: Dict[RaceKey, Dict[str, Any]],
+        session_rows: List[Dict[str, Any]],
+        fetched_pairs: Set[Tuple[str, int]],
+        snapshot: Dict[str, Any]
+    ) -> None:
+        # Same rules as sync_season_races: only start times of open races move
+        races = snapshot["races"]
+        changes = plan.table("races")
+        for key, row in race_rows.items():
+            row["event_external_id"] = row.pop("event_id")
+            stored = races.get(key)
+            if stored is None:
+                changes.insert.append(row)
+            elif stored[1] != row["race_datetime"] and stored[2] not in ("finished", "cancelled"):
+                changes.update.append(row)
+            else:
+                changes.unchanged += 1
+        
+        rows = {(row["race_key"], row["session_type_id"]): row for row in session_rows}
+        race_keys = {race_id: key for key, (race_id, _, _) in races.items()}
+        existing = {
+            (race_keys[race_id], session_type_id): stored
+            for (race_id, session_type_id), stored in snapshot["sessions"].items()
+        }
+        
+        def resolve(row):
+            stored = {key: value for key, value in row.items() if key != "race_key"}
+            stored["race_id"] = races[row["race_key"]][0]
+            return stored
+        
+        changes = plan.table("sessions")
+        plan_changes(
+            changes,
+            rows,
+            {key: sync_hash for key, (_, sync_hash) in existing.items()},
+            resolve
+        )
+        # Sessions no longer in a schedule that was fetched
+        for key, (session_id, _) in existing.items():
+            race_key = key[0]
+            if (race_key[0], race_key[1]) in fetched_pairs and key not in rows:
+                changes.delete.append(session_id)
+    
+    @staticmethod
+    def _plan_results(
+        plan: SyncPlan,
+        classifications: Dict[Tuple[str, int, str], List[ClassificationEntry]],
+        race_type_ids: Dict[str, int],
+        snapshot: Dict[str, Any]
+    ) -> None:
+        """Results of races without stored results, or whose classification changed"""
+        races = snapshot["races"]
+        riders = snapshot["riders"]
+        race_type_codes = {session_type: code for code, session_type in RACE_SESSION_TYPES.items()}
+        # Riders known once the plan is applied: unknown ones are skipped before
+        # unclassified riders are numbered, exactly as result_rows does live
+        planned_riders = plan.tables["riders"].insert if "riders" in plan.tables else []
+        known_riders = set(riders) | {row["external_id"] for row in planned_riders}
+        rider_map = {ext_id: ext_id for ext_id in known_riders}
+        changes = plan.table("race_results")
+        for (event_ext_id, category_id, session_type), results_data in classifications.items():
+            race_type_id = race_type_ids.get(race_type_codes[session_type])
+            if race_type_id is None:
+                continue
+            race_key = (event_ext_id, category_id, race_type_id)
+            race = races.get(race_key)
+            if race and race[2] == "cancelled":
+                continue
+            
+            rows = DataSyncService.result_rows(None, results_data, rider_map)
+            for row in rows:
+                del row["race_id"]
+                row["rider_external_id"] = row.pop("rider_id")
+                row["race_key"] = race_key
+            
+            stored = snapshot["results"].get(race[0]) if race else None
+            if stored is None:
+                changes.insert.extend(rows)
+                continue
+            planned = {
+                (riders[row["rider_external_id"]][0], row["position"], row["status"], row["time_gap"])
+                for row in rows
+                if row["rider_external_id"] in riders
+            }
+            if planned == stored:
+                changes.unchanged += 1
+            else:
+                # Corrected classification: replace the stored results
+                changes.delete.append(race_key)
+                changes.insert.extend(rows)
+    
+    @staticmethod
+    def apply_plan(db: Session, plan: SyncPlan) -> Dict[str, int]:
+        """
+        Apply a plan with one batched statement per table and operation
+        
+        Foreign keys are resolved after each parent table is written. Races
+        that received results are settled once everything is committed; the
+        scores of corrected classifications are reverted in the same
+        transaction and computed again.
+        
+        Returns:
+            Rows written (or deleted) per table
+        """
+        written = {}
+        try:
+            for name in PLAN_MODELS:
+                changes = plan.tables.get(name)
+                if not changes or not (changes.insert or changes.update or changes.delete):
+                    continue
+                apply_table = getattr(SyncPlanService, f"_apply_{name}")
+                written[name] = apply_table(db, changes.insert + changes.update, changes.delete)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        if written:
+            render_cache.invalidate(RACES)
+        
+        results = plan.tables.get("race_results")
+        if results and results.insert:
+            # _race_ids returns every race of the events: settle only those with new results
+            keys = {row["race_key"] for row in results.insert}
+            race_ids = _race_ids(db, keys)
+            for race_id in sorted({race_ids[key] for key in keys if key in race_ids}):
+                ScoringService.process_race_results(db, race_id)
+            if results.delete:
+                # Reverted points must also leave the global table when a race cannot be settled again
+                ScoringService.update_global_standings(db, plan.season)
+        
+        logger.info(f"Applied sync plan {plan.season}: {written}")
+        return written
+    
+    @staticmethod
+    def _apply_circuits(db: Session, rows: List[Dict[str, Any]], deletes: List[Any]) -> int:
+        return _upsert(db, Circuit, _hashed(rows), ("name", "country", "location", "sync_hash"))
+    
+    @staticmethod
+    def _apply_events(db: Session, rows: List[Dict[str, Any]], deletes: List[Any]) -> int:
+        circuit_ids = _ids(db, Circuit, {row["circuit_external_id"] for row in rows})
+        rows = _resolve(rows, "circuit_external_id", "circuit_id", circuit_ids)
+        return _upsert(
+            db, Event, _hashed(rows), ("circuit_id", "name", "country", "event_date", "sync_hash")
+        )
+    
+    @staticmethod
+    def _apply_riders(db: Session, rows: List[Dict[str, Any]], deletes: List[Any]) -> int:
+        return _upsert(
+            db, Rider, _hashed(rows), ("first_name", "last_name", "number", "country", "sync_hash")
+        )
+    
+    @staticmethod
+    def _apply_rider_seasons(db: Session, rows: List[Dict[str, Any]], deletes: List[Any]) -> int:
+        rider_ids = _ids(db, Rider, {row["rider_external_id"] for row in rows})
+        rows = _resolve(rows, "rider_external_id", "rider_id", rider_ids)
+        return _upsert(db, RiderSeason, _hashed(rows), ("team_name", "bike", "is_active", "sync_hash"))
+    
+    @staticmethod
+    def _apply_races(db: Session, rows: List[Dict[str, Any]], deletes: List[Any]) -> int:
+        event_ids = _ids(db, Event, {row["event_external_id"] for row in rows})
+        rows = _resolve(rows, "event_external_id", "event_id", event_ids)
+        return _upsert(db, Race, rows, ("race_datetime", "bet_close_datetime"))
+    
+    @staticmethod
+    def _apply_sessions(db: Session, rows: List[Dict[str, Any]], deletes: List[Any]) -> int:
+        deleted = 0
+        if deletes:
+            deleted = db.query(DBSession).filter(DBSession.id.in_(deletes)).delete(synchronize_session=False)
+        race_ids = _race_ids(db, {row["race_key"] for row in rows})
+        rows = _resolve(rows, "race_key", "race_id", race_ids)
+        return deleted + _upsert(
+            db, DBSession, _hashed(rows), ("session_datetime", "status", "sync_hash")
+        )
+    
+    @staticmethod
+    def _apply_race_results(db: Session, rows: List[Dict[str, Any]], deletes: List[Any]) -> int:
+        race_ids = _race_ids(db, {row["race_key"] for row in rows} | set(deletes))
+        deleted = 0
+        replaced = [race_ids[key] for key in deletes if key in race_ids]
+        if replaced:
+            ScoringService.revert_race_scores(db, replaced)
+            deleted = db.query(RaceResult).filter(
+                RaceResult.race_id.in_(replaced)
+            ).delete(synchronize_session=False)
+        
+        rider_ids = _ids(db, Rider, {row["rider_external_id"] for row in rows})
+        rows = _resolve(rows, "race_key", "race_id", race_ids)
+        rows = _resolve(rows, "rider_external_id", "rider_id", rider_ids)
+        if rows:
+            db.execute(insert(RaceResult).values(rows))
+            db.query(Race).filter(
+                Race.id.in_({row["race_id"] for row in rows})
+            ).update({"status": "finished"}, synchronize_session=False)
+        return deleted + len(rows)
+
+
+def _hashed(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Set sync_hash the way the live sync does"""
+    for row in rows:
+        row["sync_hash"] = row_hash(row)
+    return rows
+
+
+def _upsert(db: Session, model, rows: List[Dict[str, Any]], columns: Tuple[str, ...]) -> int:
+    """One multi-row INSERT ... ON DUPLICATE KEY UPDATE"""
+    if not rows:
+        return 0
+    stmt = insert(model).values(rows)
+    db.execute(stmt.on_duplicate_key_update(**{column: stmt.inserted[column] for column in columns}))
+    return len(rows)
+
+
+def _ids(db: Session, model, external_ids) -> Dict[str, int]:
+    """External id -> id for already written rows"""
+    if not external_ids:
+        return {}
+    return dict(
+        db.query(model.external_id, model.id)
+        .filter(model.external_id.in_(list(external_ids)))
+        .all()
+    )
+
+
+def _race_ids(db: Session, race_keys) -> Dict[RaceKey, int]:
+    """Race key -> race id for already written races"""
+    event_ids = _ids(db, Event, {key[0] for key in race_keys})
+    if not event_ids:
+        return {}
+    event_ext = {event_id: ext_id for ext_id, event_id in event_ids.items()}
+    return {
+        (event_ext[event_id], category_id, race_type_id): race_id
+        for race_id, event_id, category_id, race_type_id in
+        db.query(Race.id, Race.event_id, Race.category_id, Race.race_type_id)
+        .filter(Race.event_id.in_(list(event_ext)))
+        .all()
+    }
+
+
+def _resolve(
+    rows: List[Dict[str, Any]],
+    field_name: str,
+    target: str,
+    ids: Dict[Any, int]
+) -> List[Dict[str, Any]]:
+    """Replace a natural-key reference by the id (rows whose parent is missing are skipped)"""
+    resolved = []
+    for row in rows:
+        ref = row[field_name]
+        if ref not in ids:
+            logger.warning(f"Skipping planned row: {field_name} {ref} not found")
+            continue
+        stored = {key: value for key, value in row.items() if key != field_name}
+        stored[target] = ids[ref]
+        resolved.append(stored)
+    return resolved
@@ -0,0 +1,90 @@
+"""
+Timing Service
+Practice timesheets built from stored session results
+"""
+
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.database.models import (
+    Category, Event, Race, Rider, SessionResult, SessionType,
+    Session as DBSession
+)
+
+
+# Session types combined into the practice timesheet
+PRACTICE_SESSION_CODES = ("FP1", "FP2", "FP3", "PR")
+
+
+class TimingService:
+    """Service for session lap times"""
+    
+    @staticmethod
+    def format_lap_time(milliseconds: int) -> str:
+        """Format milliseconds as 1:39.123"""
+        minutes, rest = divmod(milliseconds, 60_000)
+        seconds, millis = divmod(rest, 1000)
+        if minutes:
+            return f"{minutes}:{seconds:02d}.{millis:03d}"
+        return f"{seconds}.{millis:03d}"
+    
+    @staticmethod
+    def get_latest_practice_event(db: Session, category_id: int) -> Optional[Event]:
+        """Most recent event with practice times for a category"""
+        return (
+            db.query(Event)
+            .join(Race, Race.event_id == Event.id)
+            .join(DBSession, DBSession.race_id == Race.id)
+            .join(SessionType, DBSession.session_type_id == SessionType.id)
+            .filter(
+                Race.category_id == category_id,
+                SessionType.code.in_(PRACTICE_SESSION_CODES),
+                DBSession.session_results.any()
+            )
+            .order_by(DBSession.session_datetime.desc())
+            .first()
+        )
+    
+    @staticmethod
+    def get_combined_practice_times(
+        db: Session,
+        event_id: int,
+        category_id: int,
+        limit: int = 15
+    ) -> List[Tuple[Rider, int]]:
+        """
+        Best lap of each rider across the practice sessions of an event
+        
+        Returns:
+            [(rider, best_lap_ms)] fastest first
+        """
+        best = (
+            db.query(SessionResult.rider_id, func.min(SessionResult.best_lap_ms).label("best_lap_ms"))
+            .join(DBSession, SessionResult.session_id == DBSession.id)
+            .join(Race, DBSession.race_id == Race.id)
+            .join(SessionType, DBSession.session_type_id == SessionType.id)
+            .filter(
+                Race.event_id == event_id,
+                Race.category_id == category_id,
+                SessionType.code.in_(PRACTICE_SESSION_CODES),
+                SessionResult.best_lap_ms.isnot(None)
+            )
+            .group_by(SessionResult.rider_id)
+            .order_by("best_lap_ms")
+            .limit(limit)
+            .all()
+        )
+        riders = {
+            rider.id: rider
+            for rider in db.query(Rider).filter(Rider.id.in_([rider_id for rider_id, _ in best])).all()
+        }
+        return [(riders[rider_id], best_lap_ms) for rider_id, best_lap_ms in best if rider_id in riders]
+    
+    @staticmethod
+    def get_category(db: Session, code: str) -> Optional[Category]:
+        """Active category by code (case-insensitive)"""
+        return db.query(Category).filter(
+            Category.code == code.upper(),
+            Category.is_active == True
+        ).first()
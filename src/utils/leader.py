@@ -0,0 +1,117 @@
+"""
+Leader election between bot replicas
+Uses a MySQL named lock (GET_LOCK) held on a dedicated connection, so only
+one replica runs scheduled jobs. MySQL releases the lock as soon as the
+leader's connection dies, and a follower takes over on its next check.
+"""
+
+import asyncio
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.config import settings
+from src.database import engine
+from src.utils.logger import logger
+
+
+class LeaderElector:
+    """Keeps trying to acquire the leader lock and reports role changes"""
+    
+    def __init__(
+        self,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        lock_name: Optional[str] = None,
+        check_seconds: Optional[int] = None
+    ):
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lock_name = lock_name or settings.leader_lock_name
+        self.check_seconds = check_seconds or settings.leader_check_seconds
+        self.is_leader = False
+        self._conn: Optional[Connection] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def _try_acquire(self) -> bool:
+        """Try to take the lock without waiting"""
+        if self._conn is None:
+            self._conn = engine.connect()
+        result = self._conn.execute(
+            text("SELECT GET_LOCK(:name, 0)"), {"name": self.lock_name}
+        ).scalar()
+        return result == 1
+    
+    def _still_held(self) -> bool:
+        """Check the lock is still owned by our connection"""
+        result = self._conn.execute(
+            text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": self.lock_name}
+        ).scalar()
+        return result == 1
+    
+    def _release(self) -> None:
+        """Release the lock and drop the dedicated connection"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.lock_name})
+        except Exception:
+            pass
+        finally:
+            self._conn.close()
+            self._conn = None
+    
+    def _set_leader(self, is_leader: bool) -> None:
+        if is_leader == self.is_leader:
+            return
+        self.is_leader = is_leader
+        if is_leader:
+            logger.info(f"Elected leader ({self.lock_name})")
+            self.on_elected()
+        else:
+            logger.warning(f"Lost leadership ({self.lock_name})")
+            self.on_demoted()
+    
+    def check(self) -> bool:
+        """Run one election round"""
+        try:
+            if self.is_leader:
+                held = self._still_held()
+            else:
+                held = self._try_acquire()
+        except Exception as e:
+            logger.error(f"Leader election error: {e}")
+            held = False
+            # Connection is unusable; the lock (if any) died with it
+            if self._conn is not None:
+                try:
+                    self._conn.invalidate()
+                    self._conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+        
+        self._set_leader(held)
+        return held
+    
+    async def _run(self):
+        while True:
+            self.check()
+            await asyncio.sleep(self.check_seconds)
+    
+    def start(self) -> None:
+        """Start the election loop"""
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the election loop and step down"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._set_leader(False)
+        self._release()
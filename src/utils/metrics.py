@@ -0,0 +1,234 @@
+"""
+Runtime metrics
+- Per-command wall time, DB query count and DB time
+- Event loop lag
+- Prometheus-style text endpoint and periodic log summary
+"""
+
+import asyncio
+import functools
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, Deque, Dict, List, Optional
+
+from aiohttp import web
+
+from src.utils.logger import logger
+
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Histogram:
+    """Rolling window of samples with count/sum totals"""
+
+    def __init__(self, window: int = 1024):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Get quantile (0..1) over the rolling window"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+
+class _CallStats:
+    """DB usage accumulated by the command currently running"""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+_current_call: ContextVar[Optional[_CallStats]] = ContextVar("metrics_call", default=None)
+
+
+class MetricsRegistry:
+    """Collects per-command histograms"""
+
+    def __init__(self):
+        self.wall_time: Dict[str, Histogram] = {}
+        self.db_time: Dict[str, Histogram] = {}
+        self.db_queries: Dict[str, Histogram] = {}
+        self.loop_lag: Dict[str, Histogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.current_loop_lag = 0.0
+        self.counters: Dict[str, int] = {}
+
+    @staticmethod
+    def _histogram(family: Dict[str, Histogram], name: str) -> Histogram:
+        histogram = family.get(name)
+        if histogram is None:
+            histogram = family[name] = Histogram()
+        return histogram
+
+    def record_call(
+        self,
+        name: str,
+        wall_time: float,
+        stats: _CallStats,
+        loop_lag: float,
+        failed: bool = False
+    ) -> None:
+        """Record one finished handler/job execution"""
+        self._histogram(self.wall_time, name).observe(wall_time)
+        self._histogram(self.db_time, name).observe(stats.db_time)
+        self._histogram(self.db_queries, name).observe(stats.queries)
+        self._histogram(self.loop_lag, name).observe(loop_lag)
+        if failed:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def record_query(self, duration: float) -> None:
+        """Record a DB statement for the command currently running"""
+        stats = _current_call.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += duration
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Increment a plain counter"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def track(self, name: str) -> Callable:
+        """Decorator recording metrics for an async handler or job"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                stats = _CallStats()
+                token = _current_call.set(stats)
+                loop_lag = self.current_loop_lag
+                start = time.perf_counter()
+                failed = False
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    failed = True
+                    raise
+                finally:
+                    _current_call.reset(token)
+                    self.record_call(name, time.perf_counter() - start, stats, loop_lag, failed)
+            return wrapper
+        return decorator
+
+    def render(self) -> str:
+        """Render metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+        families = [
+            ("novaporra_command_seconds", "Command wall time", self.wall_time),
+            ("novaporra_command_db_seconds", "DB time per command", self.db_time),
+            ("novaporra_command_db_queries", "DB queries per command", self.db_queries),
+            ("novaporra_command_loop_lag_seconds", "Event loop lag at command start", self.loop_lag),
+        ]
+
+        for metric, help_text, family in families:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} summary")
+            for name in sorted(family):
+                histogram = family[name]
+                for q in QUANTILES:
+                    lines.append(
+                        f'{metric}{{command="{name}",quantile="{q}"}} {histogram.quantile(q):.6f}'
+                    )
+                lines.append(f'{metric}_sum{{command="{name}"}} {histogram.total:.6f}')
+                lines.append(f'{metric}_count{{command="{name}"}} {histogram.count}')
+
+        lines.append("# TYPE novaporra_command_errors_total counter")
+        for name in sorted(self.errors):
+            lines.append(f'novaporra_command_errors_total{{command="{name}"}} {self.errors[name]}')
+
+        lines.append("# TYPE novaporra_event_loop_lag_seconds gauge")
+        lines.append(f"novaporra_event_loop_lag_seconds {self.current_loop_lag:.6f}")
+
+        for name in sorted(self.counters):
+            lines.append(f"# TYPE novaporra_{name} counter")
+            lines.append(f"novaporra_{name} {self.counters[name]}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """One-line-per-command summary for the log"""
+        lines = []
+        for name in sorted(self.wall_time):
+            wall = self.wall_time[name]
+            queries = self.db_queries[name]
+            db_time = self.db_time[name]
+            lines.append(
+                f"{name}: n={wall.count} "
+                f"p50={wall.quantile(0.5) * 1000:.1f}ms p99={wall.quantile(0.99) * 1000:.1f}ms "
+                f"queries_p50={queries.quantile(0.5):.0f} db_p99={db_time.quantile(0.99) * 1000:.1f}ms"
+            )
+        return "\n".join(lines)
+
+
+class MetricsServer:
+    """Background tasks: loop lag probe, log summary and /metrics endpoint"""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        port: int = 0,
+        summary_minutes: int = 15,
+        lag_interval: float = 1.0
+    ):
+        self.registry = registry
+        self.port = port
+        self.summary_minutes = summary_minutes
+        self.lag_interval = lag_interval
+        self._tasks: List[asyncio.Task] = []
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _probe_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self.registry.current_loop_lag = max(0.0, loop.time() - start - self.lag_interval)
+
+    async def _log_summary(self):
+        while True:
+            await asyncio.sleep(self.summary_minutes * 60)
+            summary = self.registry.summary()
+            if summary:
+                logger.info(f"Command metrics:\n{summary}")
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain")
+
+    async def start(self):
+        """Start background tasks and HTTP endpoint (if a port is configured)"""
+        self._tasks.append(asyncio.create_task(self._probe_loop_lag()))
+        if self.summary_minutes > 0:
+            self._tasks.append(asyncio.create_task(self._log_summary()))
+
+        if self.port:
+            app = web.Application()
+            app.router.add_get("/metrics", self._handle_metrics)
+            self._runner = web.AppRunner(app)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, "0.0.0.0", self.port).start()
+            logger.info(f"Metrics endpoint listening on :{self.port}/metrics")
+
+    async def stop(self):
+        """Stop background tasks and HTTP endpoint"""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
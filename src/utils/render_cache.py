@@ -0,0 +1,86 @@
+"""
+Rendered message cache for read-only bot commands
+- Stores pre-formatted Markdown keyed by command and arguments
+- Countdown fragments are filled in at send time
+- Entries are dropped when domain events touch their data
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from src.utils.logger import logger
+
+
+# Domain event tags
+RACES = "races"
+STANDINGS = "standings"
+TIMES = "times"
+
+
+class CachedMessage:
+    """Pre-rendered message with countdown placeholders"""
+
+    __slots__ = ("text", "deadlines", "tags", "created_at")
+
+    def __init__(self, text: str, deadlines: Dict[str, datetime], tags: Tuple[str, ...]):
+        self.text = text
+        self.deadlines = deadlines
+        self.tags = tags
+        self.created_at = time.monotonic()
+
+
+class RenderCache:
+    """In-process cache of rendered command responses"""
+
+    def __init__(self, max_age_seconds: int = 600):
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[Tuple, CachedMessage] = {}
+
+    @staticmethod
+    def placeholder(index: int) -> str:
+        """Token replaced by a countdown at send time"""
+        return f"\x00close{index}\x00"
+
+    def get(self, key: Tuple) -> Optional[CachedMessage]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self.max_age_seconds:
+            del self._entries[key]
+            return None
+        return entry
+
+    def set(
+        self,
+        key: Tuple,
+        text: str,
+        tags: Iterable[str],
+        deadlines: Optional[Dict[str, datetime]] = None
+    ) -> CachedMessage:
+        entry = CachedMessage(text, deadlines or {}, tuple(tags))
+        self._entries[key] = entry
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry depending on any of the given domain tags"""
+        stale = [key for key, entry in self._entries.items() if set(entry.tags) & set(tags)]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.debug(f"Render cache invalidated {len(stale)} entries for {tags}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @staticmethod
+    def fill(entry: CachedMessage, countdown: Callable[[datetime], str]) -> str:
+        """Fill countdown placeholders of a cached message"""
+        text = entry.text
+        for token, deadline in entry.deadlines.items():
+            text = text.replace(token, countdown(deadline))
+        return text
+
+
+# Global render cache instance
+render_cache = RenderCache()
@@ -7,56 +7,210 @@ Scheduler for automated tasks
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
+import pytz
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from telegram import Bot
 
 from src.config import settings
-from src.database import get_db
+from src.database import get_db, engine
 from src.database.models import Race, Bet, Notification
 from src.services import BettingService
+from src.services.data_sync_service import DataSyncService
+from src.services.race_poller import RacePoller
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+
+# Minutes before betting closes to send the warning
+WARNING_MINUTES = 15
+
+# Running scheduler, used by the persistent per-race jobs
+_active_scheduler: Optional["TaskScheduler"] = None
+
+
+@metrics.track("job_race_warning")
+async def race_warning_job(race_id: int):
+    """Persistent job: warn users that betting for a race closes soon"""
+    if _active_scheduler:
+        await _active_scheduler.warn_race(race_id)
+
+
+@metrics.track("job_race_close")
+async def race_close_job(race_id: int):
+    """Persistent job: close betting for a race"""
+    if _active_scheduler:
+        await _active_scheduler.close_race(race_id)
+
+
+@metrics.track("job_race_results")
+async def race_results_job(race_id: int):
+    """Persistent job: fetch results for a race"""
+    if _active_scheduler:
+        await _active_scheduler.poll_race_results(race_id)
+
+
+def rearm_races(races: List[Race]) -> int:
+    """Create or move the jobs of races whose times changed (needs a running scheduler)"""
+    if not _active_scheduler:
+        return 0
+    for race in races:
+        _active_scheduler.schedule_race(race)
+    return len(races)
 
 
 class TaskScheduler:
     """Scheduler for automated tasks"""
     
     def __init__(self, telegram_bot: Bot):
-        self.scheduler = AsyncIOScheduler()
+        # Per-race jobs live in MySQL so they survive restarts; a restarted
+        # bot runs every missed job once, immediately
+        self.scheduler = AsyncIOScheduler(
+            jobstores={
+                "default": SQLAlchemyJobStore(engine=engine),
+                "memory": MemoryJobStore()
+            },
+            job_defaults={
+                "coalesce": True,
+                "misfire_grace_time": None,
+                "max_instances": 1
+            },
+            timezone=pytz.utc
+        )
         self.bot = telegram_bot
+        self.poller = RacePoller()
         self._setup_jobs()
     
     def _setup_jobs(self):
         """Setup scheduled jobs"""
         
-        # Check for betting close every minute
+        # Arm exact-time jobs for races created since the last run
         self.scheduler.add_job(
-            self.close_expired_bets,
-            trigger=IntervalTrigger(minutes=1),
+            metrics.track("job_arm_races")(self.arm_upcoming_races),
+            trigger=IntervalTrigger(hours=1),
+            id="arm_races",
+            name="Arm per-race jobs",
+            jobstore="memory",
+            next_run_time=datetime.now(pytz.utc)
+        )
+        
+        # Safety net for races without a close job
+        self.scheduler.add_job(
+            metrics.track("job_close_expired_bets")(self.close_expired_bets),
+            trigger=IntervalTrigger(minutes=10),
             id="close_bets",
-            name="Close expired betting"
+            name="Close expired betting",
+            jobstore="memory"
         )
         
         # Send bet closing warnings (15 minutes before)
         self.scheduler.add_job(
-            self.send_closing_warnings,
+            metrics.track("job_send_closing_warnings")(self.send_closing_warnings),
             trigger=IntervalTrigger(minutes=5),
             id="closing_warnings",
-            name="Send betting close warnings"
+            name="Send betting close warnings",
+            jobstore="memory"
         )
         
-        # Update race data every hour
+        # Pick up races past their scheduled end without results
         self.scheduler.add_job(
-            self.update_race_data,
-            trigger=IntervalTrigger(hours=1),
+            metrics.track("job_update_race_data")(self.update_race_data),
+            trigger=IntervalTrigger(minutes=5),
             id="update_races",
-            name="Update race data"
+            name="Update race data",
+            jobstore="memory"
+        )
+        
+        # Store practice/qualifying times of finished sessions
+        self.scheduler.add_job(
+            metrics.track("job_update_session_results")(self.update_session_results),
+            trigger=IntervalTrigger(minutes=15),
+            id="session_results",
+            name="Update session results",
+            jobstore="memory"
         )
         
         logger.info("Scheduled jobs configured")
     
+    def schedule_race(self, race: Race):
+        """Create or move the warning, close and result jobs of a race"""
+        now = datetime.utcnow()
+        jobs = [
+            (f"race_{race.id}_warning", race_warning_job,
+             race.bet_close_datetime - timedelta(minutes=WARNING_MINUTES)),
+            (f"race_{race.id}_close", race_close_job, race.bet_close_datetime),
+            (f"race_{race.id}_results", race_results_job, RacePoller.expected_end(race)),
+        ]
+        
+        for job_id, func, run_at in jobs:
+            # Past warnings are pointless; past closes/results still need to run
+            if func is race_warning_job and run_at < now:
+                continue
+            self.scheduler.add_job(
+                func,
+                trigger=DateTrigger(run_date=pytz.utc.localize(run_at)),
+                args=[race.id],
+                id=job_id,
+                name=job_id,
+                replace_existing=True
+            )
+    
+    def unschedule_race(self, race_id: int):
+        """Remove all pending jobs of a race"""
+        for suffix in ("warning", "close", "results"):
+            job = self.scheduler.get_job(f"race_{race_id}_{suffix}")
+            if job:
+                job.remove()
+    
+    async def arm_upcoming_races(self):
+        """Make sure every open race has its exact-time jobs"""
+        try:
+            with get_db() as db:
+                races = db.query(Race).filter(
+                    Race.status.in_(["upcoming", "betting_open"])
+                ).all()
+                
+                for race in races:
+                    self.schedule_race(race)
+                
+                if races:
+                    logger.info(f"Armed jobs for {len(races)} races")
+        
+        except Exception as e:
+            logger.error(f"Error arming race jobs: {e}", exc_info=True)
+    
+    async def close_race(self, race_id: int):
+        """Close betting for a single race at its exact deadline"""
+        try:
+            with get_db() as db:
+                race = db.query(Race).filter(Race.id == race_id).first()
+                if not race or race.status not in ("upcoming", "betting_open"):
+                    return
+                
+                # Deadline moved later since the job was created
+                if race.bet_close_datetime > datetime.utcnow():
+                    self.schedule_race(race)
+                    return
+                
+                BettingService.close_betting(db, race.id)
+                await self.notify_betting_closed(race)
+        
+        except Exception as e:
+            logger.error(f"Error closing race {race_id}: {e}", exc_info=True)
+    
+    async def warn_race(self, race_id: int):
+        """Send the closing warning for a single race"""
+        await self.send_closing_warnings(race_id=race_id)
+    
+    async def poll_race_results(self, race_id: int):
+        """Poll results for a race from its scheduled end and settle bets"""
+        await self.poller.poll_race(race_id)
+    
     async def close_expired_bets(self):
         """Close betting for races where time has expired"""
         try:
@@ -68,46 +222,29 @@ class TaskScheduler:
                     
                     # Send notification to all users with bets
                     await self.notify_betting_closed(race)
-                    
+                
                 if races_to_close:
                     logger.info(f"Closed betting for {len(races_to_close)} races")
-                    
+        
         except Exception as e:
             logger.error(f"Error closing bets: {e}", exc_info=True)
     
-    async def send_closing_warnings(self):
+    async def send_closing_warnings(self, race_id: Optional[int] = None):
         """Send warnings 15 minutes before betting closes"""
         try:
             with get_db() as db:
-                now = datetime.utcnow()
-                warning_time = now + timedelta(minutes=15)
-                
-                # Get races closing soon
-                races = db.query(Race).filter(
-                    Race.bet_close_datetime <= warning_time,
-                    Race.bet_close_datetime > now,
-                    Race.status == "betting_open"
-                ).all()
+                # One query for races + recipients, one insert to log them
+                races = BettingService.get_closing_warning_recipients(
+                    db, WARNING_MINUTES, race_id=race_id
+                )
+                if not races:
+                    return
                 
-                for race in races:
-                    # Check if warning already sent
-                    warning_sent = db.query(Notification).filter(
-                        Notification.race_id == race.id,
-                        Notification.notification_type == "bet_closing"
-                    ).first()
-                    
-                    if not warning_sent:
-                        await self.notify_betting_closing(race)
-                        
-                        # Log notification
-                        notif = Notification(
-                            notification_type="bet_closing",
-                            race_id=race.id,
-                            message=f"Betting closing warning for race {race.id}"
-                        )
-                        db.add(notif)
-                        db.commit()
-                        
+                BettingService.mark_closing_warnings_sent(db, list(races.keys()))
+            
+            for rid, race in races.items():
+                await self.notify_betting_closing(rid, race)
+        
         except Exception as e:
             logger.error(f"Error sending warnings: {e}", exc_info=True)
     
@@ -154,61 +291,71 @@ class TaskScheduler:
                         logger.error(f"Error sending to user {bet.user.telegram_id}: {e}")
                 
                 logger.info(f"Sent betting closed notification for race {race.id}")
-                
+        
         except Exception as e:
             logger.error(f"Error in notify_betting_closed: {e}", exc_info=True)
     
-    async def notify_betting_closing(self, race: Race):
+    async def notify_betting_closing(self, race_id: int, race: dict):
         """Send warning that betting is closing soon"""
-        try:
-            with get_db() as db:
-                bets = BettingService.get_all_bets_for_race(db, race.id)
-                
-                message = (
-                    f"⚠️ *¡Las apuestas cierran pronto!*\n\n"
-                    f"📅 {race.event.name}\n"
-                    f"🏁 {race.category.name} - {race.race_type.name}\n\n"
-                    f"⏱️ Cierre en: {BettingService.get_time_until_close(race)}\n\n"
-                    f"Usa /apostar o /editar para actualizar tu apuesta"
+        message = (
+            f"⚠️ *¡Las apuestas cierran pronto!*\n\n"
+            f"📅 {race['event']}\n"
+            f"🏁 {race['category']} - {race['race_type']}\n\n"
+            f"⏱️ Cierre en: {BettingService.format_time_until(race['close'])}\n\n"
+            f"Usa /apostar o /editar para actualizar tu apuesta"
+        )
+        
+        # TODO: Also send to all active users?
+        
+        for user_id in race["recipients"]:
+            try:
+                await self.bot.send_message(
+                    chat_id=user_id,
+                    text=message,
+                    parse_mode="Markdown"
                 )
-                
-                # Send to users with bets
-                user_ids = set()
-                if bets:
-                    for bet in bets:
-                        user_ids.add(bet.user.telegram_id)
-                
-                # TODO: Also send to all active users?
-                
-                for user_id in user_ids:
-                    try:
-                        await self.bot.send_message(
-                            chat_id=user_id,
-                            text=message,
-                            parse_mode="Markdown"
-                        )
-                    except Exception as e:
-                        logger.error(f"Error sending to user {user_id}: {e}")
-                
-                logger.info(f"Sent closing warning for race {race.id}")
-                
-        except Exception as e:
-            logger.error(f"Error in notify_betting_closing: {e}", exc_info=True)
+            except Exception as e:
+                logger.error(f"Error sending to user {user_id}: {e}")
+        
+        logger.info(f"Sent closing warning for race {race_id}")
     
     async def update_race_data(self):
-        """Update race data from API"""
+        """Start result polling for races that finished without results"""
         try:
-            # TODO: Implement API data fetching
-            logger.debug("Race data update check")
+            await self.poller.poll_due_races()
         except Exception as e:
             logger.error(f"Error updating race data: {e}", exc_info=True)
     
-    def start(self):
-        """Start the scheduler"""
-        self.scheduler.start()
-        logger.info("Task scheduler started")
+    async def update_session_results(self):
+        """Fetch classifications of recent sessions that have no results yet"""
+        try:
+            # Sessions still empty after two days were cancelled or never published
+            since = datetime.utcnow() - timedelta(days=2)
+            with get_db() as db:
+                await DataSyncService.sync_session_results(db, settings.current_season, since=since)
+        except Exception as e:
+            logger.error(f"Error updating session results: {e}", exc_info=True)
+    
+    def start(self, paused: bool = False):
+        """Start the scheduler (paused schedulers keep jobs but run none)"""
+        global _active_scheduler
+        _active_scheduler = self
+        self.scheduler.start(paused=paused)
+        logger.info(f"Task scheduler started{' (paused)' if paused else ''}")
+    
+    def resume(self):
+        """Start running jobs (this replica became leader)"""
+        self.scheduler.resume()
+        logger.info("Task scheduler resumed")
+    
+    def pause(self):
+        """Stop running jobs (this replica is no longer leader)"""
+        self.scheduler.pause()
+        logger.info("Task scheduler paused")
     
     def stop(self):
         """Stop the scheduler"""
+        global _active_scheduler
         self.scheduler.shutdown()
+        _active_scheduler = None
         logger.info("Task scheduler stopped")
@@ -0,0 +1,60 @@
+import os
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# The logger opens settings.log_file when src is first imported (during
+# collection), so redirect it before any test module imports src
+os.environ["LOG_FILE"] = str(Path(tempfile.mkdtemp(prefix="novaporra-tests-")) / "novaporra.log")
+
+from src.database.models import (  # noqa: E402
+    Base, Bet, BetScore, Category, Circuit, Event, Race, RaceResult, RaceType, Rider, User
+)
+
+
+@pytest.fixture
+def scoring_db():
+    """In-memory database with event e1, its race types, riders a/b/c and one user"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        User(id=1, telegram_id=100),
+        Category(id=1, name="MotoGP", code="MOTOGP"),
+        Circuit(id=1, name="Jerez", country="ES"),
+        Event(id=1, external_id="e1", season=2024, circuit_id=1, name="GP Spain",
+              country="ES", event_date=date(2024, 4, 28)),
+        RaceType(id=10, name="Carrera", code="RACE", points_exact_position=10,
+                 points_rider_only=5, points_perfect_podium=10),
+        RaceType(id=11, name="Sprint", code="SPRINT", points_exact_position=10,
+                 points_rider_only=5, points_perfect_podium=10),
+    ])
+    db.add_all([Rider(id=i, external_id=ext, first_name=ext, last_name=ext) for i, ext in enumerate("abc", 1)])
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def add_race():
+    """add_race(db, race_id, race_type_id, settled): race of e1 with a bet on a-b-c
+    
+    Settled races finished a-b-c and already carry the bet's score (perfect
+    podium, 40 points); standings are left to the test.
+    """
+    def add(db, race_id, race_type_id, settled):
+        db.add(Race(id=race_id, event_id=1, category_id=1, race_type_id=race_type_id,
+                    status="finished" if settled else "betting_closed",
+                    race_datetime=datetime(2024, 4, 28, 12), bet_close_datetime=datetime(2024, 4, 28, 11)))
+        db.add(Bet(id=race_id, user_id=1, race_id=race_id, first_place_rider_id=1,
+                   second_place_rider_id=2, third_place_rider_id=3))
+        if settled:
+            db.add_all([
+                RaceResult(race_id=race_id, rider_id=i, position=i, status="finished") for i in (1, 2, 3)
+            ])
+            db.add(BetScore(bet_id=race_id, race_id=race_id, user_id=1, points_first=10, points_second=10,
+                            points_third=10, perfect_podium_bonus=10, total_points=40))
+    return add
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import SyncState
+from src.services.backfill_service import BackfillProgress, BackfillService
+
+
+@pytest.fixture
+def db():
+    """In-memory session with the sync_state table"""
+    engine = create_engine("sqlite://")
+    SyncState.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_backfill_season_resumes_and_stops_on_failure(monkeypatch):
+    """Test that done steps are skipped and a failed stage blocks the later ones"""
+    ran = []
+    
+    async def fake_step(season, entity, progress, on_step=None):
+        ran.append(entity)
+        if entity == "races":
+            progress.failed += 1
+            return False
+        progress.done += 1
+        return True
+    
+    monkeypatch.setattr(BackfillService, "run_step", staticmethod(fake_step))
+    progress = BackfillProgress(total=5)
+    
+    ok = asyncio.run(BackfillService.backfill_season(
+        2019,
+        ["calendar", "riders", "races", "results", "sessions"],
+        {(2019, "calendar")},
+        progress
+    ))
+    
+    assert not ok
+    assert ran == ["riders", "races"]
+    assert (progress.skipped, progress.done, progress.failed, progress.blocked) == (1, 1, 1, 2)
+    assert progress.finished == progress.total
+
+
+def test_checkpoints_round_trip(db):
+    """Test that only steps checkpointed as done count as completed"""
+    BackfillService.checkpoint(db, 2019, "calendar", "running")
+    BackfillService.checkpoint(db, 2019, "calendar", "done", 22, "22 events")
+    BackfillService.checkpoint(db, 2019, "riders", "failed", 0, "Error: timeout")
+    BackfillService.checkpoint(db, 2019, "races", "running")
+    BackfillService.checkpoint(db, 2020, "calendar", "done", 15)
+    
+    assert BackfillService.completed_steps(db, [2019]) == {(2019, "calendar")}
+    assert BackfillService.completed_steps(db, [2019, 2020]) == {(2019, "calendar"), (2020, "calendar")}
+    
+    state = db.query(SyncState).filter_by(season=2019, entity="calendar").one()
+    assert (state.row_count, state.message) == (22, "22 events")
+    assert state.started_at <= state.finished_at
+    assert db.query(SyncState).count() == 4
+
+
+def test_interrupted_steps_are_reset(db):
+    """Test that steps left running by a killed run are reported and marked failed"""
+    BackfillService.checkpoint(db, 2019, "races", "running")
+    BackfillService.checkpoint(db, 2019, "calendar", "done", 22)
+    BackfillService.checkpoint(db, 2021, "riders", "running")
+    
+    assert BackfillService.reset_interrupted_steps(db, [2019, 2020]) == [(2019, "races")]
+    state = db.query(SyncState).filter_by(season=2019, entity="races").one()
+    assert (state.status, state.message) == ("failed", "Interrupted")
+    assert BackfillService.reset_interrupted_steps(db, [2019]) == []
@@ -57,3 +57,41 @@ def test_time_until_close():
     
     time_str = BettingService.get_time_until_close(race)
     assert "h" in time_str or "m" in time_str
+
+
+def test_validate_weekend_picks_accepts_valid_slip():
+    """Test that a weekend slip with valid podiums is accepted"""
+    picks = {1: (10, 11, 12), 2: (20, 21, 22)}
+    rosters = {1: {10, 11, 12, 13}, 2: {20, 21, 22}}
+    
+    valid, message = BettingService.validate_weekend_picks(picks, {1, 2}, rosters)
+    assert valid is True
+
+
+def test_validate_weekend_picks_rejects_closed_race():
+    """Test that a weekend slip fails if any race is closed"""
+    picks = {1: (10, 11, 12), 2: (20, 21, 22)}
+    rosters = {1: {10, 11, 12}, 2: {20, 21, 22}}
+    
+    valid, message = BettingService.validate_weekend_picks(picks, {1}, rosters)
+    assert valid is False
+
+
+def test_validate_weekend_picks_rejects_rider_outside_roster():
+    """Test that riders must belong to the race category roster"""
+    picks = {1: (10, 11, 20)}
+    rosters = {1: {10, 11, 12}}
+    
+    valid, message = BettingService.validate_weekend_picks(picks, {1}, rosters)
+    assert valid is False
+    assert "pilotos" in message.lower()
+
+
+def test_validate_weekend_picks_rejects_repeated_rider():
+    """Test that a podium cannot repeat a rider"""
+    picks = {1: (10, 10, 12)}
+    rosters = {1: {10, 11, 12}}
+    
+    valid, message = BettingService.validate_weekend_picks(picks, {1}, rosters)
+    assert valid is False
+    assert "diferentes" in message
@@ -0,0 +1,207 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from src.api.payloads import ClassificationEntry, EventInfo, RiderInfo, SessionInfo
+from src.database.models import BetScore, ChampionshipStanding, Race, RaceResult
+from src.services.data_sync_service import DataSyncService, diff_rows, result_status, row_hash
+
+
+def _event(event_id, circuit_id, day):
+    return EventInfo.from_api({
+        "id": event_id,
+        "name": f"GP {event_id}",
+        "country": {"name": "Spain"},
+        "circuit": {"id": circuit_id, "name": f"Circuit {circuit_id}"},
+        "date_start": f"2024-04-{day:02d}T00:00:00+00:00"
+    })
+
+
+def test_circuit_rows_are_unique_per_circuit():
+    """Test that a circuit hosting two events produces one row"""
+    rows = DataSyncService.circuit_rows([_event("e1", "c1", 5), _event("e2", "c1", 12)])
+    
+    assert list(rows) == ["c1"]
+    assert rows["c1"]["name"] == "Circuit c1"
+
+
+def test_event_rows_resolve_circuits():
+    """Test that event rows reference circuit ids and parse dates once"""
+    rows = DataSyncService.event_rows(
+        [_event("e1", "c1", 5), _event("e2", "unknown", 12)], 2024, {"c1": 7}
+    )
+    
+    assert rows == [{
+        "season": 2024,
+        "circuit_id": 7,
+        "name": "GP e1",
+        "country": "Spain",
+        "event_date": date(2024, 4, 5),
+        "external_id": "e1"
+    }]
+
+
+def _rider(rider_id, number, team):
+    return RiderInfo.from_api({
+        "rider": {"id": rider_id, "number": number, "full_name": "Pedro Acosta Sanchez"},
+        "team": {"name": team}
+    })
+
+
+def test_rider_rows_split_riders_and_seasons():
+    """Test that a rider racing two categories gets one rider row and two seasons"""
+    riders, seasons = DataSyncService.rider_rows({
+        1: [_rider("r1", 31, "GASGAS"), _rider("r2", None, "Wildcard")],
+        2: [_rider("r1", 31, "KTM Ajo")],
+    })
+    
+    assert list(riders) == ["r1"]
+    assert riders["r1"]["first_name"] == "Pedro"
+    assert riders["r1"]["last_name"] == "Acosta Sanchez"
+    assert [(row["category_id"], row["team_name"]) for row in seasons] == [(1, "GASGAS"), (2, "KTM Ajo")]
+
+
+def test_unchanged_rows_are_skipped():
+    """Test that only new or changed rows are written"""
+    stored = {"e1": row_hash({"name": "GP 1"}), "e2": row_hash({"name": "GP 2"})}
+    rows = {"e1": {"name": "GP 1"}, "e2": {"name": "GP 2 (renamed)"}, "e3": {"name": "GP 3"}}
+    
+    changed, stats = diff_rows(rows, stored)
+    
+    assert [row["name"] for row in changed] == ["GP 2 (renamed)", "GP 3"]
+    assert (stats.inserted, stats.updated, stats.unchanged) == (1, 1, 1)
+    assert changed[0]["sync_hash"] == row_hash({"name": "GP 2 (renamed)"})
+
+
+def _session(session_type, number, when):
+    return SessionInfo.from_api({
+        "id": f"{session_type}{number or ''}",
+        "type": session_type,
+        "number": number,
+        "date": when
+    })
+
+
+def test_schedule_rows_build_races_and_sessions():
+    """Test that SPR/RAC become races and practice/qualifying attach to the race"""
+    schedule = [
+        _session("FP", 1, "2099-04-05T10:45:00+02:00"),
+        _session("Q", 2, "2099-04-06T11:15:00+02:00"),
+        _session("SPR", None, "2099-04-06T15:00:00+02:00"),
+        _session("RAC", None, "2099-04-07T14:00:00+02:00"),
+        _session("FP", 4, "2099-04-05T12:00:00+02:00"),
+    ]
+    races, sessions = DataSyncService.schedule_rows(
+        {(1, 2): schedule}, {"RACE": 10, "SPRINT": 11}, {"FP1": 20, "Q2": 21}
+    )
+    
+    race = races[(1, 2, 10)]
+    assert race["race_datetime"] == datetime(2099, 4, 7, 12, 0)
+    assert race["bet_close_datetime"] < race["race_datetime"]
+    assert race["status"] == "upcoming"
+    assert races[(1, 2, 11)]["race_datetime"] == datetime(2099, 4, 6, 13, 0)
+    assert [(s["race_key"], s["session_type_id"]) for s in sessions] == [
+        ((1, 2, 10), 20), ((1, 2, 10), 21)
+    ]
+
+
+def test_past_races_are_synced_closed():
+    """Test that races synced after their deadline do not open for bets"""
+    when = (datetime.utcnow() - timedelta(days=1)).isoformat() + "+00:00"
+    races, _ = DataSyncService.schedule_rows(
+        {(1, 2): [_session("RAC", None, when)]}, {"RACE": 10}, {}
+    )
+    
+    assert races[(1, 2, 10)]["status"] == "betting_closed"
+
+
+def _entry(rider_id, position, status):
+    return ClassificationEntry.from_api({
+        "position": position,
+        "rider": {"id": rider_id},
+        "status": status
+    })
+
+
+def test_result_rows_map_status_and_positions():
+    """Test that crashes and disqualifications are stored after the classified riders"""
+    results = [
+        _entry("a", 1, "INSTND"),
+        _entry("b", 2, "INSTND"),
+        _entry("c", None, "OUTSTND"),
+        _entry("d", 3, "DSQ"),
+        _entry("unknown", 4, "INSTND"),
+    ]
+    rows = DataSyncService.result_rows(9, results, {"a": 1, "b": 2, "c": 3, "d": 4})
+    
+    assert [(row["rider_id"], row["position"], row["status"]) for row in rows] == [
+        (1, 1, "finished"), (2, 2, "finished"), (3, 5, "dnf"), (4, 6, "dsq")
+    ]
+
+
+def test_unknown_result_status_falls_back_to_position():
+    """Test that unknown statuses are decided by the classified position"""
+    assert result_status(_entry("a", 7, None)) == "finished"
+    assert result_status(_entry("a", None, "WEIRD")) == "dnf"
+    assert result_status(_entry("a", None, "dns")) == "dns"
+
+
+def test_session_result_rows_store_lap_times_in_ms():
+    """Test that practice rows carry sortable lap times and gaps"""
+    results = [
+        ClassificationEntry.from_api({
+            "position": 1, "rider": {"id": "a"}, "best_lap": {"time": "1:39.123", "number": 7}
+        }),
+        ClassificationEntry.from_api({
+            "position": 2, "rider": {"id": "b"}, "best_lap": {"time": "1:39.500", "number": 3}
+        }),
+        ClassificationEntry.from_api({"position": 3, "rider": {"id": "c"}}),
+    ]
+    rows = DataSyncService.session_result_rows(5, results, {"a": 1, "b": 2, "c": 3})
+    
+    assert [(row["rider_id"], row["best_lap_ms"], row["gap_ms"]) for row in rows] == [
+        (1, 99123, 0), (2, 99500, 377), (3, None, None)
+    ]
+    assert rows[0]["best_lap_number"] == 7
+
+
+def _classification(order):
+    return [
+        ClassificationEntry.from_api({"position": i, "rider": {"id": rider}, "status": "INSTND"})
+        for i, rider in enumerate(order, 1)
+    ]
+
+
+def test_unsettled_race_results_are_not_stored(scoring_db, add_race):
+    """Test that a race whose podium cannot be scored keeps no results"""
+    db = scoring_db
+    add_race(db, 100, 10, settled=False)
+    db.commit()
+    
+    # Rider "x" is unknown, so position 2 is missing from the podium
+    settled, message = asyncio.run(DataSyncService.update_race_results(
+        db, 100, results_data=_classification(["a", "x", "c"])
+    ))
+    
+    assert not settled
+    assert "incompletos" in message
+    assert db.query(RaceResult).count() == 0
+    assert db.query(BetScore).count() == 0
+    assert db.get(Race, 100).status == "betting_closed"
+
+
+def test_settled_race_is_scored_again_on_new_results(scoring_db, add_race):
+    """Test that re-ingesting a settled race replaces its scores instead of adding them"""
+    db = scoring_db
+    add_race(db, 100, 10, settled=True)
+    db.add(ChampionshipStanding(season=2024, category_id=1, user_id=1, total_points=40, races_participated=1))
+    db.commit()
+    
+    settled, _ = asyncio.run(DataSyncService.update_race_results(
+        db, 100, results_data=_classification("bac")
+    ))
+    
+    assert settled
+    assert db.query(BetScore).one().total_points == 20
+    standing = db.query(ChampionshipStanding).one()
+    assert (standing.total_points, standing.races_participated) == (20, 1)
+    assert db.get(Race, 100).status == "finished"
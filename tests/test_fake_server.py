@@ -0,0 +1,97 @@
+import asyncio
+
+import src.api.motogp_public_api as public_api
+from src.api.fake_server import FakePulseliveServer
+from src.api.fixtures import FixtureStore
+from src.api.motogp_public_api import MotoGPPublicAPIClient
+from src.api.reference_cache import ReferenceCache
+from src.api.resilience import CircuitBreaker, RetryPolicy
+
+
+SEASONS = [{"id": "s2024", "year": 2024, "current": True}]
+EVENTS = [{
+    "id": "e1",
+    "name": "Gran Premio de España",
+    "circuit": {"id": "c1", "name": "Jerez"},
+    "country": {"name": "Spain"},
+    "date_start": "2024-04-26T00:00:00Z"
+}]
+
+
+def _isolate(monkeypatch, tmp_path):
+    monkeypatch.setattr(public_api, "reference_cache", ReferenceCache(str(tmp_path / "ref.json")))
+    monkeypatch.setattr(public_api.response_cache, "directory", None)
+    monkeypatch.setattr(public_api, "retry_policy", RetryPolicy(max_attempts=3, base_delay=0))
+    monkeypatch.setattr(public_api, "circuit_breaker", CircuitBreaker(failure_threshold=100))
+
+
+def test_client_replays_recorded_fixtures(monkeypatch, tmp_path):
+    """Test the client end to end against the fake server"""
+    _isolate(monkeypatch, tmp_path)
+    store = FixtureStore(str(tmp_path / "fixtures"))
+    store.save("results/seasons", None, SEASONS)
+    store.save("results/events", {"seasonUuid": "s2024"}, EVENTS)
+    
+    async def run():
+        server = FakePulseliveServer(store)
+        await server.start()
+        monkeypatch.setattr(public_api.settings, "motogp_api_base_url", server.base_url)
+        try:
+            async with MotoGPPublicAPIClient() as api:
+                return await api.get_calendar(2024), server.requests
+        finally:
+            await server.stop()
+    
+    events, requests = asyncio.run(run())
+    
+    assert [event.name for event in events] == ["Gran Premio de España"]
+    assert requests == 2
+
+
+def test_injected_failures_are_retried(monkeypatch, tmp_path):
+    """Test that injected 503s go through the retry path"""
+    _isolate(monkeypatch, tmp_path)
+    store = FixtureStore(str(tmp_path / "fixtures"))
+    store.save("results/seasons", None, SEASONS)
+    monkeypatch.setattr(public_api, "retry_policy", RetryPolicy(max_attempts=20, base_delay=0))
+    
+    async def run():
+        server = FakePulseliveServer(store, failure_rate=0.5, seed=1)
+        await server.start()
+        monkeypatch.setattr(public_api.settings, "motogp_api_base_url", server.base_url)
+        try:
+            async with MotoGPPublicAPIClient() as api:
+                seasons = []
+                for _ in range(5):
+                    seasons.append(await api._make_request("results/seasons"))
+                return seasons, server.failures
+        finally:
+            await server.stop()
+    
+    seasons, failures = asyncio.run(run())
+    
+    assert seasons == [SEASONS] * 5
+    assert failures > 0
+
+
+def test_record_mode_writes_fixtures(monkeypatch, tmp_path):
+    """Test that record mode captures responses the fake server can replay"""
+    _isolate(monkeypatch, tmp_path)
+    source = FixtureStore(str(tmp_path / "source"))
+    source.save("results/seasons", None, SEASONS)
+    recorded = tmp_path / "recorded"
+    
+    async def run():
+        server = FakePulseliveServer(source)
+        await server.start()
+        monkeypatch.setattr(public_api.settings, "motogp_api_base_url", server.base_url)
+        monkeypatch.setattr(public_api.settings, "api_record_dir", str(recorded))
+        try:
+            async with MotoGPPublicAPIClient() as api:
+                await api.get_seasons()
+        finally:
+            await server.stop()
+    
+    asyncio.run(run())
+    
+    assert FixtureStore(str(recorded)).load("results/seasons") == SEASONS
@@ -0,0 +1,48 @@
+from src.utils.leader import LeaderElector
+
+
+class FakeElector(LeaderElector):
+    """Elector with a scripted lock instead of MySQL"""
+    
+    def __init__(self, lock_results, **kwargs):
+        super().__init__(**kwargs)
+        self.lock_results = list(lock_results)
+    
+    def _try_acquire(self):
+        return self.lock_results.pop(0)
+    
+    def _still_held(self):
+        return self.lock_results.pop(0)
+
+
+def test_elected_and_demoted_callbacks():
+    """Test role changes trigger callbacks only on transitions"""
+    events = []
+    elector = FakeElector(
+        [False, True, True, False],
+        on_elected=lambda: events.append("elected"),
+        on_demoted=lambda: events.append("demoted")
+    )
+    
+    for _ in range(4):
+        elector.check()
+    
+    assert events == ["elected", "demoted"]
+    assert elector.is_leader is False
+
+
+def test_election_error_means_follower():
+    """Test a broken lock connection never leaves two leaders"""
+    events = []
+    
+    class BrokenElector(LeaderElector):
+        def _try_acquire(self):
+            raise ConnectionError("mysql gone")
+    
+    elector = BrokenElector(
+        on_elected=lambda: events.append("elected"),
+        on_demoted=lambda: events.append("demoted")
+    )
+    
+    assert elector.check() is False
+    assert events == []
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from src.database.connection import after_cursor_execute, before_cursor_execute
+from src.utils.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_quantiles():
+    """Test quantiles over the rolling window"""
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.observe(value)
+    
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == 51
+    assert histogram.quantile(0.99) == 100
+
+
+def test_track_records_queries_for_running_command():
+    """Test that DB statements are attributed to the running command"""
+    registry = MetricsRegistry()
+    
+    @registry.track("cmd_test")
+    async def handler():
+        registry.record_query(0.01)
+        registry.record_query(0.02)
+        return "ok"
+    
+    assert asyncio.run(handler()) == "ok"
+    assert registry.wall_time["cmd_test"].count == 1
+    assert registry.db_queries["cmd_test"].quantile(0.5) == 2
+    assert registry.db_time["cmd_test"].total == pytest.approx(0.03)
+
+
+def test_queries_outside_command_are_ignored():
+    """Test that statements outside a tracked command are not recorded"""
+    registry = MetricsRegistry()
+    registry.record_query(0.5)
+    
+    assert registry.db_queries == {}
+
+
+def test_render_prometheus_text():
+    """Test metrics text exposition"""
+    registry = MetricsRegistry()
+    
+    @registry.track("cmd_fail")
+    async def handler():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        asyncio.run(handler())
+    
+    text = registry.render()
+    assert 'novaporra_command_seconds_count{command="cmd_fail"} 1' in text
+    assert 'novaporra_command_errors_total{command="cmd_fail"} 1' in text
+
+
+def test_failed_statement_leaves_no_timing_state(monkeypatch):
+    """Test that a statement that raises does not leak its start time"""
+    registry = MetricsRegistry()
+    monkeypatch.setattr("src.database.connection.metrics", registry)
+    conn = SimpleNamespace(info={})
+    failed, ok = SimpleNamespace(), SimpleNamespace()
+    
+    @registry.track("cmd_test")
+    async def handler():
+        before_cursor_execute(conn, None, "SELECT 1/0", None, failed, False)
+        # The statement raised: after_cursor_execute never runs for it
+        before_cursor_execute(conn, None, "SELECT 1", None, ok, False)
+        after_cursor_execute(conn, None, "SELECT 1", None, ok, False)
+    
+    asyncio.run(handler())
+    assert conn.info == {}
+    assert registry.db_queries["cmd_test"].quantile(0.5) == 1
@@ -0,0 +1,67 @@
+import asyncio
+from src.api.motogp_public_api import (
+    MotoGPPublicAPIClient,
+    open_http_session,
+    close_http_session
+)
+from src.api.payloads import EventInfo, SessionInfo, decode_list
+
+
+def test_clients_borrow_shared_session():
+    """Test that clients reuse the shared session and never close it"""
+    async def run():
+        shared = await open_http_session()
+        try:
+            async with MotoGPPublicAPIClient() as api:
+                assert api.session is shared
+            assert not shared.closed
+        finally:
+            await close_http_session()
+        return shared
+    
+    shared = asyncio.run(run())
+    assert shared.closed
+
+
+def test_client_owns_session_without_shared_pool():
+    """Test standalone clients open and close their own session"""
+    async def run():
+        async with MotoGPPublicAPIClient() as api:
+            session = api.session
+            assert not session.closed
+        return session
+    
+    assert asyncio.run(run()).closed
+
+
+def test_get_riders_merges_all_race_sessions():
+    """Test that riders from every race/sprint session are merged"""
+    class FakeClient(MotoGPPublicAPIClient):
+        async def get_calendar(self, season):
+            return decode_list(EventInfo, [
+                {"id": "e1", "name": "GP 1"},
+                {"id": "t1", "name": "Test", "test": True},
+                {"id": "e2", "name": "GP 2"},
+            ], "event")
+        
+        async def get_sessions(self, event_id, category):
+            return decode_list(SessionInfo, [
+                {"id": f"{event_id}-fp1", "type": "FP"},
+                {"id": f"{event_id}-rac", "type": "RAC"},
+            ], "session")
+        
+        async def _make_request(self, endpoint, params=None):
+            def entry(rider_id, team):
+                return {"rider": {"id": rider_id, "number": 1}, "team": {"name": team}}
+            if endpoint.startswith("results/session/e1-rac"):
+                return {"classification": [entry("r1", "Old Team"), entry("r2", "B")]}
+            if endpoint.startswith("results/session/e2-rac"):
+                # Substitute rider and a team change
+                return {"classification": [entry("r1", "New Team"), entry("r3", "C")]}
+            raise AssertionError(f"Unexpected request {endpoint}")
+    
+    riders = asyncio.run(FakeClient().get_riders(2024, "cat"))
+    by_id = {rider.rider_id: rider for rider in riders}
+    
+    assert set(by_id) == {"r1", "r2", "r3"}
+    assert by_id["r1"].team == "New Team"
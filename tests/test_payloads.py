@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.api.motogp_public_api import MotoGPPublicAPIClient
+from src.api.payloads import EventInfo, PayloadError, SessionInfo, decode_list, parse_lap_time
+
+
+def test_classification_decodes_to_typed_entries():
+    """Test that classification rows become typed, immutable entries"""
+    data = {"classification": [{
+        "position": 1,
+        "rider": {"id": "r1", "full_name": "Marc Marquez", "number": "93"},
+        "team": {"name": "Ducati Lenovo Team"},
+        "constructor": {"name": "Ducati"},
+        "time": "41:12.345",
+        "gap": {"first": "0.000"},
+        "total_laps": 27,
+        "top_speed": "352.1",
+        "status": "INSTND"
+    }]}
+    
+    entry, = MotoGPPublicAPIClient.parse_classification(data)
+    
+    assert entry.rider_id == "r1"
+    assert entry.rider_number == 93
+    assert entry.top_speed == pytest.approx(352.1)
+    assert entry.gap == "0.000"
+    with pytest.raises(AttributeError):
+        entry.position = 2
+    assert not hasattr(entry, "__dict__")
+
+
+def test_invalid_entries_are_dropped():
+    """Test that rows without a rider id are skipped, not the whole payload"""
+    data = {"classification": [
+        {"position": 1, "rider": {"id": "r1"}},
+        {"position": 2, "rider": {}},
+        {"position": "DNF", "rider": {"id": "r3"}},
+        "garbage",
+    ]}
+    
+    entries = MotoGPPublicAPIClient.parse_classification(data)
+    
+    assert [entry.rider_id for entry in entries] == ["r1"]
+
+
+def test_malformed_list_is_rejected():
+    """Test that a payload that is not a list raises"""
+    with pytest.raises(PayloadError):
+        decode_list(SessionInfo, {"id": "s1"}, "session")
+
+
+def test_event_dates_are_parsed_once():
+    """Test that event dates are decoded to aware datetimes"""
+    event = EventInfo.from_api({
+        "id": "e1",
+        "name": "Gran Premio de España",
+        "circuit": {"id": "c1", "name": "Jerez", "place": "Jerez de la Frontera"},
+        "country": {"name": "Spain"},
+        "date_start": "2024-04-26T00:00:00Z"
+    })
+    
+    assert event.date_start == datetime(2024, 4, 26, tzinfo=timezone.utc)
+    assert event.circuit_id == "c1"
+    assert event.test is False
+
+
+def test_parse_lap_time():
+    """Test that lap times and gaps become integer milliseconds"""
+    assert parse_lap_time("1:39.123") == 99123
+    assert parse_lap_time("1'39.123") == 99123
+    assert parse_lap_time("+0.456") == 456
+    assert parse_lap_time("41:12.345") == 2472345
+    assert parse_lap_time("1:02:03.456") == 3723456
+    assert parse_lap_time("+1 Lap") is None
+    assert parse_lap_time(None) is None
@@ -0,0 +1,64 @@
+import asyncio
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import src.services.race_poller as race_poller
+from src.services.race_poller import RacePoller
+from src.database.models import Race, RaceType
+
+
+def test_expected_end_depends_on_race_type():
+    """Test that sprints end earlier than main races"""
+    start = datetime(2024, 3, 10, 14, 0)
+    sprint = Race(race_datetime=start, race_type=RaceType(code="SPRINT"))
+    race = Race(race_datetime=start, race_type=RaceType(code="RACE"))
+    
+    assert RacePoller.expected_end(sprint) == start + timedelta(minutes=20)
+    assert RacePoller.expected_end(race) == start + timedelta(minutes=40)
+
+
+def test_classification_stable_after_unchanged_polls():
+    """Test that results are final only once they stop changing"""
+    podium = [{"position": 1}, {"position": 2}, {"position": 3}]
+    
+    assert RacePoller.is_stable(0, podium) is False
+    assert RacePoller.is_stable(3, podium) is True
+
+
+def test_classification_without_podium_is_not_stable():
+    """Test that an incomplete classification is never final"""
+    assert RacePoller.is_stable(10, None) is False
+    assert RacePoller.is_stable(10, [{"position": 1}]) is False
+
+
+def test_due_races_are_polled_in_the_background(monkeypatch):
+    """Test that the sweep returns while polls run and skips races already polling"""
+    poller = RacePoller()
+    release = None
+    
+    async def slow_poll(race_id):
+        poller._active.add(race_id)
+        await release.wait()
+        poller._active.discard(race_id)
+        return True
+    
+    monkeypatch.setattr(race_poller, "get_db", nullcontext)
+    monkeypatch.setattr(
+        RacePoller, "get_races_awaiting_results",
+        staticmethod(lambda db: [SimpleNamespace(id=1), SimpleNamespace(id=2)])
+    )
+    monkeypatch.setattr(poller, "poll_race", slow_poll)
+    
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = await poller.poll_due_races()
+        await asyncio.sleep(0)
+        second = await poller.poll_due_races()
+        pending = len(poller._tasks)
+        release.set()
+        await asyncio.gather(*poller._tasks)
+        return first, second, pending
+    
+    assert asyncio.run(run()) == ([1, 2], [], 2)
+    assert not poller._tasks
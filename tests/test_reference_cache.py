@@ -0,0 +1,27 @@
+from src.api.reference_cache import ReferenceCache
+
+
+def test_reference_cache_persists_between_instances(tmp_path):
+    """Test that cached reference data survives a new cache instance"""
+    path = tmp_path / "cache.json"
+    cache = ReferenceCache(str(path))
+    cache.set("seasons", [{"year": 2024, "id": "abc"}], ttl_seconds=60)
+    
+    reloaded = ReferenceCache(str(path))
+    assert reloaded.get("seasons") == [{"year": 2024, "id": "abc"}]
+
+
+def test_reference_cache_expires(tmp_path):
+    """Test that expired entries are not returned"""
+    cache = ReferenceCache(str(tmp_path / "cache.json"))
+    cache.set("seasons", [1], ttl_seconds=-1)
+    
+    assert cache.get("seasons") is None
+
+
+def test_reference_cache_ignores_corrupt_file(tmp_path):
+    """Test that an unreadable cache file behaves like an empty cache"""
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+    
+    assert ReferenceCache(str(path)).get("seasons") is None
@@ -0,0 +1,33 @@
+from datetime import datetime
+from src.utils.render_cache import RenderCache, RACES, STANDINGS
+
+
+def test_fill_replaces_countdown_placeholders():
+    """Test that countdowns are filled in at send time"""
+    cache = RenderCache()
+    token = cache.placeholder(0)
+    deadline = datetime(2024, 3, 10, 14, 0)
+    entry = cache.set(("proximas",), f"Cierre: {token}", tags=(RACES,), deadlines={token: deadline})
+    
+    text = cache.fill(entry, lambda d: d.strftime("%H:%M"))
+    assert text == "Cierre: 14:00"
+
+
+def test_invalidate_only_drops_tagged_entries():
+    """Test that domain events only invalidate dependent entries"""
+    cache = RenderCache()
+    cache.set(("proximas",), "races", tags=(RACES,))
+    cache.set(("clasificacion", 2024), "standings", tags=(STANDINGS,))
+    
+    cache.invalidate(RACES)
+    
+    assert cache.get(("proximas",)) is None
+    assert cache.get(("clasificacion", 2024)).text == "standings"
+
+
+def test_entries_expire_after_max_age():
+    """Test that stale entries are not served"""
+    cache = RenderCache(max_age_seconds=-1)
+    cache.set(("proximas",), "races", tags=(RACES,))
+    
+    assert cache.get(("proximas",)) is None
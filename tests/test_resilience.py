@@ -0,0 +1,203 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+import src.api.motogp_public_api as public_api
+from src.api.motogp_public_api import MotoGPPublicAPIClient
+from src.api.reference_cache import ReferenceCache
+from src.api.resilience import CircuitBreaker, CircuitOpenError, RateLimiter, RetryPolicy
+
+
+def test_backoff_is_bounded():
+    """Test that backoff delays grow exponentially up to the cap"""
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=4.0)
+    
+    for _ in range(50):
+        assert 0 <= policy.delay(1) <= 1.0
+        assert 0 <= policy.delay(2) <= 2.0
+        assert 0 <= policy.delay(10) <= 4.0
+
+
+def test_circuit_breaker_transitions():
+    """Test closed -> open -> half-open -> closed"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    
+    breaker.opened_at = time.monotonic() - 61
+    assert breaker.state == "half_open"
+    breaker.check()
+    # Only one trial request while half-open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.check()
+
+
+def test_failed_trial_reopens_circuit():
+    """Test that a failing half-open trial opens the circuit again"""
+    breaker = CircuitBreaker(failure_threshold=5, reset_seconds=60)
+    breaker.opened_at = time.monotonic() - 61
+    breaker.check()
+    breaker.record_failure()
+    
+    assert breaker.state == "open"
+
+
+@pytest.mark.parametrize("error", [asyncio.CancelledError, RuntimeError])
+def test_interrupted_trial_releases_half_open_circuit(monkeypatch, error):
+    """Test that a trial ending without an outcome lets the next one through"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    breaker.opened_at = time.monotonic() - 61
+    monkeypatch.setattr(public_api, "circuit_breaker", breaker)
+    
+    class FailingSession:
+        def get(self, url, **kwargs):
+            raise error()
+    
+    async def run():
+        api = MotoGPPublicAPIClient()
+        api.session = FailingSession()
+        with pytest.raises(error):
+            await api._send_with_retries("results/seasons")
+    
+    asyncio.run(run())
+    assert breaker.state == "half_open"
+    assert breaker.check() is True
+
+
+def test_rate_limiter_works_across_event_loops():
+    """Test that the limiter is not bound to the loop it was first used in"""
+    limiter = RateLimiter(rate=1000, burst=1)
+    
+    async def burst():
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+    
+    asyncio.run(burst())
+    asyncio.run(burst())
+
+
+def test_client_retries_transient_errors(monkeypatch, tmp_path):
+    """Test that 503 responses are retried and 404 responses are not"""
+    calls = {"flaky": 0, "missing": 0}
+    
+    async def flaky(request):
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            return web.Response(status=503)
+        return web.json_response({"ok": True})
+    
+    async def missing(request):
+        calls["missing"] += 1
+        return web.Response(status=404)
+    
+    monkeypatch.setattr(public_api, "retry_policy", RetryPolicy(max_attempts=4, base_delay=0))
+    monkeypatch.setattr(public_api, "circuit_breaker", CircuitBreaker(failure_threshold=10))
+    monkeypatch.setattr(public_api.response_cache, "directory", None)
+    
+    async def run():
+        app = web.Application()
+        app.router.add_get("/flaky", flaky)
+        app.router.add_get("/missing", missing)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with MotoGPPublicAPIClient() as api:
+                api.base_url = f"http://127.0.0.1:{port}"
+                assert await api._make_request("flaky") == {"ok": True}
+                with pytest.raises(Exception):
+                    await api._make_request("missing")
+        finally:
+            await runner.cleanup()
+    
+    asyncio.run(run())
+    assert calls == {"flaky": 3, "missing": 1}
+
+
+class StubResponse:
+    """Minimal aiohttp response for a stubbed session"""
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self.status = 200
+        self.headers = {}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    async def json(self):
+        return self.payload
+
+
+class StubSession:
+    """Session answering GETs from a {endpoint: payload} map"""
+    
+    def __init__(self, base_url, payloads):
+        self.base_url = base_url
+        self.payloads = payloads
+        self.requested = []
+    
+    def get(self, url, params=None, headers=None, timeout=None):
+        endpoint = url[len(self.base_url) + 1:]
+        self.requested.append(endpoint)
+        return StubResponse(self.payloads[endpoint])
+
+
+def test_season_and_category_lookups_go_through_the_client(monkeypatch, tmp_path):
+    """Test that season/category UUID lookups resolve through _send_with_retries"""
+    monkeypatch.setattr(public_api, "retry_policy", RetryPolicy(max_attempts=1, base_delay=0))
+    monkeypatch.setattr(public_api, "circuit_breaker", CircuitBreaker(failure_threshold=10))
+    monkeypatch.setattr(public_api.response_cache, "directory", None)
+    monkeypatch.setattr(public_api, "reference_cache", ReferenceCache(str(tmp_path / "ref.json")))
+    
+    async def run():
+        api = MotoGPPublicAPIClient()
+        api.session = StubSession(api.base_url, {
+            "results/seasons": [
+                {"id": "season-2023", "year": 2023, "current": False},
+                {"id": "season-2024", "year": 2024, "current": True}
+            ],
+            "results/categories": [{"id": "category-moto2", "name": "Moto2™"}]
+        })
+        # Force the API lookup instead of the hardcoded UUIDs
+        api.category_uuids = {}
+        
+        assert await api.get_season_uuid(2024) == "season-2024"
+        assert await api.get_category_id("MOTO2", 2024) == "category-moto2"
+        return api.session.requested
+    
+    assert asyncio.run(run()) == ["results/seasons", "results/categories"]
+
+
+@pytest.mark.parametrize("owns_session, requests", [(False, 1), (True, 2)])
+def test_only_shared_session_requests_are_coalesced(monkeypatch, owns_session, requests):
+    """Test that a client with a private session never serves other callers"""
+    monkeypatch.setattr(public_api, "retry_policy", RetryPolicy(max_attempts=1, base_delay=0))
+    monkeypatch.setattr(public_api, "circuit_breaker", CircuitBreaker(failure_threshold=10))
+    
+    async def run():
+        api = MotoGPPublicAPIClient()
+        api.session = StubSession(api.base_url, {"results/seasons": []})
+        api._owns_session = owns_session
+        await asyncio.gather(api._send("results/seasons"), api._send("results/seasons"))
+        return len(api.session.requested)
+    
+    assert asyncio.run(run()) == requests
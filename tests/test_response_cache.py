@@ -0,0 +1,53 @@
+import asyncio
+from src.api import motogp_public_api
+from src.api.motogp_public_api import MotoGPPublicAPIClient
+from src.api.response_cache import CachedResponse, ResponseCache
+
+
+def test_response_cache_roundtrip(tmp_path):
+    """Test that entries are stored compressed and read back"""
+    cache = ResponseCache(str(tmp_path))
+    key = cache.key("https://api/results/seasons", {"b": 1, "a": 2})
+    cache.put(key, CachedResponse({"x": 1}, etag='"abc"'))
+    
+    entry = cache.get(key)
+    assert entry.data == {"x": 1}
+    assert entry.validators() == {"If-None-Match": '"abc"'}
+    assert list(tmp_path.glob("*/*.json.gz"))
+
+
+def test_key_ignores_param_order():
+    """Test that params order does not change the cache key"""
+    assert ResponseCache.key("u", {"a": 1, "b": 2}) == ResponseCache.key("u", {"b": 2, "a": 1})
+
+
+def test_disabled_cache_stores_nothing():
+    """Test that an empty directory disables the cache"""
+    cache = ResponseCache("")
+    cache.put("k", CachedResponse({}))
+    assert cache.get("k") is None
+
+
+def test_immutable_entries_skip_the_network(tmp_path, monkeypatch):
+    """Test that pinned responses are served without an HTTP request"""
+    cache = ResponseCache(str(tmp_path))
+    monkeypatch.setattr(motogp_public_api, "response_cache", cache)
+    
+    client = MotoGPPublicAPIClient()
+    client.session = object()  # any request would fail
+    url = f"{client.base_url}/results/session/s1/classification"
+    cache.put(cache.key(url, None), CachedResponse({"classification": []}, immutable=True))
+    
+    data = asyncio.run(client._make_request("results/session/s1/classification"))
+    assert data == {"classification": []}
+
+
+def test_settled_sessions_are_immutable(monkeypatch):
+    """Test immutability rules for past seasons and settled sessions"""
+    monkeypatch.setattr(motogp_public_api, "_past_season_uuids", {"old-season"})
+    monkeypatch.setattr(motogp_public_api, "_settled_session_ids", {"s1"})
+    
+    is_immutable = MotoGPPublicAPIClient._is_immutable
+    assert is_immutable("results/events", {"seasonUuid": "old-season"})
+    assert is_immutable("results/session/s1/classification", None)
+    assert not is_immutable("results/session/s2/classification", None)
@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+
+from src.api.html_extract import extract_records
+from src.api.motogp_client import (
+    CALENDAR_FIELDS,
+    CALENDAR_RECORD_CLASS,
+    RESULTS_FIELDS,
+    RESULTS_RECORD_CLASS,
+    calendar_from_records,
+    classification_from_records
+)
+
+
+CALENDAR_PAGE = b"""
+<html><body>
+<nav><a href="/en/riders">Riders</a></nav>
+<a class="calendar-listing__event" href="/en/calendar/2024/event/qatar/qat-2024">
+  <div class="calendar-listing__title">Qatar  Airways Grand Prix</div>
+  <div class="calendar-listing__location-track-name">Lusail International Circuit</div>
+  <div class="calendar-listing__location-country">Qatar</div>
+  <span class="calendar-listing__date-start-day">08</span>
+  <span class="calendar-listing__date-start-month">Mar</span>
+  <span class="calendar-listing__date-end-day">10</span>
+  <span class="calendar-listing__date-end-month">Mar</span>
+</a>
+<a class="calendar-listing__event" href="/en/calendar/2024/event/sepang-test/tst">
+  <div class="calendar-listing__title">Sepang Test</div>
+  <div class="calendar-listing__status-type">TEST</div>
+</a>
+</body></html>
+"""
+
+RESULTS_PAGE = b"""
+<table><tbody>
+<tr class="results-table__body-row">
+  <td class="results-table__body-cell results-table__body-cell--pos">1</td>
+  <td class="results-table__body-cell results-table__body-cell--number">1</td>
+  <td class="results-table__body-cell results-table__body-cell--full-name">
+    <a href="/en/riders/motogp/1-francesco-bagnaia">Francesco Bagnaia</a></td>
+  <td class="results-table__body-cell results-table__body-cell--team">Ducati Lenovo Team</td>
+</tr>
+<tr class="results-table__body-row">
+  <td class="results-table__body-cell results-table__body-cell--pos">DNF</td>
+  <td class="results-table__body-cell results-table__body-cell--full-name">
+    <a href="/en/riders/motogp/93-marc-marquez">Marc Marquez</a></td>
+</tr>
+</tbody></table>
+"""
+
+
+def test_calendar_scrape_matches_public_api_model():
+    """Test that scraped calendar cards become EventInfo models"""
+    records = extract_records(CALENDAR_PAGE, CALENDAR_RECORD_CLASS, CALENDAR_FIELDS, link_field="url")
+    qatar, test_event = calendar_from_records(records, 2024)
+    
+    assert qatar.event_id == "qat-2024"
+    assert qatar.name == "Qatar Airways Grand Prix"
+    assert qatar.circuit_id == "lusail-international-circuit"
+    assert qatar.date_start == datetime(2024, 3, 8, tzinfo=timezone.utc)
+    assert qatar.test is False
+    assert test_event.test is True
+
+
+def test_streaming_is_chunk_size_independent():
+    """Test that records split across chunks are extracted identically"""
+    whole = extract_records(CALENDAR_PAGE, CALENDAR_RECORD_CLASS, CALENDAR_FIELDS, link_field="url")
+    chunked = extract_records(
+        CALENDAR_PAGE, CALENDAR_RECORD_CLASS, CALENDAR_FIELDS, link_field="url", chunk_size=5
+    )
+    
+    assert chunked == whole
+
+
+def test_classification_scrape():
+    """Test that result rows map to ClassificationEntry with DNF status"""
+    records = extract_records(RESULTS_PAGE, RESULTS_RECORD_CLASS, RESULTS_FIELDS, link_field="url")
+    winner, dnf = classification_from_records(records)
+    
+    assert winner.position == 1
+    assert winner.rider_id == "1-francesco-bagnaia"
+    assert winner.team == "Ducati Lenovo Team"
+    assert dnf.position is None
+    assert dnf.status == "DNF"
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from src.api.single_flight import SingleFlight
+from src.utils.metrics import metrics
+
+
+def test_concurrent_identical_calls_share_one_request():
+    """Test that identical in-flight calls run once and are counted as saved"""
+    flight = SingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"classification": []}
+    
+    async def run():
+        key = flight.key("https://api/results", {"a": 1})
+        return await asyncio.gather(*(flight.do(key, fetch) for _ in range(5)))
+    
+    saved_before = metrics.counters.get("api_requests_coalesced_total", 0)
+    results = asyncio.run(run())
+    
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert metrics.counters["api_requests_coalesced_total"] - saved_before == 4
+    assert len(flight) == 0
+
+
+def test_different_keys_are_not_coalesced():
+    """Test that requests with different params or validators run separately"""
+    assert SingleFlight.key("u", {"a": 1}) != SingleFlight.key("u", {"a": 2})
+    assert SingleFlight.key("u", None, {"If-None-Match": "x"}) != SingleFlight.key("u")
+
+
+def test_errors_reach_every_caller():
+    """Test that a failed request raises in all joined callers"""
+    flight = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    async def run():
+        return await asyncio.gather(
+            flight.do("k", fetch), flight.do("k", fetch), return_exceptions=True
+        )
+    
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    """Test that cancelling one waiter leaves the shared request running"""
+    flight = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 42
+    
+    async def run():
+        first = asyncio.create_task(flight.do("k", fetch))
+        second = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+    
+    assert asyncio.run(run()) == 42
@@ -0,0 +1,73 @@
+import asyncio
+
+import src.api.motogp_public_api as public_api
+from src.api.fake_server import FakePulseliveServer
+from src.api.fixtures import FixtureStore
+from src.api.reference_cache import ReferenceCache
+from src.api.resilience import CircuitBreaker, RetryPolicy
+from src.api.snapshot import SnapshotClient, SnapshotReader, SnapshotWriter, crawl_season
+
+
+CLASSIFICATION = {"classification": [
+    {"position": 1, "rider": {"id": "r1", "full_name": "Jorge Martin", "number": 89}},
+]}
+
+
+def test_writer_deduplicates_identical_payloads(tmp_path):
+    """Test that identical payloads are stored once but indexed per request"""
+    path = tmp_path / "2024.zip"
+    writer = SnapshotWriter(str(path), 2024)
+    writer.save("results/session/s1/classification", None, CLASSIFICATION)
+    writer.save("results/session/s1/classification", {"eventUuid": "e1"}, CLASSIFICATION)
+    writer.close()
+    
+    reader = SnapshotReader(str(path))
+    
+    assert writer.objects == 1
+    assert reader.season == 2024
+    assert reader.load("results/session/s1/classification", {"eventUuid": "e1"}) == CLASSIFICATION
+    assert reader.load("results/session/s2/classification") is None
+
+
+def test_crawled_season_replays_offline(monkeypatch, tmp_path):
+    """Test crawling a season from the fake server and reading it back offline"""
+    monkeypatch.setattr(public_api, "reference_cache", ReferenceCache(str(tmp_path / "ref.json")))
+    monkeypatch.setattr(public_api.response_cache, "directory", None)
+    monkeypatch.setattr(public_api, "retry_policy", RetryPolicy(max_attempts=1, base_delay=0))
+    monkeypatch.setattr(public_api, "circuit_breaker", CircuitBreaker(failure_threshold=1000))
+    
+    store = FixtureStore(str(tmp_path / "fixtures"))
+    store.save("results/seasons", None, [{"id": "s2024", "year": 2024, "current": True}])
+    store.save("results/events", {"seasonUuid": "s2024"}, [{"id": "e1", "name": "GP"}])
+    store.save("results/categories", {"seasonUuid": "s2024"}, [{"id": "cat1", "name": "MotoGP™"}])
+    store.save("results/sessions", {"eventUuid": "e1", "categoryUuid": "cat1"}, [{"id": "rac1", "type": "RAC"}])
+    store.save("results/session/rac1/classification", None, CLASSIFICATION)
+    store.save(
+        "results/session/rac1/classification",
+        {"eventUuid": "e1", "categoryUuid": "cat1"},
+        CLASSIFICATION
+    )
+    path = tmp_path / "2024.zip"
+    
+    async def crawl():
+        server = FakePulseliveServer(store)
+        await server.start()
+        monkeypatch.setattr(public_api.settings, "motogp_api_base_url", server.base_url)
+        try:
+            return await crawl_season(2024, str(path))
+        finally:
+            await server.stop()
+    
+    stats = asyncio.run(crawl())
+    
+    assert stats["sessions"] == 1
+    assert stats["objects"] < stats["requests"]
+    
+    async def replay():
+        async with SnapshotClient(str(path)) as api:
+            return await api.get_calendar(2024), await api.get_riders(2024, "cat1")
+    
+    events, riders = asyncio.run(replay())
+    
+    assert [event.event_id for event in events] == ["e1"]
+    assert [rider.full_name for rider in riders] == ["Jorge Martin"]
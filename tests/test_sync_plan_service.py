@@ -0,0 +1,174 @@
+from datetime import date, datetime
+
+from src.api.payloads import ClassificationEntry
+from src.database.models import BetScore, ChampionshipStanding, GlobalStanding, RaceResult
+from src.services.data_sync_service import row_hash
+from src.services.sync_plan_service import SyncPlan, SyncPlanService, TableChanges, plan_changes
+
+
+def test_plan_changes_sorts_rows():
+    """Test that rows are split into inserts, updates and unchanged ones"""
+    same = {"name": "Jerez", "external_id": "c1"}
+    changes = TableChanges()
+    plan_changes(
+        changes,
+        {"c1": same, "c2": {"name": "Mugello", "external_id": "c2"}, "c3": {"name": "New", "external_id": "c3"}},
+        {"c1": row_hash(same), "c3": "stale"}
+    )
+    
+    assert [row["external_id"] for row in changes.insert] == ["c2"]
+    assert [row["external_id"] for row in changes.update] == ["c3"]
+    assert changes.unchanged == 1
+
+
+def test_plan_json_round_trip_keeps_types():
+    """Test that a saved plan decodes back to rows with the same hashes"""
+    plan = SyncPlan(season=2024, entities=["calendar", "races"])
+    event = {
+        "season": 2024, "circuit_external_id": "c1", "name": "GP", "country": "Spain",
+        "event_date": date(2024, 4, 5), "external_id": "e1"
+    }
+    session = {
+        "race_key": ("e1", 1, 2), "session_type_id": 3,
+        "session_datetime": datetime(2024, 4, 5, 9, 45), "status": "finished"
+    }
+    plan.table("events").insert.append(event)
+    plan.table("sessions").update.append(session)
+    plan.table("sessions").delete.append(42)
+    
+    decoded = SyncPlan.from_json(plan.to_json())
+    
+    assert decoded.tables["events"].insert == [event]
+    assert decoded.tables["sessions"].update == [session]
+    assert decoded.tables["sessions"].delete == [42]
+    assert row_hash(decoded.tables["sessions"].update[0]) == row_hash(session)
+    assert decoded.change_count == 3
+
+
+def test_plan_results_detects_corrected_classification():
+    """Test that stored results are kept when equal and replaced when changed"""
+    snapshot = {
+        "races": {("e1", 1, 10): (100, datetime(2024, 4, 7, 12), "finished"),
+                  ("e2", 1, 10): (200, datetime(2024, 4, 14, 12), "finished")},
+        "riders": {"a": (1, None), "b": (2, None), "c": (3, None)},
+        "results": {100: {(1, 1, "finished", None), (2, 2, "finished", None), (3, 3, "finished", None)},
+                    200: {(1, 1, "finished", None), (2, 2, "finished", None), (3, 3, "finished", None)}},
+    }
+    
+    def classification(order):
+        return [
+            ClassificationEntry.from_api({"position": i, "rider": {"id": rider}, "status": "INSTND"})
+            for i, rider in enumerate(order, 1)
+        ]
+    
+    plan = SyncPlan(season=2024, entities=["results"])
+    SyncPlanService._plan_results(plan, {
+        ("e1", 1, "RAC"): classification("abc"),
+        ("e2", 1, "RAC"): classification("bac"),
+        ("e3", 1, "RAC"): classification("abc"),
+    }, {"RACE": 10}, snapshot)
+    
+    changes = plan.tables["race_results"]
+    assert changes.unchanged == 1
+    assert changes.delete == [("e2", 1, 10)]
+    assert sorted({row["race_key"] for row in changes.insert}) == [("e2", 1, 10), ("e3", 1, 10)]
+    assert {row["rider_external_id"] for row in changes.insert} == {"a", "b", "c"}
+
+
+def test_plan_results_number_unclassified_riders_like_live_ingestion():
+    """Test that an unknown unclassified rider does not shift the positions after it"""
+    snapshot = {
+        "races": {("e1", 1, 10): (100, datetime(2024, 4, 7, 12), "finished")},
+        "riders": {"a": (1, None), "b": (2, None), "c": (3, None)},
+        # Stored live: unknown rider "x" skipped, so "c" took position 3
+        "results": {100: {(1, 1, "finished", None), (2, 2, "finished", None), (3, 3, "dnf", None)}},
+    }
+    classification = [
+        ClassificationEntry.from_api({"position": position, "rider": {"id": rider}, "status": status})
+        for position, rider, status in [(1, "a", "INSTND"), (2, "b", "INSTND"),
+                                        (None, "x", "OUTSTND"), (None, "c", "OUTSTND")]
+    ]
+    
+    plan = SyncPlan(season=2024, entities=["results"])
+    SyncPlanService._plan_results(plan, {("e1", 1, "RAC"): classification}, {"RACE": 10}, snapshot)
+    
+    changes = plan.tables["race_results"]
+    assert changes.unchanged == 1
+    assert changes.delete == [] and changes.insert == []
+
+
+def test_plan_races_moves_open_races_and_drops_stale_sessions():
+    """Test race moves, finished races left alone and removed sessions deleted"""
+    snapshot = {
+        "races": {("e1", 1, 10): (100, datetime(2099, 4, 7, 12), "upcoming"),
+                  ("e1", 1, 11): (101, datetime(2099, 4, 6, 13), "finished")},
+        "sessions": {(100, 20): (500, "stale"), (100, 21): (501, None)},
+    }
+    race_rows = {
+        ("e1", 1, 10): {"event_id": "e1", "category_id": 1, "race_type_id": 10,
+                        "race_datetime": datetime(2099, 4, 7, 13), "status": "upcoming"},
+        ("e1", 1, 11): {"event_id": "e1", "category_id": 1, "race_type_id": 11,
+                        "race_datetime": datetime(2099, 4, 6, 14), "status": "upcoming"},
+    }
+    session_rows = [{"race_key": ("e1", 1, 10), "session_type_id": 20,
+                     "session_datetime": datetime(2099, 4, 5, 9), "status": "scheduled"}]
+    
+    plan = SyncPlan(season=2099, entities=["races"])
+    SyncPlanService._plan_races(plan, race_rows, session_rows, {("e1", 1)}, snapshot)
+    
+    races = plan.tables["races"]
+    assert [row["race_type_id"] for row in races.update] == [10]
+    assert races.update[0]["event_external_id"] == "e1"
+    assert races.unchanged == 1
+    sessions = plan.tables["sessions"]
+    assert len(sessions.update) == 1
+    assert sessions.delete == [501]
+
+
+def _results_plan(race_key, order, replace):
+    """Plan storing a race classification in the given rider order"""
+    plan = SyncPlan(season=2024, entities=["results"])
+    plan.tables["race_results"] = TableChanges(
+        insert=[
+            {"race_key": race_key, "rider_external_id": rider, "position": position,
+             "points": 0, "time_gap": None, "status": "finished"}
+            for position, rider in enumerate(order, 1)
+        ],
+        delete=[race_key] if replace else []
+    )
+    return plan
+
+
+def test_apply_corrected_classification_rescores_bets(scoring_db, add_race):
+    """Test that replacing stored results recomputes the scores and standings"""
+    db = scoring_db
+    add_race(db, 100, 10, settled=True)
+    db.add(ChampionshipStanding(season=2024, category_id=1, user_id=1, total_points=40, races_participated=1))
+    db.commit()
+    
+    SyncPlanService.apply_plan(db, _results_plan(("e1", 1, 10), "bac", replace=True))
+    
+    assert [r.rider_id for r in db.query(RaceResult).order_by(RaceResult.position)] == [2, 1, 3]
+    score = db.query(BetScore).one()
+    assert (score.points_first, score.points_second, score.points_third) == (5, 5, 10)
+    assert score.total_points == 20
+    standing = db.query(ChampionshipStanding).one()
+    assert (standing.total_points, standing.races_participated) == (20, 1)
+    assert db.query(GlobalStanding).one().total_points == 20
+
+
+def test_apply_results_settles_only_races_in_the_plan(scoring_db, add_race):
+    """Test that a settled race of the same event is not counted again"""
+    db = scoring_db
+    add_race(db, 101, 11, settled=True)
+    add_race(db, 100, 10, settled=False)
+    db.add(ChampionshipStanding(season=2024, category_id=1, user_id=1, total_points=40, races_participated=1))
+    db.commit()
+    
+    SyncPlanService.apply_plan(db, _results_plan(("e1", 1, 10), "bac", replace=False))
+    
+    scores = {score.race_id: score.total_points for score in db.query(BetScore)}
+    assert scores == {101: 40, 100: 20}
+    standing = db.query(ChampionshipStanding).one()
+    assert (standing.total_points, standing.races_participated) == (60, 2)
+    assert db.query(GlobalStanding).one().total_points == 60
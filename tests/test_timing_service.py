@@ -0,0 +1,8 @@
+from src.services.timing_service import TimingService
+
+
+def test_format_lap_time():
+    """Test that stored milliseconds render as lap times and gaps"""
+    assert TimingService.format_lap_time(99123) == "1:39.123"
+    assert TimingService.format_lap_time(60005) == "1:00.005"
+    assert TimingService.format_lap_time(377) == "0.377"